@@ -0,0 +1,113 @@
+"""Offline benchmarks for the bot's hot paths.
+
+Runs against fake guild/member/channel/message objects and a seeded synthetic
+data set, so no token, network or Discord connection is needed.
+
+    python -m benchmarks
+    python -m benchmarks --scales large --filter Schedule --output after.json --compare before.json
+"""
+import os, sys, json, time, asyncio, logging, argparse, platform, statistics, subprocess, tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVOKED_FROM = os.getcwd()
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import offlineSecretModule
+sys.modules["secret"] = offlineSecretModule()
+
+# The data store and event history use paths relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="friendlysnek-bench-"))
+os.makedirs("data", exist_ok=True)
+
+from benchmarks.suite import SCALES, BENCHMARKS, World  # noqa: E402
+
+
+def gitCommit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+async def runScale(scaleName: str, repeat: int, nameFilter: str | None, seed: int) -> dict[str, dict]:
+    """Builds one scale's world and times every selected benchmark on it.
+
+    Parameters:
+    scaleName (str): Key in SCALES.
+    repeat (int): Timed runs per benchmark.
+    nameFilter (str | None): Only run benchmarks whose name contains this.
+    seed (int): World seed.
+
+    Returns:
+    dict[str, dict]: Timings per benchmark name, in milliseconds.
+    """
+    world = World(**SCALES[scaleName], seed=seed)
+    results = {}
+    for name, (run, prepare) in BENCHMARKS.items():
+        if nameFilter and nameFilter.lower() not in name.lower():
+            continue
+
+        # Fresh data per benchmark, so one cannot skew the next
+        world.install()
+        if prepare is not None:
+            await prepare(world)
+        await run(world)  # Warmup
+
+        timings = []
+        for _ in range(repeat):
+            startedAt = time.perf_counter()
+            await run(world)
+            timings.append((time.perf_counter() - startedAt) * 1000)
+        results[name] = {"median": statistics.median(timings), "min": min(timings), "max": max(timings), "runs": repeat}
+    return results
+
+
+def printTable(results: dict[str, dict[str, dict]], baseline: dict | None) -> None:
+    nameWidth = max((len(name) for scale in results.values() for name in scale), default=0)
+    for scaleName, scale in results.items():
+        print(f"\n{scaleName} ({', '.join(f'{key}={value}' for key, value in SCALES[scaleName].items())})")
+        print(f"  {'benchmark':<{nameWidth}}  {'median ms':>10}  {'min ms':>10}" + ("  {:>8}".format("vs base") if baseline else ""))
+        for name, timing in scale.items():
+            line = f"  {name:<{nameWidth}}  {timing['median']:>10.3f}  {timing['min']:>10.3f}"
+            if baseline:
+                baseTiming = baseline.get("results", {}).get(scaleName, {}).get(name)
+                line += f"  {timing['median'] / baseTiming['median']:>7.2f}x" if baseTiming and baseTiming["median"] > 0 else f"  {'-':>8}"
+            print(line)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline benchmarks for FriendlySnek hot paths.")
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"Comma separated scales to run ({', '.join(SCALES)})")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per benchmark")
+    parser.add_argument("--filter", dest="nameFilter", default=None, help="Only run benchmarks whose name contains this")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON results from an earlier run to compare medians against")
+    args = parser.parse_args()
+
+    scaleNames = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    for scaleName in scaleNames:
+        if scaleName not in SCALES:
+            parser.error(f"unknown scale '{scaleName}'")
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(INVOKED_FROM, args.compare), encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    for scaleName in scaleNames:
+        results[scaleName] = await runScale(scaleName, args.repeat, args.nameFilter, args.seed)
+
+    printTable(results, baseline)
+
+    if args.output:
+        outputPath = os.path.join(INVOKED_FROM, args.output)
+        with open(outputPath, "w", encoding="utf-8") as f:
+            json.dump({"commit": gitCommit(), "python": platform.python_version(), "seed": args.seed, "repeat": args.repeat, "results": results}, f, indent=4)
+        print(f"\nResults written to {outputPath}")
+
+
+if __name__ == "__main__":
+    logging.getLogger("FriendlySnek").setLevel(logging.ERROR)
+    asyncio.run(main())
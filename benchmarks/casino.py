@@ -0,0 +1,228 @@
+"""Monte-Carlo simulator for the SnekCoin casino games.
+
+Plays millions of rounds of each game per bet size in NumPy batches, using the
+payout tables in casino.py, and reports the expected value, variance and house
+edge against the exact values worked out from the same tables. A sample of rounds
+is also played through the live game functions, so a change to either shows up.
+Needs NumPy, which the bot itself does not.
+
+    python -m benchmarks.casino
+    python -m benchmarks.casino --rounds 10000000 --bets 2,50,1000 --output before.json
+    python -m benchmarks.casino --check --compare before.json
+"""
+import os, sys, json, time, random, argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import casino  # noqa: E402
+
+BATCH_ROUNDS = 1_000_000  # Rounds per NumPy batch; bounds memory
+CHECK_SIGMAS = 4.0  # Standard errors a simulated expected value may be off the exact one
+EDGE_TOLERANCE = 0.001  # House edge change against a --compare baseline that counts as a regression
+
+
+# ===== <Simulation> =====
+# Each returns the player's net SnekCoins for a batch of rounds at one bet.
+
+def simulateCoinFlip(rng: "np.random.Generator", bet: int, rounds: int) -> "np.ndarray":
+    won = rng.random(rounds) < casino.COIN_FLIP_WIN_CHANCE
+    return np.where(won, casino.coinFlipPayout(bet), -bet)
+
+
+def simulateDiceRoll(rng: "np.random.Generator", bet: int, rounds: int) -> "np.ndarray":
+    casinoEdge = rng.random(rounds) < casino.DICE_ROLL_CASINO_EDGE_CHANCE
+    userRolls = rng.integers(1, casino.DICE_ROLL_SIDES + 1, rounds)
+    botRolls = np.where(casinoEdge, casino.DICE_ROLL_SIDES, rng.integers(1, casino.DICE_ROLL_SIDES + 1, rounds))
+    return np.select([userRolls > botRolls, userRolls < botRolls], [casino.diceRollPayout(bet), -bet], 0)
+
+
+def simulateSlots(rng: "np.random.Generator", bet: int, rounds: int) -> "np.ndarray":
+    symbols = list(casino.SLOT_SYMBOLS)
+    # Same draw as random.choices: bisect a uniform draw into the cumulative weights
+    cumulativeWeights = np.cumsum([casino.SLOT_SYMBOLS[symbol]["weight"] for symbol in symbols])
+    reels = np.searchsorted(cumulativeWeights, rng.random((rounds, casino.SLOT_REELS)) * cumulativeWeights[-1], side="right")
+    won = (reels == reels[:, :1]).all(axis=1)
+    payouts = np.array([casino.slotsPayout(symbol, bet) for symbol in symbols])
+    return np.where(won, payouts[reels[:, 0]], -bet)
+
+# ===== </Simulation> =====
+
+
+# ===== <Exact> =====
+# Expected net SnekCoins per round, from the payout tables.
+
+def exactCoinFlip(bet: int) -> float:
+    return casino.COIN_FLIP_WIN_CHANCE * casino.coinFlipPayout(bet) - (1 - casino.COIN_FLIP_WIN_CHANCE) * bet
+
+
+def exactDiceRoll(bet: int) -> float:
+    sides, edgeChance = casino.DICE_ROLL_SIDES, casino.DICE_ROLL_CASINO_EDGE_CHANCE
+    fairWinChance = (sides * (sides - 1) / 2) / sides ** 2  # Same as the chance to lose a fair roll
+    winChance = (1 - edgeChance) * fairWinChance
+    loseChance = (1 - edgeChance) * fairWinChance + edgeChance * (sides - 1) / sides
+    return winChance * casino.diceRollPayout(bet) - loseChance * bet
+
+
+def exactSlots(bet: int) -> float:
+    totalWeight = sum(details["weight"] for details in casino.SLOT_SYMBOLS.values())
+    winChances = {symbol: (details["weight"] / totalWeight) ** casino.SLOT_REELS for symbol, details in casino.SLOT_SYMBOLS.items()}
+    return sum(chance * casino.slotsPayout(symbol, bet) for symbol, chance in winChances.items()) - (1 - sum(winChances.values())) * bet
+
+# ===== </Exact> =====
+
+
+# ===== <Live> =====
+# One round through the functions the bot plays, as the player's net SnekCoins.
+
+def liveCoinFlip(bet: int) -> int:
+    won, payout = casino.playCoinFlip(bet)
+    return payout if won else -bet
+
+
+def liveDiceRoll(bet: int) -> int:
+    won, _, _, payout = casino.playDiceRoll(bet)
+    return 0 if won is None else payout if won else -bet
+
+
+def liveSlots(bet: int) -> int:
+    won, _, payout = casino.playSlots(bet)
+    return payout if won else -bet
+
+# ===== </Live> =====
+
+
+GAMES = {
+    "coinFlip": (simulateCoinFlip, exactCoinFlip, liveCoinFlip),
+    "diceRoll": (simulateDiceRoll, exactDiceRoll, liveDiceRoll),
+    "slots": (simulateSlots, exactSlots, liveSlots),
+}
+
+
+def simulate(game: str, bet: int, rounds: int, seed: int) -> dict[str, float]:
+    """Plays rounds of a game in batches, combining each batch's mean and variance.
+
+    Parameters:
+    game (str): Key in GAMES.
+    bet (int): The bet.
+    rounds (int): Rounds to play.
+    seed (int): Seed for the random generator.
+
+    Returns:
+    dict[str, float]: rounds, mean (expected net per round), variance and standard error of the mean.
+    """
+    simulateBatch = GAMES[game][0]
+    rng = np.random.default_rng(seed)
+    count, mean, sumSquares = 0, 0.0, 0.0
+    while count < rounds:
+        net = simulateBatch(rng, bet, min(BATCH_ROUNDS, rounds - count)).astype(np.float64)
+        batchMean = float(net.mean())
+        batchSumSquares = float(((net - batchMean) ** 2).sum())
+        delta = batchMean - mean
+        total = count + len(net)
+        mean += delta * len(net) / total
+        sumSquares += batchSumSquares + delta ** 2 * count * len(net) / total
+        count = total
+    variance = sumSquares / (count - 1) if count > 1 else 0.0
+    return {"rounds": count, "mean": mean, "variance": variance, "standardError": (variance / count) ** 0.5}
+
+
+def playLive(game: str, bet: int, rounds: int, seed: int) -> dict[str, float]:
+    """Plays rounds through the live game functions; slow, so for a sample only."""
+    liveRound = GAMES[game][2]
+    random.seed(seed)  # The live games draw from the random module
+    nets = [liveRound(bet) for _ in range(rounds)]
+    mean = sum(nets) / rounds
+    variance = sum((net - mean) ** 2 for net in nets) / (rounds - 1) if rounds > 1 else 0.0
+    return {"rounds": rounds, "mean": mean, "variance": variance, "standardError": (variance / rounds) ** 0.5}
+
+
+def offBy(result: dict[str, float], exact: float) -> float:
+    """How many standard errors a result's mean is off the exact expected value."""
+    if result["standardError"] == 0:
+        return 0.0 if result["mean"] == exact else float("inf")
+    return abs(result["mean"] - exact) / result["standardError"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.casino", description="Monte-Carlo simulator for the SnekCoin casino games.")
+    parser.add_argument("--rounds", type=int, default=5_000_000, help="Simulated rounds per game and bet")
+    parser.add_argument("--live-rounds", dest="liveRounds", type=int, default=50_000, help="Rounds per game and bet played through the live game functions, 0 to skip")
+    parser.add_argument("--bets", default="2,3,10,50,100,1000", help="Comma separated bet sizes")
+    parser.add_argument("--games", default=",".join(GAMES), help=f"Comma separated games ({', '.join(GAMES)})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the simulation")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON results from an earlier run to compare house edges against")
+    parser.add_argument("--check", action="store_true", help=f"Exit with status 1 if a result is more than {CHECK_SIGMAS:g} standard errors off the exact value, or a house edge moved from --compare")
+    args = parser.parse_args()
+
+    if np is None:
+        parser.exit(2, "The casino simulator needs NumPy: <python> -m pip install numpy\n")
+
+    bets = [int(bet) for bet in args.bets.split(",") if bet.strip()]
+    games = [game.strip() for game in args.games.split(",") if game.strip()]
+    for game in games:
+        if game not in GAMES:
+            parser.error(f"unknown game '{game}'")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = []
+    results: dict[str, dict[str, dict]] = {}
+    print(f"  {'game':<9} {'bet':>6}  {'EV/round':>10}  {'exact EV':>10}  {'variance':>14}  {'house edge':>10}  {'exact edge':>10}  {'sim σ':>6}  {'live σ':>6}  {'ms':>8}")
+    for gameIndex, game in enumerate(games):
+        results[game] = {}
+        for betIndex, bet in enumerate(bets):
+            startedAt = time.perf_counter()
+            simulated = simulate(game, bet, args.rounds, args.seed + 1000 * gameIndex + betIndex)
+            elapsedMs = (time.perf_counter() - startedAt) * 1000
+            exact = GAMES[game][1](bet)
+            live = playLive(game, bet, args.liveRounds, args.seed + 1000 * gameIndex + betIndex) if args.liveRounds > 0 else None
+
+            result = {
+                **simulated,
+                "exactMean": exact,
+                "houseEdge": -simulated["mean"] / bet,
+                "exactHouseEdge": -exact / bet,
+                "simulatedOffBy": offBy(simulated, exact),
+                "liveOffBy": offBy(live, exact) if live is not None else None,
+                "milliseconds": elapsedMs,
+            }
+            results[game][str(bet)] = result
+
+            if result["simulatedOffBy"] > CHECK_SIGMAS:
+                failures.append(f"{game} bet {bet}: simulation off the exact EV by {result['simulatedOffBy']:.1f} standard errors")
+            if result["liveOffBy"] is not None and result["liveOffBy"] > CHECK_SIGMAS:
+                failures.append(f"{game} bet {bet}: live games off the exact EV by {result['liveOffBy']:.1f} standard errors")
+            baseResult = baseline.get("results", {}).get(game, {}).get(str(bet)) if baseline else None
+            if baseResult is not None and abs(baseResult["exactHouseEdge"] - result["exactHouseEdge"]) > EDGE_TOLERANCE:
+                failures.append(f"{game} bet {bet}: house edge {baseResult['exactHouseEdge']:.2%} -> {result['exactHouseEdge']:.2%}")
+
+            liveText = f"{result['liveOffBy']:>6.2f}" if result["liveOffBy"] is not None else f"{'-':>6}"
+            playerFavoured = " !" if result["exactHouseEdge"] < 0 else ""
+            print(f"  {game:<9} {bet:>6}  {result['mean']:>10.4f}  {exact:>10.4f}  {result['variance']:>14.2f}  {result['houseEdge']:>10.2%}  {result['exactHouseEdge']:>10.2%}  {result['simulatedOffBy']:>6.2f}  {liveText}  {elapsedMs:>8.1f}{playerFavoured}")
+
+    if any(result["exactHouseEdge"] < 0 for game in results.values() for result in game.values()):
+        print("\n  ! The player has the edge at this bet size")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "rounds": args.rounds, "results": results}, f, indent=4)
+        print(f"\nResults written to {args.output}")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import types, random, discord
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from constants import *
+
+
+# Stand-in for secret.py: no tokens, every external integration off
+OFFLINE_SECRET = {
+    "TOKEN": "",
+    "TOKEN_DEV": "",
+    "DEBUG": False,
+    "MOD_UPDATE_ACTIVE": False,
+    "SME_REMINDER_ACTIVE": False,
+    "SME_BIG_BROTHER": False,
+    "WORKSHOP_INTEREST_WIPE": False,
+    "SPREADSHEET_ACTIVE": False,
+    "REDDIT_ACTIVE": False,
+    "CLEAR_BUMP_ACTIVE": False,
+    "STORAGE_BACKEND": "json",
+    "METRICS_PORT": None,
+    "SFTP": {},
+    "REDDIT": {},
+    "DISCORD_LOGGING": {},
+}
+
+
+def offlineSecretModule() -> types.ModuleType:
+    """Builds a `secret` module that lets the cogs import without a real secret.py."""
+    module = types.ModuleType("secret")
+    module.__dict__.update(OFFLINE_SECRET)
+    return module
+
+
+# The fakes subclass the discord.py models so isinstance checks in the cogs pass,
+# but skip their constructors; only what the benchmarked paths touch is filled in.
+
+class FakeRole(discord.Role):
+    id = 0
+    name = ""
+    mention = ""
+    members: list = []
+
+    def __init__(self, roleId: int, name: str) -> None:
+        self.id = roleId
+        self.name = name
+        self.mention = f"<@&{roleId}>"
+        self.members = []
+
+
+class FakeMember(discord.Member):
+    id = 0
+    name = ""
+    global_name = None
+    discriminator = "0"
+    display_name = ""
+    mention = ""
+    roles: list = []
+    guild = None
+    bot = False
+
+    def __init__(self, memberId: int, name: str, guild: "FakeGuild") -> None:
+        self.id = memberId
+        self.name = name.lower().replace(" ", "_")
+        self.global_name = name
+        self.display_name = name
+        self.mention = f"<@{memberId}>"
+        self.roles = []
+        self.guild = guild
+
+    async def send(self, *args, **kwargs) -> None:
+        return None
+
+
+class FakeMessage(discord.Message):
+    id = 0
+    author = None
+    content = ""
+    embeds: list = []
+    attachments: list = []
+    components: list = []
+    channel = None
+
+    def __init__(self, messageId: int, channel: "FakeTextChannel", author: FakeMember, content: str | None = None, embeds: list | None = None, view: discord.ui.View | None = None) -> None:
+        self.id = messageId
+        self.channel = channel
+        self.author = author
+        self.content = content or ""
+        self.embeds = embeds or []
+        self.attachments = []
+        self.components = FakeMessage.componentsFromView(view)
+
+    @staticmethod
+    def componentsFromView(view: discord.ui.View | None) -> list:
+        if view is None:
+            return []
+        return [types.SimpleNamespace(children=[types.SimpleNamespace(custom_id=getattr(item, "custom_id", None)) for item in view.children])]
+
+    async def edit(self, *, content: str | None = discord.utils.MISSING, embed: discord.Embed | None = discord.utils.MISSING, view: discord.ui.View | None = discord.utils.MISSING, attachments: list = discord.utils.MISSING, **kwargs) -> "FakeMessage":
+        if content is not discord.utils.MISSING:
+            self.content = content or ""
+        if embed is not discord.utils.MISSING:
+            self.embeds = [embed] if embed is not None else []
+        if view is not discord.utils.MISSING:
+            self.components = FakeMessage.componentsFromView(view)
+        if attachments is not discord.utils.MISSING:
+            self.attachments = [types.SimpleNamespace(filename=attachment.filename) for attachment in attachments]
+        return self
+
+    async def delete(self, **kwargs) -> None:
+        if self in self.channel.messages:
+            self.channel.messages.remove(self)
+
+
+class FakeTextChannel(discord.TextChannel):
+    id = 0
+    name = ""
+    guild = None
+
+    def __init__(self, channelId: int, name: str, guild: "FakeGuild") -> None:
+        self.id = channelId
+        self.name = name
+        self.guild = guild
+        self.messages: list[FakeMessage] = []  # Oldest first
+
+    async def send(self, content: str | None = None, *, embed: discord.Embed | None = None, embeds: list | None = None, view: discord.ui.View | None = None, **kwargs) -> FakeMessage:
+        message = FakeMessage(self.guild.nextSnowflake(), self, self.guild.me, content, [embed] if embed is not None else embeds, view)
+        self.messages.append(message)
+        return message
+
+    async def purge(self, *, limit: int | None = None, check: Callable[[Any], bool] = lambda m: True, **kwargs) -> list:
+        purged = [message for message in self.messages if check(message)][:limit]
+        self.messages = [message for message in self.messages if message not in purged]
+        return purged
+
+    async def history(self, *, limit: int | None = 100, before: discord.abc.Snowflake | None = None, after: discord.abc.Snowflake | None = None, oldest_first: bool | None = None, **kwargs) -> AsyncIterator[FakeMessage]:
+        messages = [message for message in self.messages if (before is None or message.id < before.id) and (after is None or message.id > after.id)]
+        if oldest_first is None:
+            oldest_first = after is not None
+        for message in (messages if oldest_first else messages[::-1])[:limit]:
+            yield message
+
+    def get_partial_message(self, messageId: int, /) -> FakeMessage:
+        # A real partial message edits by id without fetching; unknown ids edit a detached message
+        return next((message for message in self.messages if message.id == messageId), None) or FakeMessage(messageId, self, self.guild.me)
+
+    async def delete_messages(self, messages: Iterable[discord.abc.Snowflake], /, **kwargs) -> None:
+        messageIds = {message.id for message in messages}
+        self.messages = [message for message in self.messages if message.id not in messageIds]
+
+    async def fetch_message(self, messageId: int, /) -> FakeMessage:
+        for message in self.messages:
+            if message.id == messageId:
+                return message
+        raise discord.NotFound(types.SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+
+class FakeGuild(discord.Guild):
+    id = GUILD_ID
+    name = "Benchmark Guild"
+    members: list = []
+    me = None
+
+    def __init__(self) -> None:
+        self.membersById: dict[int, FakeMember] = {}
+        self.members = []
+        self.rolesById: dict[int, FakeRole] = {}
+        self.channelsById: dict[int, FakeTextChannel] = {}
+        self.snowflake = 10**18
+        self.me = FakeMember(FRIENDLY_SNEK, "Friendly Snek", self)
+
+    def nextSnowflake(self) -> int:
+        self.snowflake += 1
+        return self.snowflake
+
+    def addMember(self, member: FakeMember) -> None:
+        self.membersById[member.id] = member
+        self.members.append(member)
+
+    def get_member(self, memberId: int, /) -> FakeMember | None:
+        return self.membersById.get(memberId)
+
+    def get_role(self, roleId: int, /) -> FakeRole | None:
+        return self.rolesById.get(roleId)
+
+    def get_channel(self, channelId: int, /) -> FakeTextChannel | None:
+        return self.channelsById.get(channelId)
+
+
+class FakeInteractionResponse:
+    def __init__(self) -> None:
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, *args, **kwargs) -> None:
+        self.done = True
+
+    async def send_message(self, *args, **kwargs) -> None:
+        self.done = True
+
+    async def edit_message(self, *args, **kwargs) -> None:
+        self.done = True
+
+    async def send_modal(self, *args, **kwargs) -> None:
+        self.done = True
+
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for handlers called directly."""
+    def __init__(self, user: FakeMember, guild: FakeGuild, message: FakeMessage | None = None) -> None:
+        self.user = user
+        self.guild = guild
+        self.message = message
+        self.channel = message.channel if message is not None else None
+        self.data: dict = {}
+        self.response = FakeInteractionResponse()
+        self.followup = types.SimpleNamespace(send=FakeInteraction.ignore)
+
+    @staticmethod
+    async def ignore(*args, **kwargs) -> None:
+        return None
+
+
+# ===== <World> =====
+
+TIME_ORIGIN = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)  # Fixed so runs are comparable across days
+
+
+def buildGuild(memberCount: int, rng: random.Random, roleIds: list[int]) -> FakeGuild:
+    """Creates a guild with members, roles and the channels the cogs look up.
+
+    Parameters:
+    memberCount (int): Number of members.
+    rng (random.Random): Seeded random source.
+    roleIds (list[int]): Roles to create; each member gets a few of them.
+
+    Returns:
+    FakeGuild: The guild.
+    """
+    guild = FakeGuild()
+    for roleId in roleIds:
+        guild.rolesById[roleId] = FakeRole(roleId, f"Role {roleId}")
+    for channelId, name in ((SCHEDULE, "schedule"), (STAFF_CHAT, "staff-chat"), (RECRUITMENT_AND_HR, "recruitment-and-hr"), (WORKSHOP_INTEREST, "workshop-interest")):
+        guild.channelsById[channelId] = FakeTextChannel(channelId, name, guild)
+
+    roles = list(guild.rolesById.values())
+    for i in range(memberCount):
+        member = FakeMember(10**17 + i, f"Member {i:05d} {rng.choice(('Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo'))}", guild)
+        for role in rng.sample(roles, k=min(len(roles), rng.randint(0, 3))):
+            member.roles.append(role)
+            role.members.append(member)
+        guild.addMember(member)
+    return guild
+
+
+def buildEvents(eventCount: int, guild: FakeGuild, rng: random.Random) -> list[dict]:
+    """Creates scheduled events spread over the coming months, with RSVPs from guild members.
+
+    Parameters:
+    eventCount (int): Number of events.
+    guild (FakeGuild): Guild whose members RSVP.
+    rng (random.Random): Seeded random source.
+
+    Returns:
+    list[dict]: The events, in the events.json format.
+    """
+    memberIds = list(guild.membersById)
+    events = []
+    for i in range(eventCount):
+        startTime = TIME_ORIGIN + timedelta(hours=30 * i)
+        durationHours = rng.randint(1, 4)
+        eventType = rng.choice(("Operation", "Operation", "Workshop", "Event"))
+        rsvps = rng.sample(memberIds, k=min(len(memberIds), rng.randint(10, 80)))
+        reservableRoles = {f"Role {n}": (rng.choice(memberIds) if rng.random() < 0.5 else None) for n in range(rng.randint(4, 16))} if rng.random() < 0.5 else None
+        events.append({
+            "authorId": rng.choice(memberIds),
+            "title": f"{eventType} {i}",
+            "description": "Synthetic event " * rng.randint(5, 40),
+            "externalURL": None,
+            "reservableRoles": reservableRoles,
+            "maxPlayers": rng.choice((None, 50, "anonymous")),
+            "map": rng.choice((None, "Altis", "Virolahti")),
+            "time": int(startTime.timestamp()),
+            "endTime": int((startTime + timedelta(hours=durationHours)).timestamp()),
+            "duration": f"{durationHours}h",
+            "type": eventType,
+            "files": [],
+            "eventId": str(10**9 + i),
+            "messageId": None,
+            "accepted": rsvps[:len(rsvps) // 2],
+            "declined": rsvps[len(rsvps) // 2:len(rsvps) * 3 // 4],
+            "tentative": rsvps[len(rsvps) * 3 // 4:],
+            "standby": [],
+            "checkedAcceptedReminders": False,
+            "checkedNoShowLogging": False,
+        })
+    return events
+
+
+def buildHistory(historyCount: int, guild: FakeGuild, workshopNames: list[str], rng: random.Random) -> list[dict]:
+    """Creates finished events over the two years before TIME_ORIGIN, oldest first.
+
+    Parameters:
+    historyCount (int): Number of history entries.
+    guild (FakeGuild): Guild whose members authored them.
+    workshopNames (list[str]): Workshop interest names to tag workshops with.
+    rng (random.Random): Seeded random source.
+
+    Returns:
+    list[dict]: The history entries.
+    """
+    memberIds = list(guild.membersById)
+    history = []
+    for i in range(historyCount):
+        startTime = TIME_ORIGIN - timedelta(days=730) + timedelta(minutes=int(730 * 24 * 60 * i / max(historyCount, 1)))
+        entry = {
+            "authorId": rng.choice(memberIds),
+            "title": f"History {i}",
+            "time": int(startTime.timestamp()),
+            "endTime": int((startTime + timedelta(hours=2)).timestamp()),
+            "type": "Operation",
+            "accepted": rng.sample(memberIds, k=min(len(memberIds), 20)),
+        }
+        if rng.random() < 0.4:
+            entry["type"] = "Workshop"
+            entry["workshopInterest"] = rng.choice(workshopNames)
+        history.append(entry)
+    return history
+
+
+def buildWallets(guild: FakeGuild, rng: random.Random) -> dict[str, dict]:
+    return {str(memberId): {"timesCommended": 0, "sentCommendations": 0, "money": rng.choice((0, rng.randint(1, 100000))), "moneySpent": 0, "timesBumped": 0} for memberId in guild.membersById}
+
+
+def buildWorkshopInterest(guild: FakeGuild, workshopNames: list[str], rng: random.Random) -> dict[str, dict]:
+    memberIds = list(guild.membersById)
+    return {name: {"messageId": guild.nextSnowflake(), "members": rng.sample(memberIds, k=len(memberIds) // 10)} for name in workshopNames}
@@ -0,0 +1,161 @@
+import os, json, random
+
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from cogs.schedule import Schedule, eventRenderCache
+from cogs.workshopInterest import WORKSHOP_INTEREST_LIST, WorkshopInterest
+from cogs.snekcoin import Snekcoin
+from cogs.staff import Staff
+from cogs.botTasks import BotTasks
+from storage import store, eventsHistory, workshopHosts, DATA_FILES
+from benchmarks.fakes import *
+
+from constants import *
+
+
+# Synthetic data sizes: guild members, scheduled events, event history entries
+SCALES = {
+    "small": {"members": 500, "events": 20, "history": 1_000},
+    "medium": {"members": 2_000, "events": 100, "history": 5_000},
+    "large": {"members": 5_000, "events": 300, "history": 20_000},
+}
+
+
+class World:
+    """A seeded guild plus the data files the benchmarked paths read."""
+    def __init__(self, members: int, events: int, history: int, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        self.workshopNames = list(WORKSHOP_INTEREST_LIST)
+        roleIds = sorted({VERIFIED, CANDIDATE, MEMBER, UNIT_STAFF, RECRUITMENT_TEAM, *SME_ROLES, *[details["role"] for details in WORKSHOP_INTEREST_LIST.values() if isinstance(details["role"], int)]})
+        self.guild = buildGuild(members, rng, roleIds)
+        self.events = buildEvents(events, self.guild, rng)
+        self.history = buildHistory(history, self.guild, self.workshopNames, rng)
+        self.wallets = buildWallets(self.guild, rng)
+        self.workshopInterest = buildWorkshopInterest(self.guild, self.workshopNames, rng)
+        # A member without the Verified role, so RSVPs are not blocked
+        self.rsvpMember = next(member for member in self.guild.members if all(role.id != VERIFIED for role in member.roles))
+
+    def install(self) -> None:
+        """Loads this world's data into the data store and the event history (in the current directory), and empties its channels and caches.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        for filename, emptyDocument in DATA_FILES.items():
+            store.documents[filename] = deepcopy(emptyDocument)
+        store.documents[EVENTS_FILE] = deepcopy(self.events)
+        store.documents[WALLETS_FILE] = deepcopy(self.wallets)
+        store.documents[WORKSHOP_INTEREST_FILE] = deepcopy(self.workshopInterest)
+        store.dirty.clear()
+        for filename in store.documents:
+            store.bumpVersion(filename)
+        for channel in self.guild.channelsById.values():
+            channel.messages.clear()
+        eventRenderCache.clear()
+
+        os.makedirs(eventsHistory.directory, exist_ok=True)
+        for year in eventsHistory.years():
+            os.remove(eventsHistory.segmentPath(year))
+        segments: dict[int, list[str]] = {}
+        for entry in self.history:
+            segments.setdefault(datetime.fromtimestamp(entry["time"], timezone.utc).year, []).append(json.dumps(entry) + "\n")
+        for year, lines in segments.items():
+            with open(eventsHistory.segmentPath(year), "w", encoding="utf-8") as f:
+                f.writelines(lines)
+        workshopHosts.clear()
+
+
+# ===== <Benchmarks> =====
+# Each takes the installed world and runs the path once. `prepare` runs before
+# timing starts, e.g. to post the schedule that later runs compare against.
+
+async def postSchedule(world: World) -> None:
+    await Schedule.updateSchedule(world.guild)
+
+
+async def postWorkshopInterest(world: World) -> None:
+    channel = world.guild.get_channel(WORKSHOP_INTEREST)
+    async with store.transaction(WORKSHOP_INTEREST_FILE) as wsIntFile:
+        for workshopName in world.workshopNames:
+            message = await channel.send(embed=WorkshopInterest.getWorkshopEmbed(world.guild, workshopName), view=WorkshopInterest.getWorkshopView())
+            wsIntFile[workshopName]["messageId"] = message.id
+
+
+async def benchGetEventEmbed(world: World) -> None:
+    for event in store.get(EVENTS_FILE):
+        Schedule.getEventEmbed(event, world.guild)
+
+
+async def benchUpdateSchedule(world: World) -> None:
+    await Schedule.updateSchedule(world.guild)
+
+
+async def benchUpdateScheduleOneChanged(world: World) -> None:
+    # Retitle the middle event, so one message has to be edited
+    events = store.get(EVENTS_FILE)
+    event = events[len(events) // 2]
+    event["title"] = event["title"] + " (edited)" if not event["title"].endswith(" (edited)") else event["title"].removesuffix(" (edited)")
+    await Schedule.updateSchedule(world.guild)
+
+
+async def benchScheduleRequiresRefresh(world: World) -> None:
+    if await Schedule.scheduleRequiresRefresh(world.guild):
+        raise RuntimeError("scheduleRequiresRefresh: freshly posted schedule reported as stale")
+
+
+async def benchRSVPAction(world: World) -> None:
+    # Accept on the last posted event; the next run toggles it back
+    event = store.get(EVENTS_FILE)[-1]
+    message = await world.guild.get_channel(SCHEDULE).fetch_message(event["messageId"])
+    await Schedule._handlePersistentRSVPAction(FakeInteraction(world.rsvpMember, world.guild, message), event, "accepted")
+
+
+async def benchEventCollisionCheck(world: World) -> None:
+    # After every scheduled event, so the whole list is scanned
+    startTime = TIME_ORIGIN + timedelta(days=365 * 5)
+    Schedule.eventCollisionCheck(startTime, startTime + timedelta(hours=2))
+
+
+async def benchLeaderboard(world: World) -> None:
+    await Snekcoin.leaderboard.callback(Snekcoin(None), FakeInteraction(world.rsvpMember, world.guild))
+
+
+async def benchGetMember(world: World) -> None:
+    # Unknown search term, so every member is compared
+    Staff._getMember("Nobody By This Name", world.guild)
+
+
+async def benchSmeBigBrother(world: World) -> None:
+    await BotTasks.smeBigBrother(world.guild, True)
+    world.guild.get_channel(STAFF_CHAT).messages.clear()
+
+
+async def benchWorkshopInterestRequiresRefresh(world: World) -> None:
+    if await WorkshopInterest.workshopInterestRequiresRefresh(world.guild):
+        raise RuntimeError("workshopInterestRequiresRefresh: freshly posted channel reported as stale")
+
+
+async def benchGetWorkshopEmbed(world: World) -> None:
+    for workshopName in world.workshopNames:
+        WorkshopInterest.getWorkshopEmbed(world.guild, workshopName)
+
+
+# name: (run, prepare)
+BENCHMARKS: dict[str, tuple[Callable[[World], Awaitable[None]], Callable[[World], Awaitable[None]] | None]] = {
+    "Schedule.getEventEmbed (all events)": (benchGetEventEmbed, None),
+    "Schedule.updateSchedule": (benchUpdateSchedule, None),
+    "Schedule.updateSchedule (one event changed)": (benchUpdateScheduleOneChanged, postSchedule),
+    "Schedule.scheduleRequiresRefresh": (benchScheduleRequiresRefresh, postSchedule),
+    "Schedule._handlePersistentRSVPAction": (benchRSVPAction, postSchedule),
+    "Schedule.eventCollisionCheck": (benchEventCollisionCheck, None),
+    "Snekcoin.leaderboard": (benchLeaderboard, None),
+    "Staff._getMember": (benchGetMember, None),
+    "BotTasks.smeBigBrother": (benchSmeBigBrother, None),
+    "WorkshopInterest.getWorkshopEmbed (all workshops)": (benchGetWorkshopEmbed, None),
+    "WorkshopInterest.workshopInterestRequiresRefresh": (benchWorkshopInterestRequiresRefresh, postWorkshopInterest),
+}
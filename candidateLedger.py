@@ -0,0 +1,108 @@
+import logging
+
+from storage import store
+
+from constants import *
+
+log = logging.getLogger("FriendlySnek")
+
+
+class CandidateLedger:
+    """Which candidate accepts Recruitment & HR was notified of, and which prospects were denied.
+
+    Kept in CANDIDATE_NOTIFICATIONS_FILE so the RSVP and interview paths look it up
+    instead of searching the channel history, which also missed anything that had
+    scrolled past the search limit. Layout:
+    {"accepts": {candidateId: [eventId, ...]}, "denials": {prospectId: deniedAt epoch}}.
+    """
+    @staticmethod
+    def _load() -> dict:
+        ledger = store.get(CANDIDATE_NOTIFICATIONS_FILE)
+        ledger.setdefault("accepts", {})
+        ledger.setdefault("denials", {})
+        return ledger
+
+    def claimAcceptNotice(self, candidateId: int, eventId: str) -> bool:
+        """Records that Recruitment & HR is notified of a candidate accepting an event.
+
+        Check and record happen without yielding to the event loop, so quick repeated
+        clicks notify only once. Release the claim if sending the notice fails.
+
+        Parameters:
+        candidateId (int): The candidate.
+        eventId (str): The accepted event.
+
+        Returns:
+        bool: True if not notified before, i.e. the caller should send the notice.
+        """
+        ledger = CandidateLedger._load()
+        eventIds = ledger["accepts"].setdefault(str(candidateId), [])
+        if eventId in eventIds:
+            return False
+        eventIds.append(eventId)
+        store.set(CANDIDATE_NOTIFICATIONS_FILE, ledger)
+        return True
+
+    def releaseAcceptNotice(self, candidateId: int, eventId: str) -> None:
+        """Undoes claimAcceptNotice when the notice could not be sent, so the next accept sends it.
+
+        Parameters:
+        candidateId (int): The candidate.
+        eventId (str): The accepted event.
+
+        Returns:
+        None.
+        """
+        ledger = CandidateLedger._load()
+        eventIds = ledger["accepts"].get(str(candidateId), [])
+        if eventId not in eventIds:
+            return
+        eventIds.remove(eventId)
+        if not eventIds:
+            del ledger["accepts"][str(candidateId)]
+        store.set(CANDIDATE_NOTIFICATIONS_FILE, ledger)
+
+    def forgetEvents(self, eventIds: set[str]) -> None:
+        """Drops accept notices of events that are gone from the schedule.
+
+        Parameters:
+        eventIds (set[str]): Ids of the removed events.
+
+        Returns:
+        None.
+        """
+        ledger = CandidateLedger._load()
+        changed = False
+        for candidateId, noticedEventIds in list(ledger["accepts"].items()):
+            remainingEventIds = [eventId for eventId in noticedEventIds if eventId not in eventIds]
+            if len(remainingEventIds) == len(noticedEventIds):
+                continue
+            changed = True
+            if remainingEventIds:
+                ledger["accepts"][candidateId] = remainingEventIds
+            else:
+                del ledger["accepts"][candidateId]
+        if changed:
+            store.set(CANDIDATE_NOTIFICATIONS_FILE, ledger)
+
+    def recordDenial(self, prospectId: int, deniedAt: float) -> None:
+        """Records a prospect denied in interview; an earlier denial is kept.
+
+        Parameters:
+        prospectId (int): The prospect.
+        deniedAt (float): Epoch seconds of the denial.
+
+        Returns:
+        None.
+        """
+        ledger = CandidateLedger._load()
+        if str(prospectId) not in ledger["denials"]:
+            ledger["denials"][str(prospectId)] = int(deniedAt)
+            store.set(CANDIDATE_NOTIFICATIONS_FILE, ledger)
+
+    def isDenied(self, prospectId: int) -> bool:
+        """Whether a prospect has been denied in interview before."""
+        return str(prospectId) in CandidateLedger._load()["denials"]
+
+
+candidateLedger = CandidateLedger()
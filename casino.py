@@ -0,0 +1,81 @@
+from random import random, randint, choices
+
+# Payout tables for the /snekcoin gamble games, shared by the live games below and
+# the offline simulator (benchmarks/casino.py). Payouts are won on top of the bet;
+# a loss costs the bet.
+
+## Coin flip: heads wins
+COIN_FLIP_WIN_CHANCE = 0.62  # ~7% house edge with 1.5x payout
+COIN_FLIP_PAYOUT = 0.5
+
+## Dice roll: the higher roll wins, a tie is a push
+DICE_ROLL_SIDES = 6
+DICE_ROLL_CASINO_EDGE_CHANCE = 0.0358  # Bot rolls a 6 regardless; ~7% casino edge with 1.9x payout
+DICE_ROLL_PAYOUT = 0.9
+
+## Slots: three equal symbols win that symbol's payout
+SLOT_SYMBOLS = {
+    "🍒": {"weight": 0.6, "payout": 3.2},
+    "🍋": {"weight": 0.15, "payout": 3.2},
+    "🔔": {"weight": 0.08, "payout": 3.2},
+    "⭐": {"weight": 0.06, "payout": 3.2},
+    "💎": {"weight": 0.1, "payout": 7},
+    "7️⃣": {"weight": 0.01, "payout": 25},
+}
+SLOT_REELS = 3
+
+
+def coinFlipPayout(bet: int) -> int:
+    return round(COIN_FLIP_PAYOUT * bet)
+
+
+def diceRollPayout(bet: int) -> int:
+    return round(DICE_ROLL_PAYOUT * bet)
+
+
+def slotsPayout(symbol: str, bet: int) -> int:
+    return round(SLOT_SYMBOLS[symbol]["payout"] * bet)
+
+
+def playCoinFlip(bet: int) -> tuple[bool, int]:
+    """Plays one coin flip.
+
+    Parameters:
+    bet (int): The bet.
+
+    Returns:
+    tuple[bool, int]: Whether the player won, and the payout if so.
+    """
+    won = random() < COIN_FLIP_WIN_CHANCE
+    return won, coinFlipPayout(bet)
+
+
+def playDiceRoll(bet: int) -> tuple[bool | None, int, int, int]:
+    """Plays one dice roll.
+
+    Parameters:
+    bet (int): The bet.
+
+    Returns:
+    tuple[bool | None, int, int, int]: Whether the player won (None on a tie), the player's roll, the bot's roll, and the payout if won.
+    """
+    casinoEdge = random() < DICE_ROLL_CASINO_EDGE_CHANCE
+    userRoll = randint(1, DICE_ROLL_SIDES)
+    botRoll = DICE_ROLL_SIDES if casinoEdge else randint(1, DICE_ROLL_SIDES)
+    won = None if userRoll == botRoll else userRoll > botRoll
+    return won, userRoll, botRoll, diceRollPayout(bet)
+
+
+def playSlots(bet: int) -> tuple[bool, list[str], int]:
+    """Plays one spin of the slots.
+
+    Parameters:
+    bet (int): The bet.
+
+    Returns:
+    tuple[bool, list[str], int]: Whether the player won, the reels, and the payout (0 on a loss).
+    """
+    symbols = list(SLOT_SYMBOLS)
+    reels = choices(symbols, weights=[SLOT_SYMBOLS[symbol]["weight"] for symbol in symbols], k=SLOT_REELS)
+    won = len(set(reels)) == 1
+    return won, reels, slotsPayout(reels[0], bet) if won else 0
@@ -1,11 +1,17 @@
-import secret, os, random, json, re, aiohttp, discord, logging, asyncio, tarfile
+import secret, os, sys, time, random, re, aiohttp, discord, logging, asyncio, threading
 import asyncpraw, pytz  # type: ignore
 
-from typing import Any
+from typing import Any, Awaitable, Callable
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from .workshopInterest import WORKSHOP_INTEREST_LIST, WorkshopInterest  # type: ignore
 from .spreadsheet import Spreadsheet
+from .snekcoin import Snekcoin
 from utils import Utils  # type: ignore
+from storage import store, eventsHistory, workshopHosts  # type: ignore
+from executors import runIO, runCPU, createArchive  # type: ignore
+from metrics import Metrics, Histogram  # type: ignore
+from scheduler import deadlineScheduler  # type: ignore
 
 from discord.ext import commands, tasks  # type: ignore
 
@@ -40,21 +46,130 @@ def chunkList(lst: list, n: int):
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
 
+
+class LoopLagMonitor:
+    """Measures event loop lag and names whatever was blocking the loop.
+
+    A heartbeat task on the loop measures how late each sleep wakes up. A
+    watcher thread notices when the heartbeat stops and samples the loop
+    thread's stack, so the blocking listener, command or task can be named
+    even though nothing else on the loop gets to run while it blocks.
+    """
+    REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def __init__(self) -> None:
+        self.samples: deque[tuple[float, float]] = deque(maxlen=int(LAG_WINDOW / LAG_SAMPLE_INTERVAL))  # (time, lag)
+        self.stalls: deque[dict] = deque(maxlen=LAG_STALL_HISTORY)
+        self.heartbeat = time.monotonic()
+        self.pendingStall: dict | None = None
+        self.loopThreadId: int | None = None
+        self.beatTask: asyncio.Task | None = None
+        self.stopEvent = threading.Event()
+
+    def start(self) -> None:
+        """Starts the heartbeat task and the watcher thread; call from the event loop."""
+        if self.beatTask is not None and not self.beatTask.done():
+            return
+        self.loopThreadId = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopEvent.clear()
+        self.beatTask = asyncio.create_task(self.beat())
+        threading.Thread(target=self.watch, name="FriendlySnekLagWatcher", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the heartbeat task and the watcher thread."""
+        self.stopEvent.set()
+        if self.beatTask is not None:
+            self.beatTask.cancel()
+
+    async def beat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag = max(loop.time() - expected, 0.0)
+            self.heartbeat = time.monotonic()
+            self.samples.append((time.time(), lag))
+
+            if lag < LAG_THRESHOLD:
+                self.pendingStall = None
+                continue
+
+            stall = self.pendingStall or {"culprit": "unknown (stall ended before it was sampled)", "blockedIn": None}
+            self.pendingStall = None
+            stall["time"] = datetime.now(timezone.utc)
+            stall["lag"] = lag
+            self.stalls.append(stall)
+            log.warning(f"LoopLagMonitor: event loop blocked for {lag * 1000:.0f} ms in {stall['culprit']}" + (f", at {stall['blockedIn']}" if stall["blockedIn"] else ""))
+
+    def watch(self) -> None:
+        while not self.stopEvent.wait(LAG_THRESHOLD / 2):
+            if self.pendingStall is not None or time.monotonic() - self.heartbeat < LAG_SAMPLE_INTERVAL + LAG_THRESHOLD:
+                continue
+            frame = sys._current_frames().get(self.loopThreadId or 0)
+            if frame is not None:
+                self.pendingStall = LoopLagMonitor.describeStack(frame)
+
+    @staticmethod
+    def describeStack(frame) -> dict:
+        """Names the outermost bot frame (the listener, command or task) and the innermost frame (where it blocks).
+
+        Parameters:
+        frame: Innermost frame of the loop thread.
+
+        Returns:
+        dict: {"culprit": str, "blockedIn": str | None}.
+        """
+        innermost = frame
+        culprit = None
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(LoopLagMonitor.REPO_ROOT):
+                culprit = frame
+            frame = frame.f_back
+
+        formatFrame = lambda f: f"{f.f_code.co_qualname} ({os.path.relpath(f.f_code.co_filename, LoopLagMonitor.REPO_ROOT) if f.f_code.co_filename.startswith(LoopLagMonitor.REPO_ROOT) else os.path.basename(f.f_code.co_filename)}:{f.f_lineno})"
+        return {
+            "culprit": formatFrame(culprit) if culprit is not None else "library code",
+            "blockedIn": formatFrame(innermost) if innermost is not culprit else None
+        }
+
+    def summary(self) -> dict:
+        """Lag statistics over the last LAG_WINDOW seconds, in milliseconds."""
+        cutoff = time.time() - LAG_WINDOW
+        lags = sorted(lag for sampleTime, lag in self.samples if sampleTime >= cutoff)
+        if not lags:
+            return {"current": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "current": self.samples[-1][1] * 1000,
+            "p50": lags[len(lags) // 2] * 1000,
+            "p95": lags[min(int(len(lags) * 0.95), len(lags) - 1)] * 1000,
+            "max": lags[-1] * 1000
+        }
+
+
 class BotTasks(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        self.loopLagMonitor = LoopLagMonitor()
+        self.redditNextRun = 0.0
+
+    async def cog_load(self) -> None:
+        # Started on load rather than on_ready so start-up and cog reloads are covered too
+        self.loopLagMonitor.start()
+
+    async def cog_unload(self) -> None:
+        self.loopLagMonitor.stop()
+        deadlineScheduler.removeSource("botTasks")
+        deadlineScheduler.removeSource("reminders")
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         log.debug(LOG_COG_READY.format("BotTasks"))
         self.bot.cogsReady["botTasks"] = True
 
-        if not self.oneHourTasks.is_running():
-            self.oneHourTasks.start()
-
-        if not self.fiveMinTasks.is_running():
-            self.fiveMinTasks.start()
+        deadlineScheduler.addSource("botTasks", (REPEATED_MSG_DATE_LOG_FILE,), self.scheduledJobs)
+        deadlineScheduler.addSource("reminders", (REMINDERS_FILE,), self.reminderJobs)
 
         if not self.fifteenMinTasks.is_running():
             self.fifteenMinTasks.start()
@@ -89,7 +204,7 @@ class BotTasks(commands.Cog):
                 await channelAuditLogs.send(embed=embed)
 
         # Add to spreadsheet
-        Spreadsheet.memberJoin(member)
+        await runIO(Spreadsheet.memberJoin, member)
 
         #if Member account was created less than 45 days ago, alert unit staff and assign only suspicious account role
         if (datetime.now(timezone.utc) - member.created_at) < timedelta(days=45):
@@ -163,19 +278,15 @@ class BotTasks(commands.Cog):
 
         # Add newcomer reminder
         remindTime = datetime.now() + timedelta(days=1)
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
-
-        for reminder in reminders.items():
-            if reminder[1]["type"] == "newcomer" and reminder[1]["userID"] == member.id:
-                return
+        async with store.transaction(REMINDERS_FILE) as reminders:
+            for reminder in reminders.items():
+                if reminder[1]["type"] == "newcomer" and reminder[1]["userID"] == member.id:
+                    return
 
-        reminders[datetime.timestamp(remindTime)] = {
-            "type": "newcomer",
-            "userID": member.id
-        }
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reminders, f, indent=4)
+            reminders[str(datetime.timestamp(remindTime))] = {
+                "type": "newcomer",
+                "userID": member.id
+            }
 
 
 
@@ -215,17 +326,16 @@ class BotTasks(commands.Cog):
         CHECK_MOD_UPDATE_INTERVAL = 2  # hours
 
         output = []
-        with open(GENERIC_DATA_FILE) as f:
-            genericData = json.load(f)
-            if "modpackIds" not in genericData:
-                log.exception("BotTasks checkModUpdates: modpackIds not in genericData")
-                return
+        genericData = store.get(GENERIC_DATA_FILE)
+        if "modpackIds" not in genericData:
+            log.exception("BotTasks checkModUpdates: modpackIds not in genericData")
+            return
 
-            if "jcaCounter" not in genericData:
-                genericData["jcaCounter"] = 0
+        if "jcaCounter" not in genericData:
+            genericData["jcaCounter"] = 0
 
-            if "modUpdateMetadata" not in genericData or not isinstance(genericData["modUpdateMetadata"], dict):
-                genericData["modUpdateMetadata"] = {}
+        if "modUpdateMetadata" not in genericData or not isinstance(genericData["modUpdateMetadata"], dict):
+            genericData["modUpdateMetadata"] = {}
 
         jcaModUpdateFound = False
         detectedChanges: list[dict[str, Any]] = []
@@ -280,8 +390,7 @@ class BotTasks(commands.Cog):
                 jcaModUpdateFound = True
 
 
-        with open(GENERIC_DATA_FILE, "w") as f:
-            json.dump(genericData, f, indent=4)
+        store.set(GENERIC_DATA_FILE, genericData)
 
         if len(output) > 0:
             # Create message
@@ -320,12 +429,10 @@ class BotTasks(commands.Cog):
         nextTime = nextTime.replace(microsecond=0)
         nextTime = datetime.timestamp(nextTime)
 
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
 
         msgDateLog["modUpdates"] = nextTime
-        with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-            json.dump(msgDateLog, f, indent=4)
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
 
 
@@ -458,10 +565,10 @@ Join Us:
                 os.remove(entry.path)
 
     @staticmethod
-    def createDataBackup() -> None:
+    async def createDataBackup() -> None:
         """Create a timestamped tar.xz archive of the data directory."""
         os.makedirs(BACKUP_DIR, exist_ok=True)
-        BotTasks.pruneOldDataBackups()
+        await runIO(BotTasks.pruneOldDataBackups)
 
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
         archivePath = os.path.join(BACKUP_DIR, f"{timestamp}_data.tar.xz")
@@ -470,16 +577,13 @@ Join Us:
             log.warning(f"BotTasks createDataBackup: backup already exists '{archivePath}', skipping")
             return
 
-        with tarfile.open(archivePath, mode="x:xz") as archive:
-            archive.add(DATA_DIR, arcname=os.path.basename(DATA_DIR), recursive=True)
+        # xz of the whole data directory takes seconds; keep it off the event loop
+        await runCPU(createArchive, DATA_DIR, archivePath)
 
     async def smeReminder(self) -> None:
         """Pings SME role if workshops haven't been hosted in required time."""
 
-        with open(EVENTS_HISTORY_FILE) as f:
-            eventsHistory = json.load(f)
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
+        scheduledWorkshops = {event.get("workshopInterest") for event in store.get(EVENTS_FILE)}
 
         smeCorner = self.bot.get_channel(SME_CORNER)
         if not isinstance(smeCorner, discord.TextChannel):
@@ -488,37 +592,28 @@ Join Us:
 
         pingEmbed = discord.Embed(color=discord.Color.orange())
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            wsIntFile: dict = json.load(f)
+        wsIntFile: dict = store.get(WORKSHOP_INTEREST_FILE)
         wsHostDone = []
         wsHostFailed = []
         for wsName, wsDetails in WORKSHOP_INTEREST_LIST.items():
-            wsScheduled = False
             # Check for scheduled events
-            for event in events:
-                if "workshopInterest" in event and event["workshopInterest"] == wsName:
-                    wsScheduled = True
-                    wsHostDone.append(wsName)
-                    break
-
-            if wsScheduled:
+            if wsName in scheduledWorkshops:
+                wsHostDone.append(wsName)
                 continue
 
             pingEmbed.title = f"Workshop Reminder [{wsName}]"
             pingEmbed.description = f"\n\nInterested people signed up on workshop-interest: {len(wsIntFile.get(wsName, {'members': []}).get('members', []))}"
 
             # Check for past events
-            for event in eventsHistory[::-1]:  # Newest to oldest
-                if "workshopInterest" in event and event["workshopInterest"] == wsName:
-
-                    # Send reminder if latest workshop was scheduled more than 60 days ago
-                    if datetime.strptime(event["time"], TIME_FORMAT) < (datetime.now() - timedelta(days=60)):
-                        eventScheduled = pytz.utc.localize(datetime.strptime(event['time'], TIME_FORMAT))
-                        pingEmbed.description = f"Last `{wsName}` event you had (`{event['title']}`) was at {discord.utils.format_dt(eventScheduled, style='F')} ({discord.utils.format_dt(eventScheduled, style='R')}).\nPlease host at least every 2 months to give everyone a chance to cert!" + pingEmbed.description
-                        await smeCorner.send(self.getPingString(wsDetails["role"]), embed=pingEmbed)
-                    else:
-                        wsHostDone.append(wsName)
-                    break
+            if (lastHost := workshopHosts.lastHosted(wsName)) is not None:
+                lastHostTime, lastHostTitle = lastHost
+                # Send reminder if latest workshop was scheduled more than 60 days ago
+                if lastHostTime < Utils.toEpoch(datetime.now(timezone.utc) - timedelta(days=60)):
+                    eventScheduled = Utils.fromEpoch(lastHostTime)
+                    pingEmbed.description = f"Last `{wsName}` event you had (`{lastHostTitle}`) was at {discord.utils.format_dt(eventScheduled, style='F')} ({discord.utils.format_dt(eventScheduled, style='R')}).\nPlease host at least every 2 months to give everyone a chance to cert!" + pingEmbed.description
+                    await smeCorner.send(self.getPingString(wsDetails["role"]), embed=pingEmbed)
+                else:
+                    wsHostDone.append(wsName)
 
             else:  # No workshop found
                 pingEmbed.description = f"Last `{wsName}` event you had couldn't be found in my logs.\nPlease host at least every 2 months to give everyone a chance to cert!" + pingEmbed.description
@@ -536,58 +631,41 @@ Join Us:
 
 
         # Update next execution time
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
 
         # Get datetime for next time in 6 months
         nextTime = Reminders.getFirstDayNextMonth()
 
         msgDateLog["smeReminder"] = datetime.timestamp(nextTime)
-        with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-            json.dump(msgDateLog, f, indent=4)
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
         log.info("Bottasks smeReminder: SME reminder sent & updated time")
 
     @staticmethod
     async def clearBumps(guild: discord.Guild) -> None:
-        """ Clears daily /bump limit for users."""
+        """Announces the daily /bump limit reset."""
         CLEAR_BUMP_TIMES_INTERVAL = 24.0 # hours
 
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
 
         # Calculate next execution time (next day at midnight UTC)
         nextTime = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(hours=CLEAR_BUMP_TIMES_INTERVAL)
-        sendBumpResetMessage = False
-
-        try:
-            # Reset all wallet bump counts
-            with open(WALLETS_FILE, "r", encoding="utf-8") as f:
-                wallets = json.load(f)
-
-            for walletData in wallets.values():
-                if not sendBumpResetMessage and walletData.get("timesBumped", 0) > 0:
-                    sendBumpResetMessage = True
-                walletData["timesBumped"] = 0
-
-            with open(WALLETS_FILE, "w", encoding="utf-8") as f:
-                json.dump(wallets, f, indent=4)
 
-            # Update next execution time
-            msgDateLog["clearBumpTimes"] = datetime.timestamp(nextTime)
-            with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-                json.dump(msgDateLog, f, indent=4)
+        # Bump counters are stamped with their day and read as zero the next, so nothing to clear;
+        # only announce the reset if anyone bumped yesterday
+        yesterday = Snekcoin.bumpDay() - 1
+        sendBumpResetMessage = any(walletData.get("bumpDay") == yesterday and walletData.get("timesBumped", 0) > 0 for walletData in store.get(WALLETS_FILE).values())
 
-            log.debug("Bottasks oneHourTasks: cleared timesBumped in all wallets")
-        except Exception as e:
-            log.warning(f"Bottasks oneHourTasks: failed to clear timesBumped in wallets: {e}")
+        # Update next execution time
+        msgDateLog["clearBumpTimes"] = datetime.timestamp(nextTime)
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
         if not sendBumpResetMessage:
             return
 
         casinoChannel = guild.get_channel(CASINO)
         if not isinstance(casinoChannel, discord.TextChannel):
-            log.exception("Bottasks oneHourTasks: casinoChannel not discord.TextChannel")
+            log.exception("Bottasks clearBumps: casinoChannel not discord.TextChannel")
             return
 
         # Send bump reset message
@@ -599,7 +677,7 @@ Join Us:
             )
             await casinoChannel.send(embed=embed)
         except Exception:
-            log.warning("Bottasks oneHourTasks: failed to send bump reset message")
+            log.warning("Bottasks clearBumps: failed to send bump reset message")
 
 
     @staticmethod
@@ -610,11 +688,7 @@ Join Us:
             log.exception("Bottasks smeBigBrother: channelStaffChat is None")
             return
 
-        with open(EVENTS_HISTORY_FILE) as f:
-            eventsHistory = json.load(f)
-
-        searchTime = datetime.now(timezone.utc) - timedelta(weeks=26.0)  # Last 6 months
-        eventsHistorySorted = sorted(eventsHistory, key=lambda event: event["time"], reverse=True)
+        searchEpoch = int((datetime.now(timezone.utc) - timedelta(weeks=26.0)).timestamp())  # Last 6 months
         bigBrotherWatchList = {}
 
         # Iterate all SME roles
@@ -630,26 +704,9 @@ Join Us:
 
             # Iterate SME holders
             for memberSme in roleSme.members:
-                # Search in old
-                isWsFound = False
-                for event in eventsHistorySorted:  # Newest to oldest
-                    eventScheduled = pytz.utc.localize(datetime.strptime(event["time"], TIME_FORMAT))
-                    if "workshopInterest" in event and event["workshopInterest"] == wsName and event["authorId"] == memberSme.id and eventScheduled > searchTime:
-                        isWsFound = True
-                        eventScheduledFormat = discord.utils.format_dt(eventScheduled, style="R")
-                        if memberSme.display_name not in bigBrotherWatchList:
-                            bigBrotherWatchList[memberSme.display_name] = {roleSme.mention: {"count": 1, "time": eventScheduledFormat}}
-                        elif roleSme.mention not in bigBrotherWatchList[memberSme.display_name]:
-                            bigBrotherWatchList[memberSme.display_name][roleSme.mention] = {"count": 1, "time": eventScheduledFormat}
-                        else:
-                            bigBrotherWatchList[memberSme.display_name][roleSme.mention]["count"] += 1
-
-
-                if not isWsFound:  # No workshop found
-                    if memberSme.display_name not in bigBrotherWatchList:
-                        bigBrotherWatchList[memberSme.display_name] = {roleSme.mention: {"count": 0, "time": None}}
-                    else:
-                        bigBrotherWatchList[memberSme.display_name][roleSme.mention] = {"count": 0, "time": None}
+                hostTimes = workshopHosts.hosted(wsName, memberSme.id, since=searchEpoch)
+                statistics = {"count": len(hostTimes), "time": discord.utils.format_dt(Utils.fromEpoch(hostTimes[-1]), style="R") if hostTimes else None}
+                bigBrotherWatchList.setdefault(memberSme.display_name, {})[roleSme.mention] = statistics
 
 
         embedsToSend = []
@@ -675,8 +732,7 @@ Join Us:
 
 
         # Update next execution time
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
 
         # Get datetime for next time in 6 months
         nextTime = Reminders.getFirstDayNextMonth()
@@ -684,8 +740,7 @@ Join Us:
             nextTime = Reminders.getFirstDayNextMonth(nextTime)
 
         msgDateLog["smeBigBrother"] = datetime.timestamp(nextTime)
-        with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-            json.dump(msgDateLog, f, indent=4)
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
 
     @staticmethod
@@ -694,8 +749,7 @@ Join Us:
         log.info("BotTasks workshopInterestWipe: wiping workshop interest lists")
 
         # Update next execution time
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
 
         # Get datetime for next time in 1 year
         nextTime = Reminders.getFirstDayNextMonth()
@@ -703,8 +757,7 @@ Join Us:
             nextTime = Reminders.getFirstDayNextMonth(nextTime)
 
         msgDateLog["workshopInterestWipe"] = datetime.timestamp(nextTime)
-        with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-            json.dump(msgDateLog, f, indent=4)
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
         # Wipe workshop interest lists
         channelWorkshopInterest = guild.get_channel(WORKSHOP_INTEREST)
@@ -712,28 +765,14 @@ Join Us:
             log.exception("BotTasks workshopInterestWipe: channelWorkshopInterest not discord.TextChannel")
             return
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            wsIntFile = json.load(f)
-
-        for wsName in WORKSHOP_INTEREST_LIST.keys():
-            wsIntFile[wsName]["members"] = []
-        with open(WORKSHOP_INTEREST_FILE, "w") as f:
-            json.dump(wsIntFile, f, indent=4)
+        async with store.transaction(WORKSHOP_INTEREST_FILE) as wsIntFile:
+            for wsName in WORKSHOP_INTEREST_LIST.keys():
+                wsIntFile[wsName]["members"] = []
 
         # Update embeds
         for wsName in WORKSHOP_INTEREST_LIST.keys():
             try:
-                wsIntEmbed = await channelWorkshopInterest.fetch_message(wsIntFile[wsName].get("messageId", 0))
-            except Exception:
-                log.warning(f"BotTasks workshopInterestWipe: failed to fetch wsIntEmbed '{wsName}' with id '{wsIntFile[wsName].get('messageId', 0)}'")
-                continue
-
-            if not isinstance(wsIntEmbed, discord.Message):
-                log.warning("BotTasks workshopInterestWipe: wsIntEmbed not discord.Message")
-                continue
-
-            try:
-                await wsIntEmbed.edit(embed=WorkshopInterest.getWorkshopEmbed(guild, wsName))
+                await channelWorkshopInterest.get_partial_message(wsIntFile[wsName].get("messageId", 0)).edit(embed=WorkshopInterest.getWorkshopEmbed(guild, wsName))
             except Exception:
                 log.warning(f"BotTasks workshopInterestWipe: failed to edit wsIntEmbed '{wsName}'")
 
@@ -746,72 +785,91 @@ Join Us:
         await channelAnnouncements.send("@everyone", embed=discord.Embed(title="🧻 Workshop Interest Wipe 🧻", description="Happy new years!\nAll workshop interest lists have been wiped. Please re-sign up for any workshops you are interested in.\n\nThis ensures that inactive members are purged off the lists.", color=discord.Color.orange()), allowed_mentions=discord.AllowedMentions.all())
 
 
-    @tasks.loop(hours=1.0)
-    async def oneHourTasks(self) -> None:
-        # redditRecruitmentPosts
-        if secret.REDDIT_ACTIVE:
-            try:
-                await self.redditRecruitmentPosts()
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: Reddit recruitment posts")
-
-        # smeReminder
-        with open(REPEATED_MSG_DATE_LOG_FILE) as f:
-            msgDateLog = json.load(f)
+    def scheduledJobs(self) -> list[tuple[str, float, Callable[[], Awaitable[None]]]]:
+        """Lists the repeated jobs for the deadline scheduler, due at the times kept in REPEATED_MSG_DATE_LOG_FILE.
 
-        if secret.SME_REMINDER_ACTIVE and ("smeReminder" not in msgDateLog or (datetime.fromtimestamp(msgDateLog["smeReminder"], tz=pytz.utc) < datetime.now(timezone.utc))):
-            try:
-                await self.smeReminder()
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: SME reminder")
+        Parameters:
+        None.
 
+        Returns:
+        list[tuple[str, float, Callable[[], Awaitable[None]]]]: Job name, deadline (epoch seconds) and job.
+        """
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
+        jobs = [("eventsHistoryCompact", msgDateLog.get("eventsHistoryCompact", 0), BotTasks.compactEventsHistory)]
+        if secret.REDDIT_ACTIVE:
+            jobs.append(("redditRecruitmentPosts", self.redditNextRun, self.redditRecruitmentPostsJob))
+        if secret.SME_REMINDER_ACTIVE:
+            jobs.append(("smeReminder", msgDateLog.get("smeReminder", 0), self.smeReminder))
+        if secret.SME_BIG_BROTHER:
+            jobs.append(("smeBigBrother", msgDateLog.get("smeBigBrother", 0), self.smeBigBrotherJob))
+        if secret.WORKSHOP_INTEREST_WIPE:
+            jobs.append(("workshopInterestWipe", msgDateLog.get("workshopInterestWipe", 0), self.workshopInterestWipeJob))
+        if secret.MOD_UPDATE_ACTIVE:
+            jobs.append(("modUpdates", msgDateLog.get("modUpdates", 0), self.checkModUpdates))
+        if secret.CLEAR_BUMP_ACTIVE:
+            jobs.append(("clearBumpTimes", msgDateLog.get("clearBumpTimes", 0), self.clearBumpsJob))
+        return jobs
+
+    def getGuild(self) -> discord.Guild | None:
         guild = self.bot.get_guild(GUILD_ID)
         if guild is None:
-            log.exception("Bottasks oneHourTasks: guild is None")
-            return
+            log.exception("Bottasks getGuild: guild is None")
+        return guild
+
+    async def redditRecruitmentPostsJob(self) -> None:
+        # Checked hourly; redditRecruitmentPosts decides itself whether a post is due
+        self.redditNextRun = time.time() + 3600
+        await self.redditRecruitmentPosts()
+
+    async def smeBigBrotherJob(self) -> None:
+        if (guild := self.getGuild()) is not None:
+            await BotTasks.smeBigBrother(guild, False)
+
+    async def workshopInterestWipeJob(self) -> None:
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
+        if "workshopInterestWipe" not in msgDateLog:
+            log.info("Bottasks workshopInterestWipeJob: workshopInterestWipe not in msgDateLog - set timestamp to 1 Jan next year")
+            msgDateLog["workshopInterestWipe"] = datetime(datetime.now(timezone.utc).year+1, 1, 1, 12, 0, 0, 0, tzinfo=pytz.utc).timestamp()
+            store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
+        elif (guild := self.getGuild()) is not None:
+            await BotTasks.workshopInterestWipe(guild)
 
-        # smeBigBrother
-        if secret.SME_BIG_BROTHER and ("smeBigBrother" not in msgDateLog or (datetime.fromtimestamp(msgDateLog["smeBigBrother"], tz=pytz.utc) < datetime.now(timezone.utc))):
-            try:
-                await BotTasks.smeBigBrother(guild, False)
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: SME big brother")
+    async def clearBumpsJob(self) -> None:
+        if (guild := self.getGuild()) is not None:
+            await BotTasks.clearBumps(guild)
 
-        # workshopInterestWipe
-        if secret.WORKSHOP_INTEREST_WIPE and "workshopInterestWipe" not in msgDateLog:
-            log.info("Bottasks oneHourTasks: workshopInterestWipe not in msgDateLog - set timestamp to 1 Jan next year")
-            msgDateLog["workshopInterestWipe"] = datetime(datetime.now(timezone.utc).year+1, 1, 1, 12, 0, 0, 0, tzinfo=pytz.utc).timestamp()
-            with open(REPEATED_MSG_DATE_LOG_FILE, "w") as f:
-                json.dump(msgDateLog, f, indent=4)
-        elif secret.WORKSHOP_INTEREST_WIPE and (datetime.fromtimestamp(msgDateLog["workshopInterestWipe"], tz=pytz.utc) < datetime.now(timezone.utc)):
-            try:
-                await BotTasks.workshopInterestWipe(guild)
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: workshopInterestWipe")
+    @staticmethod
+    async def compactEventsHistory() -> None:
+        """Compacts last year's event history segments, once a year."""
+        currentYear = datetime.now(timezone.utc).year
+        for year in eventsHistory.years():
+            if year < currentYear:
+                await eventsHistory.compact(year)
+        msgDateLog = store.get(REPEATED_MSG_DATE_LOG_FILE)
+        msgDateLog["eventsHistoryCompact"] = datetime(currentYear+1, 1, 1, 12, 0, 0, 0, tzinfo=pytz.utc).timestamp()
+        store.set(REPEATED_MSG_DATE_LOG_FILE, msgDateLog)
 
-        # checkModUpdates
-        if secret.MOD_UPDATE_ACTIVE and ("modUpdates" not in msgDateLog or (datetime.fromtimestamp(msgDateLog["modUpdates"], tz=pytz.utc) < datetime.now(timezone.utc))):
-            try:
-                await self.checkModUpdates()
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: checkModUpdates")
 
-        # clear timesBumped in all wallets
-        if secret.CLEAR_BUMP_ACTIVE and ("clearBumpTimes" not in msgDateLog or (datetime.fromtimestamp(msgDateLog["clearBumpTimes"], tz=pytz.utc) < datetime.now(timezone.utc))):
-            try:
-                await BotTasks.clearBumps(guild)
-            except Exception:
-                log.exception(f"Bottasks oneHourTasks: clear wallet bumps")
+    def reminderJobs(self) -> list[tuple[str, float, Callable[[], Awaitable[None]]]]:
+        """Lists the reminder job for the deadline scheduler, due at the earliest reminder.
 
+        Parameters:
+        None.
+
+        Returns:
+        list[tuple[str, float, Callable[[], Awaitable[None]]]]: Job name, deadline (epoch seconds) and job.
+        """
+        reminders = store.get(REMINDERS_FILE)
+        if not reminders:
+            return []
+        return [("due", min(float(reminderTime) for reminderTime in reminders), self.sendDueReminders)]
 
-    @tasks.loop(minutes=5)
-    async def fiveMinTasks(self) -> None:
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
+    async def sendDueReminders(self) -> None:
+        reminders = store.get(REMINDERS_FILE)
 
         removalList = []
         updateTimeList = []
-        for time, details in reminders.items():
+        for time, details in list(reminders.items()):
             reminderTime = datetime.fromtimestamp(float(time))
             if reminderTime > datetime.now():
                 continue
@@ -821,7 +879,7 @@ Join Us:
             # Guild
             guild = self.bot.get_guild(GUILD_ID)
             if guild is None:
-                log.exception("Bottasks fiveMinTasks: guild is None")
+                log.exception("Bottasks sendDueReminders: guild is None")
                 return
 
             # User
@@ -831,22 +889,22 @@ Join Us:
                 removalList.append(time)
 
                 if member is None:
-                    log.debug("Bottasks fiveMinTasks: Newcomer is no longer in the server")
+                    log.debug("Bottasks sendDueReminders: Newcomer is no longer in the server")
                     continue
 
                 if len(member.roles) > 2:
-                    log.debug(f"Bottasks fiveMinTasks: Newcomer already verified '{member}'")
+                    log.debug(f"Bottasks sendDueReminders: Newcomer already verified '{member}'")
                     continue
 
                 channelWelcome = guild.get_channel(WELCOME)
                 if not isinstance(channelWelcome, discord.TextChannel):
-                    log.exception("Bottasks fiveMinTasks: channelWelcome not TextChannel")
+                    log.exception("Bottasks sendDueReminders: channelWelcome not TextChannel")
                     return
 
 
                 roleRecruitmentTeam = guild.get_role(RECRUITMENT_TEAM)
                 if roleRecruitmentTeam is None:
-                    log.exception("Bottasks fiveMinTasks: roleRecruitmentTeam is None")
+                    log.exception("Bottasks sendDueReminders: roleRecruitmentTeam is None")
                     return
 
                 hasUserPinged = len([
@@ -865,14 +923,14 @@ Join Us:
             ## REMINDERS
 
             if member is None:
-                log.warning("Bottasks fiveMinTasks: member is None")
+                log.warning("Bottasks sendDueReminders: member is None")
                 removalList.append(time)
                 continue
 
             # Channel
             channel = self.bot.get_channel(details["channelID"])
             if channel is None or not isinstance(channel, discord.TextChannel):
-                log.warning("Bottasks fiveMinTasks: channel not TextChannel")
+                log.warning("Bottasks sendDueReminders: channel not TextChannel")
                 removalList.append(time)
                 continue
 
@@ -903,27 +961,88 @@ Join Us:
             removalList.append(time)
 
 
-        for updateTime in updateTimeList:
-            reminderTime = datetime.fromtimestamp(float(updateTime))
-            reminders[updateTime]["setTime"] = datetime.now().timestamp()
-            reminders[datetime.timestamp(reminderTime + timedelta(seconds=reminders[updateTime]["timedeltaSeconds"]))] = reminders[updateTime]
-
-        # Update file
-        for removal in removalList:
-            del reminders[removal]
+        # Update file; reminders may have been added or deleted while sending
+        async with store.transaction(REMINDERS_FILE) as reminders:
+            for updateTime in updateTimeList:
+                if updateTime not in reminders:
+                    continue
+                reminderTime = datetime.fromtimestamp(float(updateTime))
+                reminders[updateTime]["setTime"] = datetime.now().timestamp()
+                reminders[str(datetime.timestamp(reminderTime + timedelta(seconds=reminders[updateTime]["timedeltaSeconds"])))] = reminders[updateTime]
 
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reminders, f, indent=4)
+            for removal in removalList:
+                reminders.pop(removal, None)
 
 
     @tasks.loop(minutes=15)
+    @Metrics.timedTask
     async def fifteenMinTasks(self) -> None:
         try:
-            BotTasks.createDataBackup()
+            await store.flush()  # Back up what is in memory, not what was last written
+            await BotTasks.createDataBackup()
         except Exception:
             log.exception("BotTasks fifteenMinTasks: failed to create data backup")
 
 
+    @discord.app_commands.command(name="looplag")
+    @discord.app_commands.guilds(GUILD)
+    @discord.app_commands.checks.has_any_role(*CMD_LIMIT_STAFF)
+    async def loopLag(self, interaction: discord.Interaction) -> None:
+        """Shows event loop lag and what recently blocked the bot."""
+        summary = self.loopLagMonitor.summary()
+        embed = discord.Embed(
+            title="Event loop lag",
+            description=f"Last {LAG_WINDOW // 60} minutes: current `{summary['current']:.0f} ms`, median `{summary['p50']:.0f} ms`, p95 `{summary['p95']:.0f} ms`, max `{summary['max']:.0f} ms`.",
+            color=discord.Color.green() if summary["max"] < LAG_THRESHOLD * 1000 else discord.Color.orange()
+        )
+
+        stallsText = ""
+        for stall in reversed(self.loopLagMonitor.stalls):  # Newest first, as many as fit in a field
+            stallLine = f"{discord.utils.format_dt(stall['time'], style='R')} `{stall['lag'] * 1000:.0f} ms` {stall['culprit']}" + (f"\n-# at {stall['blockedIn']}" if stall["blockedIn"] else "") + "\n"
+            if len(stallsText) + len(stallLine) > 1024:
+                break
+            stallsText += stallLine
+        embed.add_field(name=f"Stalls over {LAG_THRESHOLD * 1000:.0f} ms", value=stallsText or "None", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+    @discord.app_commands.command(name="metrics")
+    @discord.app_commands.guilds(GUILD)
+    @discord.app_commands.checks.has_any_role(*CMD_LIMIT_STAFF)
+    @discord.app_commands.describe(kind="Which handlers to show.")
+    @discord.app_commands.choices(kind=[discord.app_commands.Choice(name=name, value=value) for name, value in (("Slash commands", "app_command"), ("Buttons", "component"), ("Prefix commands", "prefix_command"), ("Tasks", "task"))])
+    async def metrics(self, interaction: discord.Interaction, kind: discord.app_commands.Choice[str] | None = None) -> None:
+        """Shows handler latencies since the bot started, slowest first."""
+        handlers = {(handlerKind, name) for (_, handlerKind, name) in Metrics.histograms if kind is None or handlerKind == kind.value}
+        emptyHistogram = Histogram()
+        rows = []
+        for handlerKind, name in handlers:
+            total = Metrics.histograms.get(("handler_seconds", handlerKind, name), emptyHistogram)
+            firstResponse = Metrics.histograms.get(("first_response_seconds", handlerKind, name))
+            errors = Metrics.counters.get(("handler_errors_total", handlerKind, name), 0)
+            unanswered = Metrics.counters.get(("unanswered_total", handlerKind, name), 0)
+            row = f"`{name}` ×{total.count}"
+            if firstResponse is not None:
+                row += f" | first response p95 `{firstResponse.quantile(0.95):.2f}s` max `{firstResponse.max:.2f}s`"
+            row += f" | total p95 `{total.quantile(0.95):.2f}s` max `{total.max:.2f}s`"
+            if errors:
+                row += f" | ❌ {errors}"
+            if unanswered:
+                row += f" | unanswered {unanswered}"
+            sortKey = firstResponse.quantile(0.95) if firstResponse is not None else total.quantile(0.95)
+            rows.append((sortKey, row))
+
+        description = ""
+        for _, row in sorted(rows, reverse=True):
+            if len(description) + len(row) + 1 > 4000:
+                break
+            description += row + "\n"
+
+        embed = discord.Embed(title="Handler latency" + (f" [{kind.name}]" if kind else ""), description=description or "Nothing recorded yet.", color=discord.Color.blue())
+        embed.set_footer(text="First response is measured from interaction creation; Discord requires one within 3 s. Percentiles are bucket upper bounds.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
 class ReminderTimeTransformer(discord.app_commands.Transformer):
     """Parse Discord timestamp tokens or relative reminder durations."""
 
@@ -1014,10 +1133,7 @@ class Reminders(commands.GroupCog, name="reminder"):
             await interaction.response.send_message(embed=discord.Embed(title="❌ Invalid channel", description="Unable to send reminder in this channel.", color=discord.Color.red()), ephemeral=True, delete_after=10.0)
             return
 
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
-
-        reminders[datetime.timestamp(reminderTime)] = {
+        reminder = {
             "type": "reminder",
             "userID": interaction.user.id,
             "channelID": interaction.channel.id,
@@ -1034,9 +1150,9 @@ class Reminders(commands.GroupCog, name="reminder"):
 
         await interaction.response.send_message(embed=embed)
         messageInteraction = await interaction.original_response()
-        reminders[datetime.timestamp(reminderTime)]["messageID"] = messageInteraction.id
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reminders, f, indent=4)
+        reminder["messageID"] = messageInteraction.id
+        async with store.transaction(REMINDERS_FILE) as reminders:
+            reminders[str(datetime.timestamp(reminderTime))] = reminder
 
     async def reminderSetError(self, interaction: discord.Interaction, error: discord.app_commands.AppCommandError) -> None:
         if isinstance(error, discord.app_commands.TransformerError):
@@ -1056,8 +1172,7 @@ class Reminders(commands.GroupCog, name="reminder"):
     @discord.app_commands.command(name="list")
     async def reminderList(self, interaction: discord.Interaction) -> None:
         """Shows the currently running reminders."""
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
+        reminders = store.get(REMINDERS_FILE)
 
         embed = discord.Embed(title="Reminders", color=discord.Color.dark_blue())
 
@@ -1081,31 +1196,26 @@ class Reminders(commands.GroupCog, name="reminder"):
     @discord.app_commands.command(name="clear")
     async def reminderClear(self, interaction: discord.Interaction) -> None:
         """Clears all reminders you have set."""
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
+        async with store.transaction(REMINDERS_FILE) as reminders:
+            # Find user reminders
+            removeList = []
+            for reminderTime, reminderDetails in reminders.items():
+                if reminderDetails["userID"] == interaction.user.id:
+                    removeList.append(reminderTime)
 
-        # Find user reminders
-        removeList = []
-        for reminderTime, reminderDetails in reminders.items():
-            if reminderDetails["userID"] == interaction.user.id:
-                removeList.append(reminderTime)
+            # Remove reminders
+            for remove in removeList:
+                del reminders[remove]
 
         if len(removeList) == 0:
             await interaction.response.send_message("No reminders currently active.", ephemeral=True, delete_after=10.0)
             return
 
-        # Remove reminders
-        for remove in removeList:
-            del reminders[remove]
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reminders, f, indent=4)
-
         await interaction.response.send_message(f"{len(removeList)} reminder{'s' * (len(removeList) > 1)} removed.")
 
     async def reminderDeleteAutocomplete(self, interaction: discord.Interaction, current: str) -> list[discord.app_commands.Choice[str]]:
         """Slash command autocomplete when removing reminders."""
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
+        reminders = store.get(REMINDERS_FILE)
 
         # Find user reminders
         userReminders = []
@@ -1132,26 +1242,28 @@ class Reminders(commands.GroupCog, name="reminder"):
             await interaction.response.send_message("No reminders currently active.", ephemeral=True, delete_after=10.0)
             return
 
-        with open(REMINDERS_FILE) as f:
-            reminders = json.load(f)
+        async with store.transaction(REMINDERS_FILE) as reminders:
+            # Remove requested reminder
+            reminderDetails = reminders.pop(reminder, None)
+
+        if reminderDetails is None:
+            await interaction.response.send_message("Reminder not found.", ephemeral=True, delete_after=10.0)
+            return
 
         embed = discord.Embed(
             title="Reminder Deleted",
-            description=reminders[reminder]["message"],
+            description=reminderDetails["message"],
             color=discord.Color.red(),
             timestamp=datetime.fromtimestamp(float(reminder), tz=pytz.utc)
         )
         embed.set_footer(text="Reminder set")
 
-        # Remove requested reminder
-        del reminders[reminder]
-        with open(REMINDERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reminders, f, indent=4)
-
         await interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: commands.Bot) -> None:
     Reminders.reminderSet.error(Reminders.reminderSetError)
+    BotTasks.loopLag.error(Utils.onSlashError)
+    BotTasks.metrics.error(Utils.onSlashError)
     await bot.add_cog(BotTasks(bot))
     await bot.add_cog(Reminders(bot))
@@ -3,6 +3,7 @@ import re, math, discord, collections.abc, logging
 from discord.ext import commands  # type: ignore
 
 from utils import Utils
+from metrics import Metrics
 from secret import DEBUG
 from constants import *
 if DEBUG:
@@ -273,6 +274,7 @@ class ButtonRolesPersistentButton(discord.ui.DynamicItem[discord.ui.Button], tem
         roleId = int(match["roleid"])
         return cls(item.custom_id, whitelistId=whitelistId, roleId=roleId)
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         if self.whitelistId:
             guild = interaction.guild
@@ -3,6 +3,8 @@ import requests  # type: ignore
 
 from discord.ext import commands  # type: ignore
 
+from executors import runIO  # type: ignore
+
 from secret import DEBUG
 from constants import *
 if DEBUG:
@@ -27,7 +29,7 @@ class Jokes(commands.Cog):
     @discord.app_commands.guilds(GUILD)
     async def dadjoke(self, interaction: discord.Interaction) -> None:
         """Receive a hilarious dad joke."""
-        response = requests.get(url=URL, headers=HEADERS)
+        response = await runIO(requests.get, url=URL, headers=HEADERS, timeout=10)
         data = response.json()
         await interaction.response.send_message(data["joke"])
 
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from discord.ext import commands  # type: ignore
 
 from utils import Utils
+from executors import runIO  # type: ignore
 from constants import *
 if secret.DEBUG:
     from constants.debug import *
@@ -58,21 +59,23 @@ class MissionUploader(commands.Cog):
         sftp = None
         timeout = 10 # seconds
         try:
-            transport = paramiko.Transport((secret.SFTP[server.value]["ip"], secret.SFTP[server.value]["port"]))
+            # paramiko is blocking; every network call goes through the I/O pool
+            transport = await runIO(paramiko.Transport, (secret.SFTP[server.value]["ip"], secret.SFTP[server.value]["port"]))
             transport.sock.settimeout(timeout)
-            transport.connect(
+            await runIO(
+                transport.connect,
                 username=secret.SFTP[server.value]["username"],
                 password=secret.SFTP[server.value]["password"]
             )
-            sftp = paramiko.SFTPClient.from_transport(transport)
+            sftp = await runIO(paramiko.SFTPClient.from_transport, transport)
             if sftp is None:
                 raise Exception("missionUploader uploadMission: sftp is None after connection")
 
             # Change remote directory if defined
             if secret.SFTP[server.value]["directory"]:
-                sftp.chdir(secret.SFTP[server.value]["directory"])
+                await runIO(sftp.chdir, secret.SFTP[server.value]["directory"])
 
-            missionFilesOnServer = [attr.filename for attr in sftp.listdir_attr()]
+            missionFilesOnServer = [attr.filename for attr in await runIO(sftp.listdir_attr)]
             if missionfile.filename in missionFilesOnServer:
                 await interaction.edit_original_response(embed=discord.Embed(
                     title="❌ Invalid filename",
@@ -89,7 +92,7 @@ class MissionUploader(commands.Cog):
             if not secret.DEBUG:
                 try:
                     # Upload file
-                    sftp.put(filepath, missionfile.filename)
+                    await runIO(sftp.put, filepath, missionfile.filename)
                 except Exception:
                     log.exception(f"{interaction.user.id} [{interaction.user.display_name}] Failed to put mission file on server")
 
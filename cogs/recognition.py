@@ -1,4 +1,4 @@
-import json, re, discord, logging
+import re, discord, logging
 
 from copy import deepcopy
 from datetime import datetime, timezone
@@ -8,6 +8,8 @@ from random import random, randint, choice
 from discord.ext import commands  # type: ignore
 
 from utils import Utils  # type: ignore
+from storage import walletLedger  # type: ignore
+from metrics import Metrics  # type: ignore
 import secret
 from constants import *
 if secret.DEBUG:
@@ -969,19 +971,6 @@ class Recognition(commands.Cog):
             await interaction.followup.send(embed=discord.Embed(title="❌ Invalid target", description="You cannot commend yourself.", color=discord.Color.red()), ephemeral=True)
             return
 
-        try:
-            with open(WALLETS_FILE) as f:
-                wallets = json.load(f)
-        except Exception:
-            wallets = {}
-
-        senderEntry = wallets.get(str(interaction.user.id), {"timesCommended": 0, "sentCommendations": 0, "money": 0, "moneySpent": 0})
-        targetEntry = wallets.get(str(member.id), {"timesCommended": 0, "sentCommendations": 0, "money": 0, "moneySpent": 0})
-        targetEntry["timesCommended"] = targetEntry.get("timesCommended", 0) + 1
-        senderEntry["sentCommendations"] = senderEntry.get("sentCommendations", 0) + 1
-        wallets[str(interaction.user.id)] = senderEntry
-        wallets[str(member.id)] = targetEntry
-
         actionPhrases = [
             "has been commended!", "just got commended!", "was commended!", "earned a commendation!",
             "got commended!", "picked up a commendation!", "just got a commendation!", "received a commendation!",
@@ -1008,13 +997,11 @@ class Recognition(commands.Cog):
         bonusAmount = randint(100, 150) if random() < 0.30 else 0
         if bonusAmount > 0:
             embed.add_field(name="Bonus:", value=f"Received `{bonusAmount}` SnekCoins! \N{COIN}", inline=False)
-            targetEntry["money"] = int(targetEntry.get("money", 0)) + bonusAmount
 
         try:
-            with open(WALLETS_FILE, "w") as f:
-                json.dump(wallets, f, indent=4)
+            await walletLedger.record("commendation", {interaction.user.id: {"sentCommendations": 1}, member.id: {"timesCommended": 1, "money": bonusAmount}}, "/commend", sourceId=interaction.user.id, amount=bonusAmount)
         except Exception:
-            log.warning("Recognition commend: Failed to save wallets file.")
+            log.warning("Recognition commend: Failed to record wallet change.")
 
         embed.set_footer(text="I think they like you!")
         embed.timestamp = datetime.now(timezone.utc)
@@ -1057,6 +1044,7 @@ class PromotionReviewAgreeButton(BasePromotionReviewDynamicButton, template=r"re
     STYLE = discord.ButtonStyle.primary
     EMOJI = "\N{THUMBS UP SIGN}"
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         await Recognition.handlePromotionRecommendationVote(interaction, vote="agree", memberId=self.memberId, currentRankId=self.currentRankId, targetRankId=self.targetRankId, scope=self.scope)
 
@@ -1066,6 +1054,7 @@ class PromotionReviewDisagreeButton(BasePromotionReviewDynamicButton, template=r
     STYLE = discord.ButtonStyle.primary
     EMOJI = "\N{THUMBS DOWN SIGN}"
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         await Recognition.handlePromotionRecommendationVote(interaction, vote="disagree", memberId=self.memberId, currentRankId=self.currentRankId, targetRankId=self.targetRankId, scope=self.scope)
 
@@ -1075,6 +1064,7 @@ class PromotionReviewAbstainButton(BasePromotionReviewDynamicButton, template=r"
     STYLE = discord.ButtonStyle.primary
     EMOJI = "\N{RAISED HAND}"
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         await Recognition.handlePromotionRecommendationVote(interaction, vote="abstain", memberId=self.memberId, currentRankId=self.currentRankId, targetRankId=self.targetRankId, scope=self.scope, rationale="")
 
@@ -1083,6 +1073,7 @@ class PromotionReviewExecuteButton(BasePromotionReviewDynamicButton, template=r"
     ACTION = "execute"
     LABEL = "Execute Promotion"
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         if interaction.message is None:
             log.exception("PromotionReviewExecuteButton callback: interaction.message is None")
@@ -1094,6 +1085,7 @@ class PromotionReviewDiscardButton(BasePromotionReviewDynamicButton, template=r"
     ACTION = "discard"
     LABEL = "Discard Recommendation"
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         if interaction.message is None:
             log.exception("PromotionReviewDiscardButton callback: interaction.message is None")
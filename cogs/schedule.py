@@ -1,7 +1,8 @@
-import os, re, json, asyncio, discord, logging
+import os, re, asyncio, discord, logging
 import pytz  # type: ignore
 
 from math import ceil
+from bisect import bisect_left, bisect_right
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from dateutil.parser import parse as datetimeParse  # type: ignore
@@ -9,10 +10,16 @@ from dateutil.tz import gettz
 from typing import *
 from random import random, randint, choice
 
-from discord.ext import commands, tasks  # type: ignore
+from discord.ext import commands  # type: ignore
 
 from .workshopInterest import WorkshopInterest  # type: ignore
 from utils import Utils  # type: ignore
+from storage import store, eventsHistory, workshopHosts  # type: ignore
+from metrics import Metrics  # type: ignore
+from directMessages import dmDispatcher  # type: ignore
+from candidateLedger import candidateLedger  # type: ignore
+from scheduler import deadlineScheduler  # type: ignore
+from uploads import uploadStore  # type: ignore
 import secret
 from constants import *
 if secret.DEBUG:
@@ -22,6 +29,13 @@ if secret.DEBUG:
 EMBED_INVALID = discord.Embed(title="❌ Invalid input", color=discord.Color.red())
 MAX_SERVER_ATTENDANCE = 50
 
+SCHEDULE_INTRO_MESSAGE_PREFIX = "__Welcome to the schedule channel!__"
+SCHEDULE_EMPTY_MESSAGES = ["...\nNo bop?\n...\nSnek is sad", ":cry:"]
+
+AUTODELETE_THRESHOLD_IN_MINUTES = 69  # After the event's end
+NO_SHOW_PING_THRESHOLD_IN_MINUTES = 15  # After the event's start
+NO_SHOW_LOG_THRESHOLD_IN_MINUTES = 45  # After the event's start
+
 
 UTC = pytz.utc
 DATEUTIL_TZINFOS = {
@@ -182,12 +196,325 @@ def parseUserDatetime(value: str) -> datetime:
     """Parse free-form user datetime input with common timezone abbreviations."""
     return datetimeParse(value, tzinfos=DATEUTIL_TZINFOS)
 
+class EventIndex:
+    """Lookups over the scheduled events: by event id, and by start time for collision checks.
+
+    The handlers that create, retime or delete an event update it in place (add, move, remove);
+    RSVPs only change an event's members, which the index doesn't look at. It is rebuilt only
+    when the events document itself is replaced, i.e. loaded or swapped with store.set.
+    """
+    def __init__(self) -> None:
+        self.events: List[Dict] | None = None
+        self.byEventId: Dict[str, Dict] = {}
+        self.intervals: List[Tuple[int, int, int, Dict]] = []  # (start, end, order in file, event), by start
+        self.starts: List[int] = []
+        self.intervalOf: Dict[int, Tuple[int, int, int, Dict]] = {}  # id(event): its interval
+        self.maxDuration = 0
+        self.maxEventId = 0
+        self.nextOrder = 0
+
+    def refresh(self) -> bool:
+        """Rebuilds the index if the events document was replaced since the last build.
+
+        Returns:
+        bool: Whether the index was rebuilt.
+        """
+        events = store.get(EVENTS_FILE)
+        if events is self.events:
+            return False
+        self.events = events
+
+        self.byEventId = {}
+        self.intervals = []
+        self.intervalOf = {}
+        self.maxDuration = 0
+        self.maxEventId = 0
+        for position, event in enumerate(events):
+            self._addEventId(event)
+            interval = self._interval(event, position)
+            if interval is not None:
+                self.intervals.append(interval)
+                self.intervalOf[id(event)] = interval
+                self.maxDuration = max(self.maxDuration, interval[1] - interval[0])
+        self.intervals.sort(key=lambda interval: (interval[0], interval[2]))
+        self.starts = [interval[0] for interval in self.intervals]
+        self.nextOrder = len(events)
+        return True
+
+    @staticmethod
+    def _interval(event: Dict, order: int) -> Tuple[int, int, int, Dict] | None:
+        startTime, endTime = event.get("time"), event.get("endTime")
+        if not isinstance(startTime, int) or not isinstance(endTime, int):
+            return None
+        return (startTime, endTime, order, event)
+
+    def _addEventId(self, event: Dict) -> None:
+        eventId = event.get("eventId")
+        if isinstance(eventId, str) and eventId.isdigit():
+            self.byEventId.setdefault(eventId, event)
+            self.maxEventId = max(self.maxEventId, int(eventId))
+
+    def _insertInterval(self, event: Dict, order: int) -> None:
+        interval = self._interval(event, order)
+        if interval is None:
+            return
+        index = bisect_right(self.intervals, (interval[0], order), key=lambda interval: (interval[0], interval[2]))
+        self.intervals.insert(index, interval)
+        self.starts.insert(index, interval[0])
+        self.intervalOf[id(event)] = interval
+        self.maxDuration = max(self.maxDuration, interval[1] - interval[0])
+
+    def _removeInterval(self, event: Dict) -> int | None:
+        interval = self.intervalOf.pop(id(event), None)
+        if interval is None:
+            return None
+        index = bisect_left(self.intervals, (interval[0], interval[2]), key=lambda interval: (interval[0], interval[2]))
+        del self.intervals[index]
+        del self.starts[index]
+        return interval[2]
+
+    def add(self, event: Dict) -> None:
+        """Indexes an event just appended to the events document.
+
+        Parameters:
+        event (Dict): The event.
+
+        Returns:
+        None.
+        """
+        if self.refresh():
+            return
+        self._addEventId(event)
+        self._insertInterval(event, self.nextOrder)
+        self.nextOrder += 1
+
+    def move(self, event: Dict) -> None:
+        """Re-indexes an event whose time or end time changed, keeping its place in file order.
+
+        Parameters:
+        event (Dict): The event.
+
+        Returns:
+        None.
+        """
+        if self.refresh():
+            return
+        order = self._removeInterval(event)
+        self._insertInterval(event, order if order is not None else self.nextOrder)
+        if order is None:
+            self.nextOrder += 1
+
+    def remove(self, event: Dict) -> None:
+        """Drops an event just removed from the events document.
+
+        maxDuration and maxEventId are left as they are: the one is only an upper bound, and ids are never reused.
+
+        Parameters:
+        event (Dict): The event.
+
+        Returns:
+        None.
+        """
+        if self.refresh():
+            return
+        self._removeInterval(event)
+        if self.byEventId.get(str(event.get("eventId"))) is event:
+            del self.byEventId[str(event["eventId"])]
+
+    def invalidate(self) -> None:
+        """Rebuilds the index on next use, for changes add/move/remove don't cover, e.g. reordering the events."""
+        self.events = None
+
+    def get(self, eventId: str) -> Dict | None:
+        """Gets a scheduled event by its event id."""
+        self.refresh()
+        return self.byEventId.get(str(eventId))
+
+    def overlapping(self, startTime: int, endTime: int) -> List[Tuple[int, int, Dict]]:
+        """Gets events running at some point between startTime and endTime (exclusive), in file order.
+
+        Parameters:
+        startTime (int): Start of the range, epoch seconds.
+        endTime (int): End of the range, epoch seconds.
+
+        Returns:
+        List[Tuple[int, int, Dict]]: Start time, end time and event of each overlapping event.
+        """
+        self.refresh()
+        # No event is longer than maxDuration, so earlier starts can't reach into the range
+        first = bisect_left(self.starts, startTime - self.maxDuration)
+        last = bisect_left(self.starts, endTime)
+        overlapping = sorted((interval for interval in self.intervals[first:last] if interval[1] > startTime), key=lambda interval: interval[2])
+        return [(eventStartTime, eventEndTime, event) for eventStartTime, eventEndTime, _, event in overlapping]
+
+    def allocateEventId(self, event: Dict) -> str:
+        """Gives an event the next event id. Ids are never reused, even after the event with the highest one is deleted.
+
+        Parameters:
+        event (Dict): The event.
+
+        Returns:
+        str: The new event id.
+        """
+        self.refresh()
+        genericData = store.get(GENERIC_DATA_FILE)
+        nextId = max(genericData.get("lastEventId", 0), self.maxEventId) + 1
+        genericData["lastEventId"] = nextId
+        store.set(GENERIC_DATA_FILE, genericData)
+
+        eventId = str(nextId)
+        event["eventId"] = eventId
+        self.byEventId[eventId] = event
+        self.maxEventId = nextId
+        return eventId
+
+
+eventIndex = EventIndex()
+
+
+class EventRenderCache:
+    """Rendered schedule embeds (as dicts) and view custom_ids, per event.
+
+    An entry is reused while the events file is at the version it was rendered at; once the file
+    changes, while the event's content hashes the same. A member the event lists changing name
+    or leaving bumps the event's generation, which outdates the entry too.
+    """
+    def __init__(self) -> None:
+        self.eventsVersion: int | None = None
+        self.entries: Dict[str, Tuple[int, int, int, Dict, List[str]]] = {}  # eventId: (events version, content hash, generation, embed, custom_ids)
+        self.memberGenerations: Dict[str, int] = {}
+
+    def get(self, event: Dict, guild: discord.Guild) -> Tuple[Dict, List[str]]:
+        """Gets an event's embed dict and view custom_ids, rendering them if the cached ones are outdated.
+
+        Parameters:
+        event (Dict): The event.
+        guild (discord.Guild): The guild.
+
+        Returns:
+        Tuple[Dict, List[str]]: The embed as a dict, and the view's custom_ids. Not to be modified.
+        """
+        eventId = event.get("eventId")
+        if eventId is None:
+            return Schedule._renderEventEmbed(event, guild).to_dict(), Schedule.getViewCustomIds(Schedule.getEventView(event))
+
+        self.prune()
+        eventsVersion = store.version(EVENTS_FILE)
+        generation = self.memberGenerations.get(eventId, 0)
+        entry = self.entries.get(eventId)
+        if entry is not None and entry[0] == eventsVersion and entry[2] == generation:
+            return entry[3], entry[4]
+
+        contentHash = hash(repr(event))
+        if entry is not None and entry[1] == contentHash and entry[2] == generation:
+            self.entries[eventId] = (eventsVersion,) + entry[1:]
+            return entry[3], entry[4]
+
+        embed = Schedule._renderEventEmbed(event, guild).to_dict()
+        customIds = Schedule.getViewCustomIds(Schedule.getEventView(event))
+        self.entries[eventId] = (eventsVersion, contentHash, generation, embed, customIds)
+        return embed, customIds
+
+    def prune(self) -> None:
+        """Drops entries of events that are no longer scheduled, once per change of the events file."""
+        if self.eventsVersion == store.version(EVENTS_FILE):
+            return
+        self.eventsVersion = store.version(EVENTS_FILE)
+        eventIndex.refresh()
+        for eventId in [eventId for eventId in self.entries if eventId not in eventIndex.byEventId]:
+            del self.entries[eventId]
+        for eventId in [eventId for eventId in self.memberGenerations if eventId not in eventIndex.byEventId]:
+            del self.memberGenerations[eventId]
+
+    def memberChanged(self, memberId: int) -> None:
+        """Outdates the rendered events that show a member, after the member's name changed or they left."""
+        for event in store.get(EVENTS_FILE):
+            eventId = event.get("eventId")
+            if eventId is None:
+                continue
+            if (
+                memberId == event.get("authorId")
+                or any(memberId in event.get(rsvpOption, []) for rsvpOption in ("accepted", "declined", "tentative", "standby"))
+                or memberId in (event.get("reservableRoles") or {}).values()
+            ):
+                self.memberGenerations[eventId] = self.memberGenerations.get(eventId, 0) + 1
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        self.entries.clear()
+        self.memberGenerations.clear()
+
+
+eventRenderCache = EventRenderCache()
+
+
+class EventMessageEditCoalescer:
+    """Edits posted event messages at most once per SCHEDULE_EDIT_COALESCE_WINDOW per event.
+
+    RSVP handlers apply their change to the event at once and request an edit. The first
+    request edits straight away; requests made while an edit or its window is running are
+    folded into one more edit afterwards, rendered from the event's latest state.
+    """
+    def __init__(self) -> None:
+        self.pending: Set[str] = set()
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def request(self, guild: discord.Guild, eventId: str) -> None:
+        """Schedules an edit of an event's message.
+
+        Parameters:
+        guild (discord.Guild): The guild.
+        eventId (str): Event whose message shows outdated state.
+
+        Returns:
+        None.
+        """
+        self.pending.add(eventId)
+        if eventId not in self.tasks:
+            self.tasks[eventId] = asyncio.create_task(self._editLoop(guild, eventId))
+
+    async def _editLoop(self, guild: discord.Guild, eventId: str) -> None:
+        try:
+            while eventId in self.pending:
+                self.pending.discard(eventId)
+                windowEnd = asyncio.get_running_loop().time() + SCHEDULE_EDIT_COALESCE_WINDOW
+                await self._edit(guild, eventId)
+                await asyncio.sleep(max(0.0, windowEnd - asyncio.get_running_loop().time()))
+        finally:
+            self.tasks.pop(eventId, None)
+
+    @staticmethod
+    async def _edit(guild: discord.Guild, eventId: str) -> None:
+        event = Schedule.getEventByEventId(eventId)
+        if event is None or event.get("messageId") is None:
+            return
+
+        channelSchedule = guild.get_channel(SCHEDULE)
+        if not isinstance(channelSchedule, discord.TextChannel):
+            log.exception("EventMessageEditCoalescer _edit: channelSchedule not discord.TextChannel")
+            return
+
+        try:
+            await channelSchedule.get_partial_message(event["messageId"]).edit(embed=Schedule.getEventEmbed(event, guild), view=Schedule.getEventView(event))
+        except Exception as e:
+            log.warning(f"EventMessageEditCoalescer _edit: Failed to edit message of event '{eventId}': {e}")
+
+
+eventMessageEdits = EventMessageEditCoalescer()
+
+
 class Schedule(commands.Cog):
     """Schedule Cog."""
+    scheduleUpdateLock = asyncio.Lock()
+
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
 
+    async def cog_unload(self) -> None:
+        deadlineScheduler.removeSource("schedule")
+        deadlineScheduler.removeSource("uploads")
+
     @staticmethod
     async def _sendInteractionResponse(
         interaction: discord.Interaction,
@@ -258,21 +585,19 @@ class Schedule(commands.Cog):
 
         # Backfill missing event keys/ids in storage for persistent buttons.
         try:
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
+            events = store.get(EVENTS_FILE)
 
             changed = False
             for event in events:
                 keysBefore = set(event.keys())
                 eventIdBefore = event.get("eventId")
                 Schedule.applyMissingEventKeys(event, keySet="event")
-                eventIdAfter = Schedule.ensureEventId(event, events)
+                eventIdAfter = Schedule.ensureEventId(event, unique=True)
                 if keysBefore != set(event.keys()) or eventIdBefore != eventIdAfter:
                     changed = True
 
             if changed:
-                with open(EVENTS_FILE, "w") as f:
-                    json.dump(events, f, indent=4)
+                store.set(EVENTS_FILE, events)
         except Exception as e:
             log.exception(f"Schedule on_ready: failed to backfill events data: {e}")
 
@@ -282,13 +607,29 @@ class Schedule(commands.Cog):
         else:
             try:
                 if await Schedule.scheduleRequiresRefresh(guild):
-                    log.info("Schedule on_ready: schedule mismatch detected, refreshing schedule")
+                    log.info("Schedule on_ready: schedule mismatch detected, reconciling schedule")
                     await Schedule.updateSchedule(guild)
             except Exception as e:
                 log.exception(f"Schedule on_ready: failed to reconcile schedule: {e}")
 
-        if not self.tenMinTask.is_running():
-            self.tenMinTask.start()
+        deadlineScheduler.addSource("schedule", (EVENTS_FILE,), self.scheduledJobs)
+        # Uploads attached to events and templates don't expire, so those move the deadline too. Templates
+        # are watched; the events file changes with every RSVP, so event handlers that add or drop files refresh it instead
+        deadlineScheduler.addSource("uploads", (FILE_UPLOADS_FILE, EVENT_TEMPLATES_FILE, WORKSHOP_TEMPLATES_FILE), self.uploadJobs)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.display_name != after.display_name:
+            eventRenderCache.memberChanged(after.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        if before.display_name != after.display_name:
+            eventRenderCache.memberChanged(after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        eventRenderCache.memberChanged(member.id)
 
     @staticmethod
     async def cancelCommand(channel: discord.DMChannel, abortText: str) -> None:
@@ -305,8 +646,8 @@ class Schedule(commands.Cog):
 
     @staticmethod
     async def checkDMChannel(user: discord.User | discord.Member) -> discord.DMChannel:
-        """  """
-        return await user.create_dm() if user.dm_channel is None else user.dm_channel
+        """Gets the DM channel with a user; created DM channels are cached by the DM dispatcher."""
+        return await dmDispatcher.getDMChannel(user)
 
     @staticmethod
     async def saveEventToHistory(event: Dict, guild: discord.Guild, autoDeleted=False) -> None:
@@ -320,8 +661,7 @@ class Schedule(commands.Cog):
         None.
         """
         if event.get("type", "Operation") == "Workshop" and (workshopInterestName := event.get("workshopInterest")) is not None:
-            with open(WORKSHOP_INTEREST_FILE) as f:
-                workshopInterestFile = json.load(f)
+            workshopInterestFile = store.get(WORKSHOP_INTEREST_FILE)
             if (workshop := workshopInterestFile.get(workshopInterestName)) is not None:
                 updateWorkshopInterest = False
                 for memberId in event["accepted"]:
@@ -329,18 +669,17 @@ class Schedule(commands.Cog):
                         updateWorkshopInterest = True
                         workshop["members"].remove(memberId)
                 if updateWorkshopInterest:
-                    with open(WORKSHOP_INTEREST_FILE, "w") as f:
-                        json.dump(workshopInterestFile, f, indent=4)
+                    store.set(WORKSHOP_INTEREST_FILE, workshopInterestFile)
                     channelWorkshopInterest = guild.get_channel(WORKSHOP_INTEREST)
                     if not isinstance(channelWorkshopInterest, discord.TextChannel):
                         log.exception("Schedule saveEventToHistory: channelWorkshopInterest not discord.TextChannel")
                         return
                     embed = WorkshopInterest.getWorkshopEmbed(guild, workshopInterestName)
-                    workshopMessage = await channelWorkshopInterest.fetch_message(workshop["messageId"])
-                    await workshopMessage.edit(embed=embed)
+                    try:
+                        await channelWorkshopInterest.get_partial_message(workshop["messageId"]).edit(embed=embed)
+                    except discord.NotFound:
+                        log.warning(f"Schedule saveEventToHistory: workshop interest message for '{workshopInterestName}' not found")
 
-        with open(EVENTS_HISTORY_FILE) as f:
-            eventsHistory = json.load(f)
         eventCopy = deepcopy(event)
         eventCopy["autoDeleted"] = autoDeleted
         eventCopy["authorName"] = member.display_name if (member := guild.get_member(eventCopy["authorId"])) is not None else "UNKNOWN"
@@ -349,9 +688,8 @@ class Schedule(commands.Cog):
         eventCopy["tentativeNames"] = [member.display_name if (member := guild.get_member(memberId)) is not None else "UNKNOWN" for memberId in eventCopy["tentative"]]
         eventCopy["standbyNames"] = [member.display_name if (member := guild.get_member(memberId)) is not None else "UNKNOWN" for memberId in eventCopy["standby"]]
         eventCopy["reservableRolesNames"] = {role: ((member.display_name if (member := guild.get_member(memberId)) is not None else "UNKNOWN") if memberId is not None else "VACANT") for role, memberId in eventCopy["reservableRoles"].items()} if eventCopy["reservableRoles"] is not None else {}
-        eventsHistory.append(eventCopy)
-        with open(EVENTS_HISTORY_FILE, "w") as f:
-            json.dump(eventsHistory, f, indent=4)
+        await eventsHistory.append(eventCopy)
+        workshopHosts.add(eventCopy)
 
 
 # ===== <Tasks> =====
@@ -366,49 +704,62 @@ class Schedule(commands.Cog):
         Returns:
         None.
         """
-        AUTODELETE_THRESHOLD_IN_MINUTES = 69
-
         channelSchedule = guild.get_channel(SCHEDULE)
         if not isinstance(channelSchedule, discord.TextChannel):
-            log.exception("Schedule tenMinTask: channelSchedule not discord.TextChannel")
+            log.exception("Schedule taskAutodeleteEvents: channelSchedule not discord.TextChannel")
             return
 
         deletedEvents = []
         utcNow = datetime.now(timezone.utc)
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
+        events = store.get(EVENTS_FILE)
 
-        for event in events:
-            endTime = UTC.localize(datetime.strptime(event["endTime"], TIME_FORMAT))
-            if utcNow > endTime + timedelta(minutes=AUTODELETE_THRESHOLD_IN_MINUTES):
+        for event in list(events):
+            if not isinstance(event.get("time"), int) or not isinstance(event.get("endTime"), int):
+                log.warning(f"Schedule taskAutodeleteEvents: Skipping event '{event.get('title')}' with invalid time {event.get('time')!r} - {event.get('endTime')!r}")
+                continue
+            endTime = Utils.fromEpoch(event["endTime"])
+            if utcNow <= endTime + timedelta(minutes=AUTODELETE_THRESHOLD_IN_MINUTES):
+                continue
+
+            # One event failing (e.g. its history entry) must not keep the others on the schedule
+            try:
                 if event["maxPlayers"] != "hidden":  # Save events that does not have hidden attendance
                     await Schedule.saveEventToHistory(event, guild, autoDeleted=True)
-                log.debug(f"Schedule tenMinTask: Auto deleting event '{event['title']}'")
-                deletedEvents.append(event)
-                eventMessage = await channelSchedule.fetch_message(event["messageId"])
-                await eventMessage.delete()
-                author = guild.get_member(event["authorId"])
-                if not author:
-                    log.warning(f"Schedule tenMinTask: Could not find author '{event['authorId']}' of event '{event['title']}'")
-                    continue
+            except Exception:
+                log.exception(f"Schedule taskAutodeleteEvents: Failed to save event '{event['title']}' to history, keeping it for the next run")
+                continue
+            log.debug(f"Schedule taskAutodeleteEvents: Auto deleting event '{event['title']}'")
+            deletedEvents.append(event)
 
-                embed = discord.Embed(
-                    title="Event auto deleted",
-                    description=f"Your {event['type'].lower()} has ended: `{event['title']}`\n" \
-                    f"It has been automatically removed from the schedule. {PEEPO_POP}\n\n" \
-                    f"{event['type'].title()} start: {discord.utils.format_dt(UTC.localize(datetime.strptime(event['time'], TIME_FORMAT)), style='F')}\n" \
-                    f"{event['type'].title()} end: {discord.utils.format_dt(UTC.localize(datetime.strptime(event['endTime'], TIME_FORMAT)), style='F')}",
-                    color=discord.Color.orange()
-                )
-                try:
-                    await author.send(embed=embed)
-                except Exception:
-                    log.warning(f"Schedule tenMinTask: Failed to DM author '{author.display_name}' about autodeleted event '{event['title']}'")
+            author = guild.get_member(event["authorId"])
+            if not author:
+                log.warning(f"Schedule taskAutodeleteEvents: Could not find author '{event['authorId']}' of event '{event['title']}'")
+                continue
+
+            embed = discord.Embed(
+                title="Event auto deleted",
+                description=f"Your {event['type'].lower()} has ended: `{event['title']}`\n" \
+                f"It has been automatically removed from the schedule. {PEEPO_POP}\n\n" \
+                f"{event['type'].title()} start: {discord.utils.format_dt(Utils.fromEpoch(event['time']), style='F')}\n" \
+                f"{event['type'].title()} end: {discord.utils.format_dt(Utils.fromEpoch(event['endTime']), style='F')}",
+                color=discord.Color.orange()
+            )
+            dmDispatcher.send(author, "schedule_event_autodeleted", embed=embed)
+
+        candidateLedger.forgetEvents({event["eventId"] for event in deletedEvents})
+
+        # Messages left behind are stray bot messages, which the next schedule refresh check picks up
+        failedMessageIds = await Utils.deleteMessages(channelSchedule, [event["messageId"] for event in deletedEvents if event.get("messageId") is not None])
+        if failedMessageIds:
+            log.warning(f"Schedule taskAutodeleteEvents: Failed to delete messages {failedMessageIds}")
 
         for event in deletedEvents:
-            events.remove(event)
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
+            if event in events:
+                events.remove(event)
+                eventIndex.remove(event)
+        store.set(EVENTS_FILE, events)
+        if deletedEvents:
+            deadlineScheduler.refreshSource("uploads")
 
         if deletedEvents and len(events) == 0:
             await Schedule.updateSchedule(guild)
@@ -424,31 +775,30 @@ class Schedule(commands.Cog):
         Returns:
         None.
         """
-        NO_SHOW_PING_THRESHOLD_IN_MINUTES = 15
-
         channelArmaDiscussion = guild.get_channel(ARMA_DISCUSSION)
         if not isinstance(channelArmaDiscussion, discord.TextChannel):
             log.exception("Schedule tasknoShowsPing: channelArmaDiscussion not discord.TextChannel")
             return
 
         membersUnscheduled: List[discord.Member] = []
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
+        events = store.get(EVENTS_FILE)
 
         for event in events:
             if event.get("checkedAcceptedReminders", False):
                 continue
             if event.get("type", "Operation") != "Operation":
                 continue
-            startTime = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
+            if not isinstance(event.get("time"), int):
+                log.warning(f"Schedule tasknoShowsPing: Skipping event '{event.get('title')}' with invalid time {event.get('time')!r}")
+                continue
+            startTime = Utils.fromEpoch(event["time"])
             if datetime.now(timezone.utc) > startTime + timedelta(minutes=NO_SHOW_PING_THRESHOLD_IN_MINUTES):
                 event["checkedAcceptedReminders"] = True
                 membersAccepted = [member for memberId in event["accepted"] + event["standby"] if (member := guild.get_member(memberId)) is not None]
                 membersInVC = channelCommand.members + channelDeployed.members + channelEventDeployed.members
                 membersUnscheduled += ([member for member in membersAccepted if member not in membersInVC] + [member for member in membersInVC if member not in membersAccepted and member.id != event["authorId"]])
 
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
+        store.set(EVENTS_FILE, events)
         if len(membersUnscheduled) == 0:
             return
 
@@ -466,13 +816,10 @@ class Schedule(commands.Cog):
         Returns:
         None.
         """
-        NO_SHOW_LOG_THRESHOLD_IN_MINUTES = 45
-
         getReservedRoleName = lambda resRoles, userId: next((key for key, value in resRoles.items() if value == userId), None) if resRoles is not None else None
 
         noShowEvents = []
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
+        events = store.get(EVENTS_FILE)
 
         # Fetch no-show members
         for event in events:
@@ -480,8 +827,11 @@ class Schedule(commands.Cog):
                 continue
             if event.get("type", "Operation") != "Operation":
                 continue
+            if not isinstance(event.get("time"), int):
+                log.warning(f"Schedule tasknoShowsLogging: Skipping event '{event.get('title')}' with invalid time {event.get('time')!r}")
+                continue
 
-            startTime = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
+            startTime = Utils.fromEpoch(event["time"])
             if datetime.now(timezone.utc) > startTime + timedelta(minutes=NO_SHOW_LOG_THRESHOLD_IN_MINUTES):
                 event["checkedNoShowLogging"] = True
 
@@ -493,16 +843,14 @@ class Schedule(commands.Cog):
                     "event": event
                 })
 
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
+        store.set(EVENTS_FILE, events)
 
         if not noShowEvents:
             return
 
         noShowMembersListForLogging = []
         noShowLogReviewEntries = []
-        with open(NO_SHOW_FILE) as f:
-            noShowFile = json.load(f)
+        noShowFile = store.get(NO_SHOW_FILE)
 
         # Log no-show members in JSON
         for noShowEvent in noShowEvents:
@@ -510,7 +858,7 @@ class Schedule(commands.Cog):
                 noShowMembersListForLogging.append(noShowMember)
                 if str(noShowMember.id) not in noShowFile:
                     noShowFile[str(noShowMember.id)] = []
-                startTime = int(datetime.timestamp(UTC.localize(datetime.strptime(noShowEvent["event"]["time"], TIME_FORMAT))))
+                startTime = noShowEvent["event"]["time"]
                 reservedRole = getReservedRoleName(noShowEvent["event"]["reservableRoles"], noShowMember.id)
                 noShowFile[str(noShowMember.id)].append({"date": startTime, "operationName": noShowEvent["event"]["title"], "reservedRole": reservedRole})
                 noShowLogReviewEntries.append({
@@ -520,8 +868,7 @@ class Schedule(commands.Cog):
                     "reservedRole": reservedRole
                 })
 
-        with open(NO_SHOW_FILE, "w") as f:
-            json.dump(noShowFile, f, indent=4)
+        store.set(NO_SHOW_FILE, noShowFile)
 
         if not noShowMembersListForLogging:
             return
@@ -531,7 +878,7 @@ class Schedule(commands.Cog):
         # Log no-show members in Discord
         channelAdvisorStaffComms = guild.get_channel(ADVISOR_STAFF_COMMS)
         if not isinstance(channelAdvisorStaffComms, discord.TextChannel):
-            log.exception("Schedule tenMinTask: channelAdvisorStaffComms not discord.TextChannel")
+            log.exception("Schedule tasknoShowsLogging: channelAdvisorStaffComms not discord.TextChannel")
             return
 
         embed = discord.Embed(title="No-show members", description=f"The following members have been registered as no-show", color=discord.Color.red())
@@ -580,8 +927,7 @@ class Schedule(commands.Cog):
         view = discord.ui.View(timeout=None)
         view.add_item(ScheduleButton(interaction.message, style=discord.ButtonStyle.success, label="Add entry", custom_id=f"schedule_button_noshow_add_{member.id}"))
 
-        with open(NO_SHOW_FILE) as f:
-            noShowFile = json.load(f)
+        noShowFile = store.get(NO_SHOW_FILE)
 
         if str(member.id) not in noShowFile:
             embed = discord.Embed(title="Not Found", description="Target member does not have any recorded no-shows.", color=discord.Color.red())
@@ -616,45 +962,79 @@ class Schedule(commands.Cog):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True, delete_after=180.0)
 
 
-    @tasks.loop(minutes=10)
-    async def tenMinTask(self) -> None:
-        """10 minute interval tasks.
+    def scheduledJobs(self) -> List[Tuple[str, float, Callable[[], Awaitable[None]]]]:
+        """Lists the event jobs for the deadline scheduler, each at the earliest event it is due for.
 
         Parameters:
         None.
 
         Returns:
-        None.
+        List[Tuple[str, float, Callable[[], Awaitable[None]]]]: Job name, deadline (epoch seconds) and job.
         """
+        events = store.get(EVENTS_FILE)
+        operations = [event for event in events if event.get("type", "Operation") == "Operation" and isinstance(event.get("time"), int)]
+        jobs = []
+
+        endTimes = [event["endTime"] for event in events if isinstance(event.get("endTime"), int)]
+        if endTimes:
+            jobs.append(("autodelete", min(endTimes) + AUTODELETE_THRESHOLD_IN_MINUTES * 60, self.autodeleteJob))
+
+        pingTimes = [event["time"] for event in operations if not event.get("checkedAcceptedReminders", False)]
+        if pingTimes:
+            jobs.append(("noShowsPing", min(pingTimes) + NO_SHOW_PING_THRESHOLD_IN_MINUTES * 60, self.noShowsPingJob))
+
+        logTimes = [event["time"] for event in operations if not event.get("checkedNoShowLogging", False)]
+        if logTimes:
+            jobs.append(("noShowsLogging", min(logTimes) + NO_SHOW_LOG_THRESHOLD_IN_MINUTES * 60, self.noShowsLoggingJob))
+
+        return jobs
+
+    def uploadJobs(self) -> List[Tuple[str, float, Callable[[], Awaitable[None]]]]:
+        """Lists the upload expiry job for the deadline scheduler, at the oldest unused upload's expiry."""
+        nextExpiry = uploadStore.nextExpiry()
+        return [("expire", nextExpiry, uploadStore.expire)] if nextExpiry is not None else []
+
+    async def getReadyGuild(self) -> discord.Guild | None:
+        """Waits until every cog is ready, then gets the guild."""
         while not all(self.bot.cogsReady.values()):
             await asyncio.sleep(1)
 
         guild = self.bot.get_guild(GUILD_ID)
         if guild is None:
-            log.exception("Schedule tenMinTask: guild is None")
-            return
-
-        # === Check for old events and deletes them. ===
-        await Schedule.taskAutodeleteEvents(guild)
+            log.exception("Schedule getReadyGuild: guild is None")
+        return guild
 
-        # === Ping no-show players. ===
+    @staticmethod
+    def getNoShowVoiceChannels(guild: discord.Guild) -> Tuple[discord.VoiceChannel, discord.VoiceChannel, discord.VoiceChannel] | None:
+        """Gets the command, deployed and event deployed voice channels, or None if one is missing."""
         channelCommand = guild.get_channel(COMMAND)
         if not isinstance(channelCommand, discord.VoiceChannel):
-            log.exception("Schedule tenMinTask: channelCommand not discord.VoiceChannel")
-            return
+            log.exception("Schedule getNoShowVoiceChannels: channelCommand not discord.VoiceChannel")
+            return None
         channelDeployed = guild.get_channel(DEPLOYED)
         if not isinstance(channelDeployed, discord.VoiceChannel):
-            log.exception("Schedule tenMinTask: channelDeployed not discord.VoiceChannel")
-            return
+            log.exception("Schedule getNoShowVoiceChannels: channelDeployed not discord.VoiceChannel")
+            return None
         channelEventDeployed = guild.get_channel(EVENT_DEPLOYED)
         if not isinstance(channelEventDeployed, discord.VoiceChannel):
-            log.exception("Schedule tenMinTask: channelEventDeployed not discord.VoiceChannel")
-            return
+            log.exception("Schedule getNoShowVoiceChannels: channelEventDeployed not discord.VoiceChannel")
+            return None
+        return channelCommand, channelDeployed, channelEventDeployed
+
+    async def autodeleteJob(self) -> None:
+        guild = await self.getReadyGuild()
+        if guild is not None:
+            await Schedule.taskAutodeleteEvents(guild)
 
-        await Schedule.tasknoShowsPing(guild, channelCommand, channelDeployed, channelEventDeployed)
+    async def noShowsPingJob(self) -> None:
+        guild = await self.getReadyGuild()
+        if guild is not None and (channels := Schedule.getNoShowVoiceChannels(guild)) is not None:
+            await Schedule.tasknoShowsPing(guild, *channels)
 
-        # === Log no-show players. ===
-        await Schedule.tasknoShowsLogging(guild, channelCommand, channelDeployed, channelEventDeployed)
+    async def noShowsLoggingJob(self) -> None:
+        guild = await self.getReadyGuild()
+        if guild is not None and (channels := Schedule.getNoShowVoiceChannels(guild)) is not None:
+            await Schedule.tasknoShowsLogging(guild, *channels)
 
 
 # ===== </Tasks> =====
@@ -669,8 +1049,7 @@ class Schedule(commands.Cog):
         log.info(f"{tracker.id} [{tracker.display_name}] is tracking candidate {member.id} [{member.display_name}]")
 
         try:
-            with open(CANDIDATE_TRACKING_FILE) as f:
-                candidateTracking = json.load(f)
+            candidateTracking = store.get(CANDIDATE_TRACKING_FILE)
         except Exception:
             candidateTracking = {}
 
@@ -704,8 +1083,7 @@ class Schedule(commands.Cog):
             del candidateTracking[key]
             result = "Candidate has graduated!"
 
-        with open(CANDIDATE_TRACKING_FILE, "w") as f:
-              json.dump(candidateTracking, f, indent=4)
+        store.set(CANDIDATE_TRACKING_FILE, candidateTracking)
 
         return result
 
@@ -737,8 +1115,7 @@ class Schedule(commands.Cog):
         log.info(f"{interaction.user.id} [{interaction.user.display_name}] is tracking candidate {member.id} [{member.display_name}]")
 
         try:
-            with open(CANDIDATE_TRACKING_FILE) as f:
-                candidateTracking = json.load(f)
+            candidateTracking = store.get(CANDIDATE_TRACKING_FILE)
         except Exception:
             candidateTracking = {}
 
@@ -773,8 +1150,7 @@ class Schedule(commands.Cog):
             del candidateTracking[key]
 
 
-        with open(CANDIDATE_TRACKING_FILE, "w") as f:
-              json.dump(candidateTracking, f, indent=4)
+        store.set(CANDIDATE_TRACKING_FILE, candidateTracking)
 
 # ===== </Track-a-Candidate> =====
 
@@ -892,37 +1268,23 @@ class Schedule(commands.Cog):
                     event["reservableRoles"][reservableRole] = None
 
     @staticmethod
-    def generateEventId(existingIds: Set[str] | None = None) -> str:
-        """Generates a deterministic unique event id."""
-        existingIds = existingIds or set()
-        maxNumericId = 0
-        for existingId in existingIds:
-            if existingId.isdigit():
-                maxNumericId = max(maxNumericId, int(existingId))
-
-        nextId = maxNumericId + 1
-        candidate = str(nextId)
-        while candidate in existingIds:
-            nextId += 1
-            candidate = str(nextId)
-        return candidate
+    def ensureEventId(event: Dict, *, unique: bool = False) -> str:
+        """Ensures an event has a numeric id and returns it.
 
-    @staticmethod
-    def ensureEventId(event: Dict, events: List[Dict] | None = None) -> str:
-        """Ensures an event has a unique numeric id and returns it."""
-        existingIds: Set[str] = set()
-        if events is not None:
-            for other in events:
-                if other is event:
-                    continue
-                otherId = other.get("eventId")
-                if isinstance(otherId, str) and otherId.isdigit():
-                    existingIds.add(otherId)
+        Parameters:
+        event (Dict): The event.
+        unique (bool): Also replace the id if another scheduled event already has it.
 
+        Returns:
+        str: The event id.
+        """
         eventId = event.get("eventId")
-        if not isinstance(eventId, str) or not eventId.isdigit() or eventId in existingIds:
-            eventId = Schedule.generateEventId(existingIds)
-            event["eventId"] = eventId
+        if not isinstance(eventId, str) or not eventId.isdigit():
+            return eventIndex.allocateEventId(event)
+        if unique:
+            holder = eventIndex.get(eventId)
+            if holder is not None and holder is not event:
+                return eventIndex.allocateEventId(event)
         return eventId
 
     @staticmethod
@@ -934,21 +1296,14 @@ class Schedule(commands.Cog):
         return match.group("event_id"), match.group("action")
 
     @staticmethod
-    def getEventByEventId(events: List[Dict], eventId: str) -> Dict | None:
-        """Fetches an event by persistent event id."""
-        for event in events:
-            if str(event.get("eventId")) == str(eventId):
-                return event
-        return None
+    def getEventByEventId(eventId: str) -> Dict | None:
+        """Fetches a scheduled event by persistent event id."""
+        return eventIndex.get(eventId)
 
     @staticmethod
-    async def getEventMessageByEventId(guild: discord.Guild, eventId: str, events: List[Dict] | None = None) -> tuple[Dict | None, discord.Message | None]:
+    async def getEventMessageByEventId(guild: discord.Guild, eventId: str) -> tuple[Dict | None, discord.Message | None]:
         """Fetches the current event record and current schedule message for an event id."""
-        if events is None:
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-
-        event = Schedule.getEventByEventId(events, eventId)
+        event = Schedule.getEventByEventId(eventId)
         if event is None:
             return None, None
 
@@ -1000,23 +1355,22 @@ class Schedule(commands.Cog):
             log.exception("Schedule handlePersistentEventAction: interaction.message is None")
             return
 
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
+        events = store.get(EVENTS_FILE)
 
-        event = Schedule.getEventByEventId(events, eventId)
+        event = Schedule.getEventByEventId(eventId)
         if event is None:
             await Schedule._sendPersistentEventMissing(interaction, eventId)
             return
 
         match action:
             case "accept":
-                await Schedule._handlePersistentRSVPAction(interaction, events, event, "accepted")
+                await Schedule._handlePersistentRSVPAction(interaction, event, "accepted")
             case "decline":
-                await Schedule._handlePersistentRSVPAction(interaction, events, event, "declined")
+                await Schedule._handlePersistentRSVPAction(interaction, event, "declined")
             case "tentative":
-                await Schedule._handlePersistentRSVPAction(interaction, events, event, "tentative")
+                await Schedule._handlePersistentRSVPAction(interaction, event, "tentative")
             case "reserve" | "accept_reserve":
-                await Schedule._handlePersistentReserveAction(interaction, events, event)
+                await Schedule._handlePersistentReserveAction(interaction, event)
             case "config":
                 await Schedule._handlePersistentConfigAction(interaction, event)
             case "edit":
@@ -1025,7 +1379,7 @@ class Schedule(commands.Cog):
                 log.exception(f"Schedule handlePersistentEventAction: unsupported action '{action}'")
 
     @staticmethod
-    async def _handlePersistentRSVPAction(interaction: discord.Interaction, events: List[Dict], event: Dict, rsvpAction: Literal["accepted", "declined", "tentative"]) -> None:
+    async def _handlePersistentRSVPAction(interaction: discord.Interaction, event: Dict, rsvpAction: Literal["accepted", "declined", "tentative"]) -> None:
         if await Schedule.blockVerifiedRoleRSVP(interaction, event):
             return
 
@@ -1038,95 +1392,103 @@ class Schedule(commands.Cog):
 
         await interaction.response.defer()
 
-        isAcceptAndReserve = event["reservableRoles"] and len(event["reservableRoles"]) == event["maxPlayers"]
+        # Apply the RSVP under the events lock; notifications go out afterwards
+        eventId = event.get("eventId")
+        promotedMemberId = None
+        hadReservedARole = False
+        async with store.transaction(EVENTS_FILE) as events:
+            event = Schedule.getEventByEventId(eventId)
+            if event is None:
+                await Schedule._sendPersistentEventMissing(interaction, eventId)
+                return
+
+            isAcceptAndReserve = event["reservableRoles"] and len(event["reservableRoles"]) == event["maxPlayers"]
+
+            # Promote from standby if leaving accepted and there are standby members
+            if interaction.user.id in event["accepted"] and not isAcceptAndReserve and len(event["standby"]) > 0:
+                promotedMemberId = event["standby"].pop(0)
+                event["accepted"].append(promotedMemberId)
 
-        # Promote from standby if leaving accepted and there are standby members
-        if interaction.user.id in event["accepted"] and not isAcceptAndReserve and len(event["standby"]) > 0:
-            standbyMemberId = event["standby"].pop(0)
-            event["accepted"].append(standbyMemberId)
+            # Toggle RSVP
+            rsvpOptions = ("accepted", "declined", "tentative", "standby")
+            if interaction.user.id in event[rsvpAction]:
+                event[rsvpAction].remove(interaction.user.id)
+            elif rsvpAction == "accepted" and interaction.user.id in event["standby"]:
+                event["standby"].remove(interaction.user.id)
+            else:
+                for option in rsvpOptions:
+                    if interaction.user.id in event[option]:
+                        event[option].remove(interaction.user.id)
 
-            standbyMember = interaction.guild.get_member(standbyMemberId)
+                if rsvpAction == "accepted" and isinstance(event["maxPlayers"], int) and len(event["accepted"]) >= event["maxPlayers"]:
+                    event["standby"].append(interaction.user.id)
+                else:
+                    event[rsvpAction].append(interaction.user.id)
+
+            if event["reservableRoles"] is not None:
+                for btnRoleName in event["reservableRoles"]:
+                    if event["reservableRoles"][btnRoleName] == interaction.user.id:
+                        event["reservableRoles"][btnRoleName] = None
+                        hadReservedARole = True
+            Schedule.settleEvent(event, interaction.guild)
+            standbyMemberIds = list(event["standby"])
+            vacantRoles = "\n".join([f"`{role}`" for role, reservedUser in event["reservableRoles"].items() if not reservedUser]) if event["reservableRoles"] else ""
+            isAcceptedNow = interaction.user.id in event["accepted"]
+
+        eventMessageEdits.request(interaction.guild, eventId)
+
+        if promotedMemberId is not None:
+            standbyMember = interaction.guild.get_member(promotedMemberId)
             if standbyMember is None:
-                log.warning(f"Schedule _handlePersistentRSVPAction: Failed to fetch promoted member '{standbyMemberId}'")
+                log.warning(f"Schedule _handlePersistentRSVPAction: Failed to fetch promoted member '{promotedMemberId}'")
             else:
                 embed = discord.Embed(
                     title=f"✅ Accepted to {event['type'].lower()}",
-                    description=f"You have been promoted from standby to accepted in `{event['title']}`\nTime: {discord.utils.format_dt(UTC.localize(datetime.strptime(event['time'], TIME_FORMAT)), style='F')}\nDuration: {event['duration']}",
+                    description=f"You have been promoted from standby to accepted in `{event['title']}`\nTime: {discord.utils.format_dt(Utils.fromEpoch(event['time']), style='F')}\nDuration: {event['duration']}",
                     color=discord.Color.green()
                 )
-                try:
-                    await standbyMember.send(embed=embed)
-                except Exception:
-                    log.warning(f"Schedule _handlePersistentRSVPAction: Failed to DM {standbyMemberId} [{standbyMember.display_name}] about acceptance")
-
-        # Toggle RSVP
-        rsvpOptions = ("accepted", "declined", "tentative", "standby")
-        if interaction.user.id in event[rsvpAction]:
-            event[rsvpAction].remove(interaction.user.id)
-        elif rsvpAction == "accepted" and interaction.user.id in event["standby"]:
-            event["standby"].remove(interaction.user.id)
-        else:
-            for option in rsvpOptions:
-                if interaction.user.id in event[option]:
-                    event[option].remove(interaction.user.id)
-
-            if rsvpAction == "accepted" and isinstance(event["maxPlayers"], int) and len(event["accepted"]) >= event["maxPlayers"]:
-                event["standby"].append(interaction.user.id)
-            else:
-                event[rsvpAction].append(interaction.user.id)
-
-        hadReservedARole = False
-        if event["reservableRoles"] is not None:
-            for btnRoleName in event["reservableRoles"]:
-                if event["reservableRoles"][btnRoleName] == interaction.user.id:
-                    event["reservableRoles"][btnRoleName] = None
-                    hadReservedARole = True
+                dmDispatcher.send(standbyMember, "schedule_standby_promoted", embed=embed)
 
         # Notify standby members
-        if isAcceptAndReserve and hadReservedARole and len(event["standby"]) > 0:
-            vacantRoles = "\n".join([f"`{role}`" for role, reservedUser in event["reservableRoles"].items() if not reservedUser])
+        if isAcceptAndReserve and hadReservedARole and len(standbyMemberIds) > 0:
             embed = discord.Embed(
                 title="Role(s) vacant",
                 description=f"The following role(s) are now vacant for event `{event['title']}`:\n{vacantRoles}",
                 color=discord.Color.green()
             )
 
-            for standbyMemberId in event["standby"]:
+            for standbyMemberId in standbyMemberIds:
                 standbyMember = interaction.guild.get_member(standbyMemberId)
                 if standbyMember is None:
                     log.warning(f"Schedule _handlePersistentRSVPAction: Failed to get member with id '{standbyMemberId}'")
                     continue
-                try:
-                    await standbyMember.send(embed=embed)
-                except Exception:
-                    log.warning(f"Schedule _handlePersistentRSVPAction: Failed to DM {standbyMember.id} [{standbyMember.display_name}] about vacant roles")
+                # Keyed by event, so a newer vacancy list replaces one not yet sent
+                dmDispatcher.send(standbyMember, "schedule_standby_vacant", key=f"vacant_{eventId}", embed=embed)
 
         # Candidate accepted notification
         if (
             rsvpAction == "accepted"
             and event.get("type", "").lower() == "operation"
-            and interaction.user.id in event["accepted"]
+            and isAcceptedNow
             and isinstance(interaction.user, discord.Member)
             and any(role.id == CANDIDATE for role in interaction.user.roles)
         ):
             channelRecruitmentHr = interaction.guild.get_channel(RECRUITMENT_AND_HR)
             if not isinstance(channelRecruitmentHr, discord.TextChannel):
                 log.exception("Schedule _handlePersistentRSVPAction: channelRecruitmentHr not discord.TextChannel")
-            elif not await Schedule.hasCandidatePinged(interaction.user.id, event["title"], channelRecruitmentHr):
+            elif candidateLedger.claimAcceptNotice(interaction.user.id, event["eventId"]):
                 embed = discord.Embed(title="Candidate Accept", description=f"{interaction.user.mention} accepted operation `{event['title']}`", color=discord.Color.blue())
                 embed.set_footer(text=f"Candidate ID: {interaction.user.id}")
-                await channelRecruitmentHr.send(embed=embed)
-
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
-
-        await interaction.message.edit(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
+                try:
+                    await channelRecruitmentHr.send(embed=embed)
+                except Exception:
+                    candidateLedger.releaseAcceptNotice(interaction.user.id, event["eventId"])
+                    raise
 
     @staticmethod
-    async def _handlePersistentReserveAction(interaction: discord.Interaction, events: List[Dict], event: Dict) -> None:
+    async def _handlePersistentReserveAction(interaction: discord.Interaction, event: Dict) -> None:
         # Reservable role blacklist check
-        with open(ROLE_RESERVATION_BLACKLIST_FILE) as f:
-            blacklist = json.load(f)
+        blacklist = store.get(ROLE_RESERVATION_BLACKLIST_FILE)
         if any(interaction.user.id == member["id"] for member in blacklist):
             await interaction.response.send_message(embed=discord.Embed(title="❌ Sorry, seems like you are not allowed to reserve any roles!", description="If you have any questions about this situation, please contact Unit Staff.", color=discord.Color.red()), ephemeral=True, delete_after=60.0)
             return
@@ -1152,27 +1514,21 @@ class Schedule(commands.Cog):
 
         # Accept and reserve flow with standby list
         if isAcceptAndReserve and interaction.user.id in event["standby"] and (all(event["reservableRoles"].values()) or playerCapReached):
-            event["standby"].remove(interaction.user.id)
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
-            await interaction.response.edit_message(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
+            async with store.transaction(EVENTS_FILE):
+                if interaction.user.id in event["standby"]:
+                    event["standby"].remove(interaction.user.id)
+            await interaction.response.defer()
+            eventMessageEdits.request(interaction.guild, event["eventId"])
             return
 
         # Accept and move to standby list
         if isAcceptAndReserve and playerCapReached and interaction.user.id not in event["accepted"] and interaction.user.id not in event["standby"]:
-            Schedule.clearUserRSVP(event, interaction.user.id)
-            event["standby"].append(interaction.user.id)
+            async with store.transaction(EVENTS_FILE):
+                Schedule.clearUserRSVP(event, interaction.user.id)
+                event["standby"].append(interaction.user.id)
 
             await interaction.response.send_message(embed=discord.Embed(title="✅ On standby list", description="The event player limit is reached!\nYou have been placed on the standby list. If an accepted member leaves, you will be notified about the vacant roles!", color=discord.Color.green()), ephemeral=True, delete_after=60.0)
-
-            if interaction.channel is None or isinstance(interaction.channel, discord.ForumChannel) or isinstance(interaction.channel, discord.CategoryChannel):
-                log.exception("Schedule _handlePersistentReserveAction: interaction.channel is invalid type")
-                return
-            msg = await interaction.channel.fetch_message(interaction.message.id)
-            await msg.edit(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
-
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+            eventMessageEdits.request(interaction.guild, event["eventId"])
             return
 
         # Show reservation options
@@ -1256,57 +1612,238 @@ class Schedule(commands.Cog):
 
     @staticmethod
     async def updateSchedule(guild: discord.Guild) -> None:
-        """Updates the schedule channel with all messages."""
+        """Brings the schedule channel in line with the stored events.
+
+        Only messages that differ from their event are edited; orphaned messages are deleted
+        and missing ones are sent at the bottom. Falls back to rebuildSchedule when the intro
+        message is no longer the first message.
+
+        Parameters:
+        guild (discord.Guild): The guild.
+
+        Returns:
+        None.
+        """
         channelSchedule = guild.get_channel(SCHEDULE)
         if not isinstance(channelSchedule, discord.TextChannel):
             log.exception("Schedule updateSchedule: channelSchedule not discord.TextChannel")
             return
 
-        scheduleIntroMessage = f"__Welcome to the schedule channel!__\n🟩 Schedule operations: `/operation` (`/bop`)\n🟦 Workshops: `/workshop` (`/ws`)\n🟨 Generic events: `/event`\n\nThe datetime you see in here are based on __your local time zone__.\nChange timezone when scheduling events with `/changetimezone`.\n\nSuggestions/bugs contact: {', '.join([f'**{developerName.display_name}**' for name in DEVELOPERS if (developerName := channelSchedule.guild.get_member(name)) is not None])} -- <https://github.com/Sigma-Security-Group/FriendlySnek>"
+        # Concurrent updates would both see the same stale channel and double up messages
+        async with Schedule.scheduleUpdateLock:
+            try:
+                # Members may have left since the events were last changed
+                async with store.transaction(EVENTS_FILE) as events:
+                    for event in events:
+                        Schedule.settleEvent(event, guild)
+                await Schedule.reconcileSchedule(channelSchedule, guild)
+            except Exception as e:
+                log.exception(e)
 
-        # Do not purge intro message if unchanged
-        isFoundMessageIntro = False
-        await channelSchedule.purge(limit=None,
-                            check=lambda m: (
-                                m.author.id in FRIENDLY_SNEKS and m.content != scheduleIntroMessage
-                            )
-        )
-        # Search for intro message
-        async for message in channelSchedule.history(limit=10, oldest_first=True):
-            if message.content == scheduleIntroMessage:
-                isFoundMessageIntro = True
-                break
+    @staticmethod
+    async def reconcileSchedule(channelSchedule: discord.TextChannel, guild: discord.Guild) -> None:
+        """Edits, deletes and sends the fewest schedule messages needed to match the stored events.
 
-        # Send intro message if not found
-        if not isFoundMessageIntro:
-            await channelSchedule.send(scheduleIntroMessage)
+        Messages cannot be inserted above existing ones, so the kept messages show the first
+        schedule slots in order and new messages are appended for the rest. Which messages to keep
+        is picked by an edit-distance style alignment, where a message already showing its slot
+        costs nothing and every edit, delete and send costs one API call.
 
+        Parameters:
+        channelSchedule (discord.TextChannel): The schedule channel.
+        guild (discord.Guild): The guild.
 
-        try:
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-            if len(events) == 0:
-                await channelSchedule.send("...\nNo bop?\n...\nSnek is sad")
-                await channelSchedule.send(":cry:")
+        Returns:
+        None.
+        """
+        events = store.get(EVENTS_FILE)
+        expectedEvents = Schedule.getExpectedScheduleEvents(events)
+        expectedSlots: List[Dict | str] = expectedEvents if len(expectedEvents) > 0 else SCHEDULE_EMPTY_MESSAGES
+
+        scheduleIntroMessage = Schedule.getScheduleIntroMessage(channelSchedule)
+        botMessages = [message async for message in channelSchedule.history(limit=None, oldest_first=True) if message.author.id in FRIENDLY_SNEKS]
+        if len(botMessages) == 0:
+            await channelSchedule.send(scheduleIntroMessage)
+        elif botMessages[0].content != scheduleIntroMessage:
+            if not botMessages[0].content.startswith(SCHEDULE_INTRO_MESSAGE_PREFIX):
+                log.info("Schedule reconcileSchedule: intro message is not the first message, rebuilding schedule")
+                await Schedule.rebuildSchedule(channelSchedule, guild)
                 return
+            # Outdated intro, e.g. a developer changed their name
+            await botMessages[0].edit(content=scheduleIntroMessage)
+        slotMessages = botMessages[1:]
+
+        # Slot each message already shows correctly, if any
+        slotIndexes = {Schedule.getScheduleSlotKey(slot): index for index, slot in enumerate(expectedSlots)}
+        matchedSlots: List[int | None] = []
+        for message in slotMessages:
+            index = slotIndexes.get(Schedule.getScheduleMessageSlotKey(message))
+            if index is not None and Schedule.getScheduleMessageMismatch(expectedSlots[index], message, guild) is not None:
+                index = None
+            matchedSlots.append(index)
+
+        # cost[i][j]: fewest API calls for the first i messages to show the first j slots
+        messageCount, slotCount = len(slotMessages), len(expectedSlots)
+        unreachable = messageCount + slotCount + 1
+        cost = [[unreachable] * (slotCount + 1) for _ in range(messageCount + 1)]
+        cost[0][0] = 0
+        for i in range(1, messageCount + 1):
+            for j in range(min(i, slotCount) + 1):
+                cost[i][j] = cost[i - 1][j] + 1  # Delete message
+                if j > 0:
+                    cost[i][j] = min(cost[i][j], cost[i - 1][j - 1] + (0 if matchedSlots[i - 1] == j - 1 else 1))  # Keep or edit message
+        # Remaining slots are sent as new messages; on ties keep more messages
+        keptCount = min(range(min(messageCount, slotCount) + 1), key=lambda j: (cost[messageCount][j] + slotCount - j, -j))
+
+        messagesToDelete: List[discord.Message] = []
+        slotAssignments: Dict[int, discord.Message] = {}
+        i, j = messageCount, keptCount
+        while i > 0:
+            if j > 0 and cost[i][j] == cost[i - 1][j - 1] + (0 if matchedSlots[i - 1] == j - 1 else 1):
+                if matchedSlots[i - 1] != j - 1:
+                    slotAssignments[j - 1] = slotMessages[i - 1]
+                j -= 1
+            else:
+                messagesToDelete.append(slotMessages[i - 1])
+            i -= 1
 
-            newEvents: List[Dict] = []
-            for event in sorted(events, key=lambda e: datetime.strptime(e["time"], TIME_FORMAT), reverse=True):
-                Schedule.applyMissingEventKeys(event, keySet="event")
-                Schedule.ensureEventId(event, events)
-                msg = await channelSchedule.send(embed=Schedule.getEventEmbed(event, guild), view=Schedule.getEventView(event), files=Schedule.getEventFiles(event))
-                event["messageId"] = msg.id
-                newEvents.append(event)
+        if len(messagesToDelete) > 0 or len(slotAssignments) > 0 or keptCount < slotCount:
+            log.info(f"Schedule reconcileSchedule: {len(slotAssignments)} edited, {len(messagesToDelete)} deleted, {slotCount - keptCount} sent")
 
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(newEvents, f, indent=4)
-        except Exception as e:
-            log.exception(e)
+        failedMessageIds = await Utils.deleteMessages(channelSchedule, [message.id for message in messagesToDelete])
+        if failedMessageIds:
+            log.warning(f"Schedule reconcileSchedule: Failed to delete messages {failedMessageIds}")
+
+        for index, message in sorted(slotAssignments.items()):
+            slot = expectedSlots[index]
+            if isinstance(slot, str):
+                await message.edit(content=slot, embed=None, view=None, attachments=[])
+                continue
+            # Reuse already uploaded files when they are unchanged
+            attachments = message.attachments if [attachment.filename for attachment in message.attachments] == Schedule.getScheduleAttachmentNames(slot) else Schedule.getEventFiles(slot)
+            await message.edit(content=None, embed=Schedule.getEventEmbed(slot, guild), view=Schedule.getEventView(slot), attachments=attachments)
+
+        for index in range(keptCount, slotCount):
+            slot = expectedSlots[index]
+            if isinstance(slot, str):
+                await channelSchedule.send(slot)
+                continue
+            msg = await channelSchedule.send(embed=Schedule.getEventEmbed(slot, guild), view=Schedule.getEventView(slot), files=Schedule.getEventFiles(slot))
+            slotAssignments[index] = msg
+
+        if len(expectedEvents) == 0:
+            return
+
+        for index, event in enumerate(expectedEvents):
+            if index in slotAssignments:
+                event["messageId"] = slotAssignments[index].id
+        await Schedule.storePostedEvents(expectedEvents)
+
+    @staticmethod
+    async def rebuildSchedule(channelSchedule: discord.TextChannel, guild: discord.Guild) -> None:
+        """Purges all bot messages from the schedule channel and sends every event again.
+
+        Parameters:
+        channelSchedule (discord.TextChannel): The schedule channel.
+        guild (discord.Guild): The guild.
+
+        Returns:
+        None.
+        """
+        scheduleIntroMessage = Schedule.getScheduleIntroMessage(channelSchedule)
+        await channelSchedule.purge(limit=None, check=lambda m: m.author.id in FRIENDLY_SNEKS)
+        await channelSchedule.send(scheduleIntroMessage)
+
+        events = store.get(EVENTS_FILE)
+        expectedEvents = Schedule.getExpectedScheduleEvents(events)
+        if len(expectedEvents) == 0:
+            for message in SCHEDULE_EMPTY_MESSAGES:
+                await channelSchedule.send(message)
+            return
+
+        for event in expectedEvents:
+            msg = await channelSchedule.send(embed=Schedule.getEventEmbed(event, guild), view=Schedule.getEventView(event), files=Schedule.getEventFiles(event))
+            event["messageId"] = msg.id
+        await Schedule.storePostedEvents(expectedEvents)
+
+    @staticmethod
+    async def storePostedEvents(postedEvents: List[Dict]) -> None:
+        """Stores events in posted order, keeping events that were added or removed while posting."""
+        async with store.transaction(EVENTS_FILE) as events:
+            currentIds = {id(event) for event in events}
+            postedIds = {id(event) for event in postedEvents}
+            events[:] = [event for event in postedEvents if id(event) in currentIds] + [event for event in events if id(event) not in postedIds]
+        eventIndex.invalidate()
+
+    @staticmethod
+    def getExpectedScheduleEvents(events: List[Dict]) -> List[Dict]:
+        """Gets events in schedule order (latest first), backfilling missing keys and event ids.
+
+        Events whose times aren't epochs (left by the schema migration when unparseable) are
+        logged and left off the schedule; they stay stored, as storePostedEvents keeps unposted events.
+        """
+        expectedEvents: List[Dict] = []
+        scheduledEvents = []
+        for event in events:
+            if isinstance(event.get("time"), int) and isinstance(event.get("endTime"), int):
+                scheduledEvents.append(event)
+            else:
+                log.warning(f"Schedule getExpectedScheduleEvents: Leaving event '{event.get('title')}' off the schedule, invalid time {event.get('time')!r} - {event.get('endTime')!r}")
+        for event in sorted(scheduledEvents, key=lambda e: e["time"], reverse=True):
+            Schedule.applyMissingEventKeys(event, keySet="event")
+            Schedule.ensureEventId(event, unique=True)
+            expectedEvents.append(event)
+        return expectedEvents
+
+    @staticmethod
+    def getScheduleSlotKey(slot: Dict | str) -> str:
+        """Gets the key identifying a schedule slot: an event's id, or a placeholder message's content."""
+        return slot if isinstance(slot, str) else f"event_{slot['eventId']}"
+
+    @staticmethod
+    def getScheduleMessageSlotKey(message: discord.Message) -> str:
+        """Gets the slot key of the schedule slot a message currently shows."""
+        for customId in Schedule.getMessageComponentCustomIds(message):
+            parsed = Schedule.parsePersistentScheduleCustomId(customId)
+            if parsed is not None:
+                return f"event_{parsed[0]}"
+        return message.content
+
+    @staticmethod
+    def getScheduleMessageMismatch(slot: Dict | str, message: discord.Message, guild: discord.Guild) -> str | None:
+        """Compares a posted schedule message with the slot it should show.
+
+        Parameters:
+        slot (Dict | str): The event, or a placeholder message's content.
+        message (discord.Message): The posted message.
+        guild (discord.Guild): The guild.
+
+        Returns:
+        str | None: What differs ("content", "embed", "attachment" or "component"), or None if the message is up to date.
+        """
+        if isinstance(slot, str):
+            return None if message.content == slot and len(message.embeds) == 0 and len(message.components) == 0 else "content"
+
+        expectedEmbed, expectedCustomIds = eventRenderCache.get(slot, guild)
+        actualEmbed = message.embeds[0].to_dict() if len(message.embeds) > 0 else None
+        if actualEmbed != expectedEmbed:
+            return "embed"
+
+        expectedAttachments = Schedule.getScheduleAttachmentNames(slot)
+        actualAttachments = [attachment.filename for attachment in message.attachments]
+        if actualAttachments != expectedAttachments:
+            return "attachment"
+
+        actualCustomIds = Schedule.getMessageComponentCustomIds(message)
+        if actualCustomIds != expectedCustomIds:
+            return "component"
+
+        return None
 
     @staticmethod
     def getScheduleIntroMessage(channelSchedule: discord.TextChannel) -> str:
         """Gets the current schedule introduction message."""
-        return f"__Welcome to the schedule channel!__\n🟩 Schedule operations: `/operation` (`/bop`)\n🟦 Workshops: `/workshop` (`/ws`)\n🟨 Generic events: `/event`\n\nThe datetime you see in here are based on __your local time zone__.\nChange timezone when scheduling events with `/changetimezone`.\n\nSuggestions/bugs contact: {', '.join([f'**{developerName.display_name}**' for name in DEVELOPERS if (developerName := channelSchedule.guild.get_member(name)) is not None])} -- <https://github.com/Sigma-Security-Group/FriendlySnek>"
+        return f"{SCHEDULE_INTRO_MESSAGE_PREFIX}\n🟩 Schedule operations: `/operation` (`/bop`)\n🟦 Workshops: `/workshop` (`/ws`)\n🟨 Generic events: `/event`\n\nThe datetime you see in here are based on __your local time zone__.\nChange timezone when scheduling events with `/changetimezone`.\n\nSuggestions/bugs contact: {', '.join([f'**{developerName.display_name}**' for name in DEVELOPERS if (developerName := channelSchedule.guild.get_member(name)) is not None])} -- <https://github.com/Sigma-Security-Group/FriendlySnek>"
 
     @staticmethod
     def getScheduleAttachmentNames(event: Dict) -> List[str]:
@@ -1340,64 +1877,67 @@ class Schedule(commands.Cog):
 
     @staticmethod
     async def scheduleRequiresRefresh(guild: discord.Guild) -> bool:
-        """Checks if the posted schedule channel differs from local events storage."""
+        """Checks if the posted schedule channel differs from local events storage.
+
+        Only the messages stored on the events are fetched, plus the range between them and a window
+        around them for the intro and stray bot messages, so the cost follows the number of events, not the channel history.
+        """
         channelSchedule = guild.get_channel(SCHEDULE)
         if not isinstance(channelSchedule, discord.TextChannel):
             log.exception("Schedule scheduleRequiresRefresh: channelSchedule not discord.TextChannel")
             return False
 
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
-
-        expectedEvents: List[Dict] = []
-        for event in sorted(events, key=lambda e: datetime.strptime(e["time"], TIME_FORMAT), reverse=True):
-            Schedule.applyMissingEventKeys(event, keySet="event")
-            Schedule.ensureEventId(event, events)
-            expectedEvents.append(event)
-
-        botMessages = [message async for message in channelSchedule.history(limit=None, oldest_first=True) if message.author.id in FRIENDLY_SNEKS]
+        expectedEvents = Schedule.getExpectedScheduleEvents(store.get(EVENTS_FILE))
         scheduleIntroMessage = Schedule.getScheduleIntroMessage(channelSchedule)
-        introMessages = [message for message in botMessages if message.content == scheduleIntroMessage]
-        nonIntroMessages = [message for message in botMessages if message.content != scheduleIntroMessage]
-
-        if len(introMessages) != 1:
-            log.info(f"Schedule scheduleRequiresRefresh: expected 1 intro message, found {len(introMessages)}")
-            return True
 
         if len(expectedEvents) == 0:
-            emptyScheduleMessages = ["...\nNo bop?\n...\nSnek is sad", ":cry:"]
-            currentMessages = [message.content for message in nonIntroMessages]
-            if currentMessages != emptyScheduleMessages:
+            # Placeholder messages are not stored; they should be the latest bot messages
+            currentMessages = [message.content for message in await Utils.fetchNearbyBotMessages(channelSchedule)]
+            if currentMessages != [scheduleIntroMessage] + SCHEDULE_EMPTY_MESSAGES:
                 log.info("Schedule scheduleRequiresRefresh: empty schedule placeholder messages differ")
                 return True
             return False
 
-        if len(nonIntroMessages) != len(expectedEvents):
-            log.info(f"Schedule scheduleRequiresRefresh: expected {len(expectedEvents)} event messages, found {len(nonIntroMessages)}")
+        messageIds = [event.get("messageId") for event in expectedEvents]
+        for event, messageId in zip(expectedEvents, messageIds):
+            if not isinstance(messageId, int):
+                log.info(f"Schedule scheduleRequiresRefresh: no message id for eventId {event.get('eventId')}")
+                return True
+
+        # Events are posted top to bottom, so their message ids must increase
+        if any(messageId >= nextMessageId for messageId, nextMessageId in zip(messageIds, messageIds[1:])):
+            log.info("Schedule scheduleRequiresRefresh: event messages are out of order")
             return True
 
-        for event, message in zip(expectedEvents, nonIntroMessages):
-            if event.get("messageId") != message.id:
-                log.info(f"Schedule scheduleRequiresRefresh: message id mismatch for eventId {event.get('eventId')}")
+        messages = await Utils.fetchMessages(channelSchedule, messageIds)
+        for event in expectedEvents:
+            message = messages[event["messageId"]]
+            if message is None:
+                log.info(f"Schedule scheduleRequiresRefresh: message not found for eventId {event.get('eventId')}")
                 return True
 
-            expectedEmbed = Schedule.getEventEmbed(event, guild).to_dict()
-            actualEmbed = message.embeds[0].to_dict() if len(message.embeds) > 0 else None
-            if actualEmbed != expectedEmbed:
-                log.info(f"Schedule scheduleRequiresRefresh: embed mismatch for eventId {event.get('eventId')}")
+            mismatch = Schedule.getScheduleMessageMismatch(event, message, guild)
+            if mismatch is not None:
+                log.info(f"Schedule scheduleRequiresRefresh: {mismatch} mismatch for eventId {event.get('eventId')}")
                 return True
 
-            expectedAttachments = Schedule.getScheduleAttachmentNames(event)
-            actualAttachments = [attachment.filename for attachment in message.attachments]
-            if actualAttachments != expectedAttachments:
-                log.info(f"Schedule scheduleRequiresRefresh: attachment mismatch for eventId {event.get('eventId')}")
-                return True
+        botMessagesAbove = await Utils.fetchNearbyBotMessages(channelSchedule, before=messageIds[0])
+        if [message.content for message in botMessagesAbove] != [scheduleIntroMessage]:
+            log.info(f"Schedule scheduleRequiresRefresh: expected only the intro message above the events, found {len(botMessagesAbove)} bot messages")
+            return True
 
-            expectedCustomIds = Schedule.getViewCustomIds(Schedule.getEventView(event))
-            actualCustomIds = Schedule.getMessageComponentCustomIds(message)
-            if actualCustomIds != expectedCustomIds:
-                log.info(f"Schedule scheduleRequiresRefresh: component mismatch for eventId {event.get('eventId')}")
-                return True
+        botMessagesBelow = await Utils.fetchNearbyBotMessages(channelSchedule, after=messageIds[-1])
+        if len(botMessagesBelow) > 0:
+            log.info(f"Schedule scheduleRequiresRefresh: found {len(botMessagesBelow)} stray bot messages below the events")
+            return True
+
+        # Between the events, every bot message must be one of them; the window covers the events plus some strays
+        knownIds = set(messageIds)
+        botMessagesBetween = await Utils.fetchNearbyBotMessages(channelSchedule, after=messageIds[0], before=messageIds[-1], limit=len(messageIds) + MESSAGE_VERIFY_WINDOW)
+        strayMessages = [message for message in botMessagesBetween if message.id not in knownIds]
+        if len(strayMessages) > 0:
+            log.info(f"Schedule scheduleRequiresRefresh: found {len(strayMessages)} stray bot messages between the events")
+            return True
 
         return False
 
@@ -1460,9 +2000,52 @@ class Schedule(commands.Cog):
             if Schedule.isDefaultCreateTextField(key, event.get(key))
         ]
 
+    @staticmethod
+    def settleEvent(event: Dict, guild: discord.Guild) -> bool:
+        """Frees roles reserved by members who left, and promotes standby members into free accepted slots.
+
+        Call inside the transaction changing the event; rendering shows the event as stored.
+
+        Parameters:
+        event (Dict): The event.
+        guild (discord.Guild): The guild.
+
+        Returns:
+        bool: Whether the event changed.
+        """
+        changed = False
+        for roleName, memberId in (event["reservableRoles"] or {}).items():
+            if memberId is not None and guild.get_member(memberId) is None:
+                event["reservableRoles"][roleName] = None
+                changed = True
+
+        isAcceptAndReserve = event["reservableRoles"] and len(event["reservableRoles"]) == event["maxPlayers"]
+        if not isAcceptAndReserve and len(event["standby"]) > 0 and (event["maxPlayers"] is None or (isinstance(event["maxPlayers"], int) and len(event["accepted"]) < event["maxPlayers"])):
+            if event["maxPlayers"] is None:
+                membersPromoted = len(event["standby"])
+            else:
+                membersPromoted = event["maxPlayers"] - len(event["accepted"])
+            event["accepted"].extend(event["standby"][:membersPromoted])
+            event["standby"] = event["standby"][membersPromoted:]
+            changed = True
+        return changed
+
     @staticmethod
     def getEventEmbed(event: Dict, guild: discord.Guild) -> discord.Embed:
-        """Generates an embed from the given event.
+        """Generates an embed from the given event, from the render cache when the event hasn't changed.
+
+        Parameters:
+        event (Dict): The event.
+
+        Returns:
+        discord.Embed: The generated embed.
+        """
+        embed, _ = eventRenderCache.get(event, guild)
+        return discord.Embed.from_dict(deepcopy(embed))
+
+    @staticmethod
+    def _renderEventEmbed(event: Dict, guild: discord.Guild) -> discord.Embed:
+        """Builds the embed of an event; see getEventEmbed.
 
         Parameters:
         event (Dict): The event.
@@ -1475,18 +2058,15 @@ class Schedule(commands.Cog):
         # Reservable Roles
         if event["reservableRoles"] is not None:
             embed.add_field(name="\u200B", value="\u200B", inline=False)
-            resRolesTaken = len([1 for memberId in event["reservableRoles"].values() if memberId is not None])
+            resRolesTaken = 0
             resRolesDescription = []
             for roleName, memberId in event["reservableRoles"].items():
-                if memberId is None:
-                    resRolesDescription.append(f"{roleName} - **VACANT**")
-                    continue
-
-                member = guild.get_member(memberId)
+                # A member who left counts as vacant until settleEvent frees the role
+                member = guild.get_member(memberId) if memberId is not None else None
                 if member is None:
-                    # Remove invalid members
-                    event["reservableRoles"][roleName] = None
+                    resRolesDescription.append(f"{roleName} - **VACANT**")
                 else:
+                    resRolesTaken += 1
                     resRolesDescription.append(f"{roleName} - *{member.display_name}*")
 
             embed.add_field(
@@ -1497,7 +2077,7 @@ class Schedule(commands.Cog):
         # Duration and Time
         durationHours = int(event["duration"].split("h")[0].strip()) if "h" in event["duration"] else 0
         embed.add_field(name="\u200B", value="\u200B", inline=False)
-        embed.add_field(name="Time", value=f"{discord.utils.format_dt(UTC.localize(datetime.strptime(event['time'], TIME_FORMAT)), style='F')} - {discord.utils.format_dt(UTC.localize(datetime.strptime(event['endTime'], TIME_FORMAT)), style='t' if durationHours < 24 else 'F')}", inline=(durationHours < 24))
+        embed.add_field(name="Time", value=f"{discord.utils.format_dt(Utils.fromEpoch(event['time']), style='F')} - {discord.utils.format_dt(Utils.fromEpoch(event['endTime']), style='t' if durationHours < 24 else 'F')}", inline=(durationHours < 24))
         embed.add_field(name="Duration", value=event["duration"], inline=True)
 
         # Map
@@ -1511,15 +2091,6 @@ class Schedule(commands.Cog):
         embed.add_field(name="\u200B", value="\u200B", inline=False)
 
         # RSVP Lists
-        isAcceptAndReserve = event["reservableRoles"] and len(event["reservableRoles"]) == event["maxPlayers"]
-        if not isAcceptAndReserve and len(event["standby"]) > 0 and (event["maxPlayers"] is None or (isinstance(event["maxPlayers"], int) and len(event["accepted"]) < event["maxPlayers"])):
-            if event["maxPlayers"] is None:
-                membersPromoted = len(event["standby"])
-            else:
-                membersPromoted = event["maxPlayers"] - len(event["accepted"])
-            event["accepted"].extend(event["standby"][:membersPromoted])
-            event["standby"] = event["standby"][membersPromoted:]
-
         accepted = [member.display_name for memberId in event["accepted"] if (member := guild.get_member(memberId)) is not None]
         declined = [member.display_name for memberId in event["declined"] if (member := guild.get_member(memberId)) is not None]
         tentative = [member.display_name for memberId in event["tentative"] if (member := guild.get_member(memberId)) is not None]
@@ -1541,7 +2112,7 @@ class Schedule(commands.Cog):
 
         author = guild.get_member(event["authorId"])
         embed.set_footer(text="Created by Unknown User" if author is None else f"Created by {author.display_name}")
-        embed.timestamp = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
+        embed.timestamp = Utils.fromEpoch(event["time"])
 
         return embed
 
@@ -1597,7 +2168,10 @@ class Schedule(commands.Cog):
                     # Remove duplicate entry from event["files"]
                     eventFilesForRemoval.append(eventFile)
                     continue
-                with open(f"tmp/fileUpload/{eventFile}", "rb") as f:
+                uploadPath = uploadStore.path(eventFile)
+                if uploadPath is None:
+                    raise FileNotFoundError("not in the upload manifest")
+                with open(uploadPath, "rb") as f:
                     discordFiles.append(discord.File(f, filename=filenameShort))
             except Exception as e:
                 log.warning(f"Schedule getEventFiles: Failed to open file '{eventFile}': {e}")
@@ -1623,15 +2197,19 @@ class Schedule(commands.Cog):
         Returns:
         List[discord.File] | List[str]: A list of discord files or filenames.
         """
+        uploadNames = uploadStore.userUploads(int(userId))
+        outNames = uploadNames if fullFilename else [uploadName.split("_", 2)[2] for uploadName in uploadNames]
+        if not isDiscordFormat:
+            return outNames
+
         files = []
-        for osFile in os.listdir("tmp/fileUpload"):
-            outName = osFile if fullFilename else osFile.split("_", 2)[2]
-            if userId in osFile:
-                if isDiscordFormat:
-                    with open(osFile) as f:
-                        files.append(discord.File(f, filename=outName))
-                else:
-                    files.append(outName)
+        for uploadName, outName in zip(uploadNames, outNames):
+            uploadPath = uploadStore.path(uploadName)
+            if uploadPath is None:
+                log.warning(f"Schedule getUserFileUploads: '{uploadName}' not in the upload manifest")
+                continue
+            with open(uploadPath, "rb") as f:
+                files.append(discord.File(f, filename=outName))
         return files
 
     @staticmethod
@@ -1680,9 +2258,9 @@ class Schedule(commands.Cog):
             timeFieldValue = embed.fields[fieldPos].value
             if timeFieldValue is not None:
                 matches = re.findall(r"(?<=<t:)\d+(?=:\w>)", timeFieldValue)
-                outputDict["time"] = datetime.fromtimestamp(float(matches[0])).astimezone(pytz.utc).strftime(TIME_FORMAT)
+                outputDict["time"] = int(matches[0])
                 if len(matches) > 1:
-                    outputDict["endTime"] = datetime.fromtimestamp(float(matches[1])).astimezone(pytz.utc).strftime(TIME_FORMAT)
+                    outputDict["endTime"] = int(matches[1])
 
         # Workshop Interest
         if outputDict.get("type", None) == "Workshop":
@@ -1708,15 +2286,13 @@ class Schedule(commands.Cog):
 
     @staticmethod
     def loadTemplates(eventType: str) -> List[Dict]:
-        with open(Schedule.getTemplateFile(eventType)) as f:
-            templates: List[Dict] = json.load(f)
+        templates: List[Dict] = deepcopy(store.get(Schedule.getTemplateFile(eventType)))
         return templates
 
     @staticmethod
     def saveTemplates(eventType: str, templates: List[Dict]) -> None:
         templates.sort(key=lambda template : template["templateName"])
-        with open(Schedule.getTemplateFile(eventType), "w") as f:
-            json.dump(templates, f, indent=4)
+        store.set(Schedule.getTemplateFile(eventType), templates)
 
     @staticmethod
     def findTemplateIndex(templates: List[Dict], templateName: str) -> int | None:
@@ -1727,16 +2303,12 @@ class Schedule(commands.Cog):
 
     @staticmethod
     def loadDeletedTemplates() -> List[Dict]:
-        if not os.path.exists(TEMPLATES_DELETED_FILE):
-            return []
-        with open(TEMPLATES_DELETED_FILE) as f:
-            deletedTemplates: List[Dict] = json.load(f)
+        deletedTemplates: List[Dict] = store.get(TEMPLATES_DELETED_FILE)
         return deletedTemplates
 
     @staticmethod
     def saveDeletedTemplates(entries: List[Dict]) -> None:
-        with open(TEMPLATES_DELETED_FILE, "w") as f:
-            json.dump(entries, f, indent=4)
+        store.set(TEMPLATES_DELETED_FILE, entries)
 
     @staticmethod
     def getSelectedTemplateName(view: discord.ui.View | None) -> str | None:
@@ -1809,8 +2381,8 @@ class Schedule(commands.Cog):
             endTime = "<Set Duration>"
             if previewDict["duration"] is not None:
                 hours, minutes, delta = Schedule.getDetailsFromDuration(previewDict["duration"])
-                endTime = discord.utils.format_dt(datetimeParse(previewDict["time"]).replace(tzinfo=pytz.utc) + delta, "t" if hours < 24 else "F")
-            embed.add_field(name="Time", value=f"{discord.utils.format_dt(datetimeParse(previewDict['time']).replace(tzinfo=pytz.utc), 'F')} - {endTime}", inline=(hours < 24))
+                endTime = discord.utils.format_dt(Utils.fromEpoch(previewDict["time"]) + delta, "t" if hours < 24 else "F")
+            embed.add_field(name="Time", value=f"{discord.utils.format_dt(Utils.fromEpoch(previewDict['time']), 'F')} - {endTime}", inline=(hours < 24))
 
         # Duration
         if previewDict["duration"] is not None:
@@ -1841,7 +2413,7 @@ class Schedule(commands.Cog):
             embed.set_author(name=f"Linking: {previewDict['workshopInterest']}")
         embed.set_footer(text=Schedule.buildPreviewFooterText(guild, previewDict["authorId"], selectedTemplateName))
         if previewDict["time"] is not None:
-            embed.timestamp = UTC.localize(datetime.strptime(previewDict["time"], TIME_FORMAT))
+            embed.timestamp = Utils.fromEpoch(previewDict["time"])
 
         # Attendance / Max Players
         if previewDict["maxPlayers"] == "hidden":
@@ -1906,17 +2478,17 @@ class Schedule(commands.Cog):
         previewEmbedDict["authorId"] = interaction.user.id
         filesRealName = []
         for filenameShort in previewEmbedDict["files"]:
-            for osFile in os.listdir("tmp/fileUpload"):
-                if str(interaction.user.id) in osFile and filenameShort in osFile:
-                    filesRealName.append(osFile)
+            if (uploadName := uploadStore.find(interaction.user.id, filenameShort)) is not None:
+                filesRealName.append(uploadName)
+                uploadStore.touch(uploadName)
         previewEmbedDict["files"] = filesRealName
 
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
-        previewEmbedDict["eventId"] = Schedule.ensureEventId(previewEmbedDict, events)
+        events = store.get(EVENTS_FILE)
+        previewEmbedDict["eventId"] = Schedule.ensureEventId(previewEmbedDict, unique=True)
         events.append(previewEmbedDict)
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
+        store.set(EVENTS_FILE, events)
+        eventIndex.add(previewEmbedDict)
+        deadlineScheduler.refreshSource("uploads")
 
         replyContent = f"`{previewEmbedDict['title']}` is now on <#{SCHEDULE}>!"
         if interaction.message == eventMsg:
@@ -1929,8 +2501,7 @@ class Schedule(commands.Cog):
 
         workshopInterestValue = previewEmbedDict.get("workshopInterest", None)
         if workshopInterestValue:
-            with open(WORKSHOP_INTEREST_FILE) as f:
-                fileWSINT = json.load(f)
+            fileWSINT = store.get(WORKSHOP_INTEREST_FILE)
             targetWorkshopMembers = [wsDetails.get("members", []) for wsName, wsDetails in fileWSINT.items() if workshopInterestValue == wsName][0]
             if targetWorkshopMembers:
                 channelArmaDiscussion = interaction.guild.get_channel(ARMA_DISCUSSION)
@@ -1954,11 +2525,10 @@ class Schedule(commands.Cog):
                 log.exception("Schedule submitCreatedEvent: channelOperationAnnouncements not discord.TextChannel")
                 return
 
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
+            events = store.get(EVENTS_FILE)
             event = [event for event in events if event["authorId"] == interaction.user.id and event["title"] == previewEmbedDict["title"] and event["description"] == previewEmbedDict["description"]][0]
 
-            embed = discord.Embed(title="Operation scheduled", url=f"https://discord.com/channels/{GUILD_ID}/{SCHEDULE}/{event['messageId']}", description=f"Title: **{previewEmbedDict['title']}**\nTime: {discord.utils.format_dt(UTC.localize(datetime.strptime(previewEmbedDict['time'], TIME_FORMAT)), style='F')}\nDuration: {previewEmbedDict['duration']}", color=EVENT_TYPE_COLORS["Operation"])
+            embed = discord.Embed(title="Operation scheduled", url=f"https://discord.com/channels/{GUILD_ID}/{SCHEDULE}/{event['messageId']}", description=f"Title: **{previewEmbedDict['title']}**\nTime: {discord.utils.format_dt(Utils.fromEpoch(previewEmbedDict['time']), style='F')}\nDuration: {previewEmbedDict['duration']}", color=EVENT_TYPE_COLORS["Operation"])
             embed.set_footer(text=f"Created by {interaction.user.display_name}")
             await channelOperationAnnouncements.send(content=roleOperationPings.mention, embed=embed)
 
@@ -1970,41 +2540,18 @@ class Schedule(commands.Cog):
     @staticmethod
     def eventCollisionCheck(startTime: datetime, endTime: datetime) -> str | None:
         """Checks if inputted event (start- & endtime) collides with scheduled event with padding."""
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
-
-        for event in events:
+        startEpoch, endEpoch = int(startTime.timestamp()), int(endTime.timestamp())
+        HOUR = 3600
+        for eventStartTime, eventEndTime, event in eventIndex.overlapping(startEpoch - HOUR, endEpoch + HOUR):
             if event.get("type", "Operation") == "Event":
                 continue
-            eventStartTime = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
-            eventEndTime = UTC.localize(datetime.strptime(event["endTime"], TIME_FORMAT))
-            if (eventStartTime <= startTime < eventEndTime) or (eventStartTime <= endTime < eventEndTime) or (startTime <= eventStartTime < endTime):
-                return f"This time collides with the event `{event['title']}`.\nScheduled {discord.utils.format_dt(eventStartTime, style='F')} - {discord.utils.format_dt(eventEndTime, style='F')}"
-            elif eventEndTime < startTime and eventEndTime + timedelta(hours=1) > startTime:
-                return f"Your event would start less than an hour after the previous event (`{event['title']}`) ends!\nScheduled event: {discord.utils.format_dt(eventStartTime, style='F')} - {discord.utils.format_dt(eventEndTime, style='F')}"
-            elif endTime < eventStartTime and endTime + timedelta(hours=1) > eventStartTime:
-                return f"There is another event (`{event['title']}`) starting less than an hour after your event ends!\nScheduled event: {discord.utils.format_dt(eventStartTime, style='F')} - {discord.utils.format_dt(eventEndTime, style='F')}"
-
-    @staticmethod
-    async def hasCandidatePinged(candidateId: int, operationTitle: str, channelRecruitmentHr: discord.TextChannel) -> bool:
-        """Checks recent messages for candidate accept embed notifications
-
-        Parameters:
-        candidateId (int): ID of the target candidate member.
-        operationTitle (str): Title of the target operation.
-        channelRecruitmentHr (discord.TextChannel): Instance of the Recruitment & HR channel to search through.
-
-        Returns:
-        bool: Whether the notification embed has been found.
-        """
-        async for message in channelRecruitmentHr.history(limit=50):
-            if message.author.id not in FRIENDLY_SNEKS:
-                continue
-            if not message.embeds:
-                continue
-            if message.embeds[0].description and str(candidateId) in message.embeds[0].description and f"`{operationTitle}`" in message.embeds[0].description:
-                return True
-        return False
+            scheduled = f"{discord.utils.format_dt(Utils.fromEpoch(eventStartTime), style='F')} - {discord.utils.format_dt(Utils.fromEpoch(eventEndTime), style='F')}"
+            if (eventStartTime <= startEpoch < eventEndTime) or (eventStartTime <= endEpoch < eventEndTime) or (startEpoch <= eventStartTime < endEpoch):
+                return f"This time collides with the event `{event['title']}`.\nScheduled {scheduled}"
+            elif eventEndTime < startEpoch and eventEndTime + HOUR > startEpoch:
+                return f"Your event would start less than an hour after the previous event (`{event['title']}`) ends!\nScheduled event: {scheduled}"
+            elif endEpoch < eventStartTime and endEpoch + HOUR > eventStartTime:
+                return f"There is another event (`{event['title']}`) starting less than an hour after your event ends!\nScheduled event: {scheduled}"
 
     @staticmethod
     async def blockVerifiedRoleRSVP(interaction: discord.Interaction, event: Dict) -> bool:
@@ -2219,22 +2766,23 @@ class Schedule(commands.Cog):
 
         # Block files with same name per user
         filenameCap = file.filename[:200]
-        filenameExists = any([re.match(fr"\d+_{interaction.user.id}_{filenameCap}", file) for file in os.listdir("tmp/fileUpload/")])
-        if filenameExists:
+        if uploadStore.find(interaction.user.id, filenameCap) is not None:
             await interaction.response.send_message(embed=discord.Embed(title="❌ Invalid filename", description="You have already uploaded a file with this name before!", color=discord.Color.red()), ephemeral=True, delete_after=30.0)
             return
 
 
-        # Everything OK, save file
-
-        # Naming scheme: 'DATETIME_AUTHORID_NAME'
-        filenameNew = f"{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}_{interaction.user.id}_{filenameCap}"
-        with open(f"tmp/fileUpload/{filenameNew}", "wb") as f:
-            await file.save(f)
+        # Everything OK, save file; the quota check needs the content, so reply privately either way
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        filenameNew, evictedUploads = await uploadStore.add(interaction.user.id, filenameCap, await file.read())
+        if filenameNew is None:
+            await interaction.followup.send(embed=discord.Embed(title="❌ Upload limit reached", description=f"Your uploads attached to events already use up your `{Schedule.convertBytes(FILE_UPLOAD_USER_QUOTA)}`, or the bot's upload space is full.", color=discord.Color.red()), ephemeral=True)
+            return
+        if evictedUploads:
+            log.info(f"Schedule fileupload: Evicted uploads {evictedUploads} to make room for '{filenameNew}'")
 
         log.info(f"{interaction.user.id} [{interaction.user.display_name}] Uploaded the file '{file.filename}' as '{filenameNew}'")
         embed = discord.Embed(title="✅ File uploaded", description=f"Uploaded file as `{filenameCap}`", color=discord.Color.green())
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
         # Log
         if secret.DISCORD_LOGGING.get("upload_file", False):
@@ -2247,17 +2795,6 @@ class Schedule(commands.Cog):
 
             await channelAuditLogs.send(embed=embed)
 
-        # Cleanup files older than 20 weeks
-        # Other cleanup methods are to have 1) a global file cap 2) an individual file cap
-        fileUploadFiles = os.listdir("tmp/fileUpload")
-        for fileUploadFile in fileUploadFiles:
-            fileUploadFileTime = UTC.localize(datetime.strptime(fileUploadFile.split("_")[0], "%Y%m%d%H%M%S"))
-            if fileUploadFileTime < (datetime.now(timezone.utc) - timedelta(weeks=20)):
-                try:
-                    os.remove(f"tmp/fileUpload/{fileUploadFile}")
-                except Exception as e:
-                    log.warning(f"Schedule fileupload: Failed to remove file '{fileUploadFile}' | {e}")
-
 
 # ===== </Fileupload> =====
 
@@ -2270,8 +2807,7 @@ class Schedule(commands.Cog):
         """Change your time zone preferences for your next scheduled event."""
         log.info(f"{interaction.user.id} [{interaction.user.display_name}] Is updating their time zone preferences")
 
-        with open(MEMBER_TIME_ZONES_FILE) as f:
-            memberTimeZones = json.load(f)
+        memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
 
         setTimeZone = memberTimeZones[str(interaction.user.id)] if str(interaction.user.id) in memberTimeZones else None
         embed = discord.Embed(
@@ -2568,8 +3104,7 @@ class NoShowLogReviewView(discord.ui.View):
     def _removeShowedUpEntries(self, showedUpIndexes: List[int]) -> Tuple[List[int], List[int]]:
         removedIndexes = []
         missingIndexes = []
-        with open(NO_SHOW_FILE) as f:
-            noShowFile = json.load(f)
+        noShowFile = store.get(NO_SHOW_FILE)
 
         for index in showedUpIndexes:
             entry = self.entries[index]
@@ -2594,8 +3129,7 @@ class NoShowLogReviewView(discord.ui.View):
                 missingIndexes.append(index)
 
         if removedIndexes:
-            with open(NO_SHOW_FILE, "w") as f:
-                json.dump(noShowFile, f, indent=4)
+            store.set(NO_SHOW_FILE, noShowFile)
 
         return removedIndexes, missingIndexes
 
@@ -2706,6 +3240,7 @@ class BaseScheduleEventDynamicButton(discord.ui.DynamicItem[discord.ui.Button],
     async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /):
         return cls(match.group("event_id"))
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         customId = interaction.data.get("custom_id") if isinstance(interaction.data, dict) else None
         if not isinstance(customId, str):
@@ -2778,8 +3313,7 @@ class ScheduleButton(discord.ui.Button):
         customId = interaction.data["custom_id"]
 
         try:
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
+            events = store.get(EVENTS_FILE)
 
             scheduleNeedsUpdate = True
             fetchMsg = False
@@ -2795,11 +3329,9 @@ class ScheduleButton(discord.ui.Button):
                     event["standby"].append(interaction.user.id)
                     await interaction.response.send_message(embed=discord.Embed(title="✅ Standby", description="You're on the standby list. If an accepted member leaves, you will be notified about the vacant roles!", color=discord.Color.green()), ephemeral=True, delete_after=60.0)
 
-                with open(EVENTS_FILE, "w") as f:
-                    json.dump(events, f, indent=4)
+                store.set(EVENTS_FILE, events)
 
-                embed = Schedule.getEventEmbed(event, interaction.guild)
-                await self.message.edit(embed=embed)
+                eventMessageEdits.request(interaction.guild, event["eventId"])
                 return
 
             elif customId == "schedule_button_reserve_role_unreserve":
@@ -2829,7 +3361,7 @@ class ScheduleButton(discord.ui.Button):
                     # Event view has button "Accept & Reserve"
                     if event["reservableRoles"] and len(event["reservableRoles"]) == event["maxPlayers"] and interaction.user.id in event["accepted"]:
                         event["accepted"].remove(interaction.user.id)
-                    await self.message.edit(embed=Schedule.getEventEmbed(event, interaction.guild))
+                    eventMessageEdits.request(interaction.guild, event["eventId"])
 
                     # Notify people on standby that reservable role(s) are vacant
                     if len(event["standby"]) > 0 and isinstance(event["maxPlayers"], int) and len(event["accepted"]) < event["maxPlayers"] and event["reservableRoles"] and not all(event["reservableRoles"].values()):
@@ -2850,16 +3382,13 @@ class ScheduleButton(discord.ui.Button):
                                 log.warning(f"ScheduleButton callback: Failed to get member with id '{standbyMemberId}'")
                                 continue
 
-                            try:
-                                await standbyMember.send(embed=embed)
-                            except Exception:
-                                log.warning(f"ScheduleButton callback: Failed to DM {standbyMember.id} [{standbyMember.display_name}] about vacant roles")
+                            dmDispatcher.send(standbyMember, "schedule_standby_vacant", key=f"vacant_{event['eventId']}", embed=embed)
                         break
 
             elif re.fullmatch(r"schedule_button_event_delete_\d+", customId):
                 eventId = customId[len("schedule_button_event_delete_"):]
 
-                event, _ = await Schedule.getEventMessageByEventId(interaction.guild, eventId, events)
+                event, _ = await Schedule.getEventMessageByEventId(interaction.guild, eventId)
                 if event is None:
                     await Schedule._sendPersistentEventMissing(interaction, eventId)
                     return
@@ -2895,7 +3424,7 @@ class ScheduleButton(discord.ui.Button):
                 await interaction.response.edit_message(view=self.view)
 
                 # Delete event
-                event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, eventId, events)
+                event = Schedule.getEventByEventId(eventId)
                 if event is None:
                     await Schedule._sendPersistentEventMissing(interaction, eventId)
                     return
@@ -2904,18 +3433,23 @@ class ScheduleButton(discord.ui.Button):
                     await interaction.followup.send("Only the host, Unit Staff and Server Hampters can configure the event!", ephemeral=True)
                     return
 
-                if eventMsg is None:
+                channelSchedule = interaction.guild.get_channel(SCHEDULE)
+                if not isinstance(event.get("messageId"), int) or not isinstance(channelSchedule, discord.TextChannel):
                     await Schedule._sendPersistentEventMissing(interaction, eventId)
                     return
 
-                await eventMsg.delete()
+                # Delete by id; a message already gone still removes the event
+                try:
+                    await channelSchedule.get_partial_message(event["messageId"]).delete()
+                except discord.NotFound:
+                    pass
                 try:
                     log.info(f"{interaction.user.id} [{interaction.user.display_name}] deleted the event '{event['title']}'")
                     await interaction.followup.send(embed=discord.Embed(title=f"✅ {event['type']} deleted!", color=discord.Color.green()), ephemeral=True)
 
                     # Notify attendees
                     utcNow = datetime.now(timezone.utc)
-                    startTime = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
+                    startTime = Utils.fromEpoch(event["time"])
                     if event["maxPlayers"] != "hidden" and utcNow > startTime + timedelta(minutes=30):
                         await Schedule.saveEventToHistory(event, interaction.guild)
                     else:
@@ -2923,19 +3457,19 @@ class ScheduleButton(discord.ui.Button):
                             member = interaction.guild.get_member(memberId)
                             if member is not None:
                                 reservedRole = next((roleName for roleName, reservedMemberId in (event.get("reservableRoles") or {}).items() if reservedMemberId == member.id), None)
-                                description = f"The {event.get('type', 'Operation').lower()} was scheduled to run:\n{discord.utils.format_dt(UTC.localize(datetime.strptime(event['time'], TIME_FORMAT)), style='F')}"
+                                description = f"The {event.get('type', 'Operation').lower()} was scheduled to run:\n{discord.utils.format_dt(Utils.fromEpoch(event['time']), style='F')}"
                                 if reservedRole is not None:
                                     description += f"\nReserved role: `{reservedRole}`"
 
                                 embed = discord.Embed(title=f"🗑 {event.get('type', 'Operation')} deleted: {event['title']}!", description=description, color=discord.Color.red())
                                 embed.set_footer(text=f"By: {interaction.user}")
-                                try:
-                                    await member.send(embed=embed)
-                                except Exception:
-                                    log.warning(f"{member.id} [{member.display_name}]")
+                                dmDispatcher.send(member, "schedule_event_deleted", embed=embed)
                 except Exception:
                     log.exception(f"{interaction.user.id} [{interaction.user.display_name}]")
                 events.remove(event)
+                eventIndex.remove(event)
+                candidateLedger.forgetEvents({event["eventId"]})
+                deadlineScheduler.refreshSource("uploads")
 
             elif customId.startswith("schedule_button_event_delete_cancel_"):
                 if self.view is None:
@@ -2951,7 +3485,7 @@ class ScheduleButton(discord.ui.Button):
             elif customId.startswith("schedule_button_event_list_rsvp_"):
                 eventId = customId[len("schedule_button_event_list_rsvp_"):]
 
-                event = Schedule.getEventByEventId(events, eventId)
+                event = Schedule.getEventByEventId(eventId)
                 if event is None:
                     await Schedule._sendPersistentEventMissing(interaction, eventId)
                     return
@@ -3058,8 +3592,7 @@ class ScheduleButton(discord.ui.Button):
 
                     case "time":
                         # Set user time zone
-                        with open(MEMBER_TIME_ZONES_FILE) as f:
-                            memberTimeZones = json.load(f)
+                        memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
                         if str(interaction.user.id) not in memberTimeZones:
                             await interaction.response.send_message(embed=discord.Embed(title="❌ Apply timezone", description="You must provide a time zone. Enter one in the time field, or use `/changetimezone` to store your time zone persistently.", color=discord.Color.red()), ephemeral=True, delete_after=30.0)
                             return
@@ -3071,7 +3604,7 @@ class ScheduleButton(discord.ui.Button):
                         default = ""
 
                         if previewEmbedDict["time"] is not None:
-                            default = placeholder = datetimeParse(previewEmbedDict["time"]).replace(tzinfo=pytz.utc).astimezone(timeZone).strftime(TIME_FORMAT)
+                            default = placeholder = Utils.fromEpoch(previewEmbedDict["time"]).astimezone(timeZone).strftime(TIME_FORMAT)
 
                         await interaction.response.send_modal(generateModal(
                             style=discord.TextStyle.short,
@@ -3098,11 +3631,10 @@ class ScheduleButton(discord.ui.Button):
                         await interaction.response.send_modal(generateModal(discord.TextStyle.long, placeholder, default, False, 1, 512))
 
                     case "map":
-                        with open(GENERIC_DATA_FILE) as f:
-                            genericData = json.load(f)
-                            if "modpackMaps" not in genericData:
-                                log.warning("ScheduleButton callback map: modpackMaps not in genericData")
-                                return
+                        genericData = store.get(GENERIC_DATA_FILE)
+                        if "modpackMaps" not in genericData:
+                            log.warning("ScheduleButton callback map: modpackMaps not in genericData")
+                            return
 
                         options = [discord.SelectOption(label=mapName) for mapName in genericData["modpackMaps"]]
                         await interaction.response.send_message(interaction.user.mention, view=Schedule.generateSelectView(
@@ -3136,8 +3668,7 @@ class ScheduleButton(discord.ui.Button):
                         ))
 
                     case "linking":
-                        with open(WORKSHOP_INTEREST_FILE) as f:
-                            workshops = json.load(f)
+                        workshops = store.get(WORKSHOP_INTEREST_FILE)
                         options = [discord.SelectOption(label=wsName) for wsName in workshops]
                         await interaction.response.send_message(interaction.user.mention, view=Schedule.generateSelectView(
                             options,
@@ -3431,7 +3962,7 @@ class ScheduleButton(discord.ui.Button):
 
             elif customId.startswith("schedule_button_event_edit_files_add_"):
                 eventId = customId[len("schedule_button_event_edit_files_add_"):]
-                _, messageNew = await Schedule.getEventMessageByEventId(interaction.guild, eventId, events)
+                _, messageNew = await Schedule.getEventMessageByEventId(interaction.guild, eventId)
                 if not isinstance(messageNew, discord.Message):
                     log.exception("ScheduleButton callback event_edit_files_add: messageNew not discord.Message")
                     return
@@ -3453,7 +3984,7 @@ class ScheduleButton(discord.ui.Button):
 
             elif customId.startswith("schedule_button_event_edit_files_remove_"):
                 eventId = customId[len("schedule_button_event_edit_files_remove_"):]
-                _, messageNew = await Schedule.getEventMessageByEventId(interaction.guild, eventId, events)
+                _, messageNew = await Schedule.getEventMessageByEventId(interaction.guild, eventId)
                 if not isinstance(messageNew, discord.Message):
                     log.exception("ScheduleButton callback event_edit_files_remove: messageNew not discord.Message")
                     return
@@ -3473,8 +4004,7 @@ class ScheduleButton(discord.ui.Button):
 
             elif customId == "schedule_button_change_time_zone":
                 default = None
-                with open(MEMBER_TIME_ZONES_FILE) as f:
-                    memberTimeZones = json.load(f)
+                memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
                 if str(interaction.user.id) in memberTimeZones:
                     default = memberTimeZones[str(interaction.user.id)]
 
@@ -3489,13 +4019,11 @@ class ScheduleButton(discord.ui.Button):
                 return
 
             elif customId == "schedule_button_remove_time_zone":
-                with open(MEMBER_TIME_ZONES_FILE) as f:
-                    memberTimeZones = json.load(f)
+                memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
 
                 if str(interaction.user.id) in memberTimeZones:
                     del memberTimeZones[str(interaction.user.id)]
-                    with open(MEMBER_TIME_ZONES_FILE, "w") as f:
-                        json.dump(memberTimeZones, f, indent=4)
+                    store.set(MEMBER_TIME_ZONES_FILE, memberTimeZones)
 
                     embed = discord.Embed(title="✅ Time zone removed", description="Your configuration is now removed.", color=discord.Color.green())
                     await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=10.0)
@@ -3521,8 +4049,7 @@ class ScheduleButton(discord.ui.Button):
 
             elif customId.startswith("schedule_button_noshow_remove_"):
                 targetUserId = customId[len("schedule_button_noshow_remove_"):]
-                with open(NO_SHOW_FILE) as f:
-                    noShowFile = json.load(f)
+                noShowFile = store.get(NO_SHOW_FILE)
 
                 if targetUserId not in noShowFile:
                     embed = discord.Embed(title="User not found", description="Target user not found in no show entries", color=discord.Color.red())
@@ -3567,8 +4094,7 @@ class ScheduleButton(discord.ui.Button):
                 except Exception:
                     log.exception(f"{interaction.user.id} | [{interaction.user.display_name}]")
 
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+            store.set(EVENTS_FILE, events)
             if len(events) == 0:
                 await Schedule.updateSchedule(interaction.guild)
         except Exception:
@@ -3729,8 +4255,7 @@ class ScheduleSelect(discord.ui.Select):
             userId = customId[len("schedule_select_noshow_entry_"):]
             userId = "_".join(userId.split("_")[:-1])  # Remove "_REMOVE0"
 
-            with open(NO_SHOW_FILE) as f:
-                noShowFile = json.load(f)
+            noShowFile = store.get(NO_SHOW_FILE)
 
             if userId not in noShowFile:
                 embed = discord.Embed(title="User not found", description="Target user not found in no-show entries", color=discord.Color.red())
@@ -3756,8 +4281,7 @@ class ScheduleSelect(discord.ui.Select):
             if len(noShowFile[userId]) == 0:
                 noShowFile.pop(userId, None)
 
-            with open(NO_SHOW_FILE, "w") as f:
-                json.dump(noShowFile, f, indent=4)
+            store.set(NO_SHOW_FILE, noShowFile)
             return
 
 
@@ -3769,39 +4293,36 @@ class ScheduleSelect(discord.ui.Select):
 
             await interaction.response.edit_message(view=None)
 
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-            event = [event for event in events if event["messageId"] == self.eventMsg.id][0]
+            async with store.transaction(EVENTS_FILE) as events:
+                event = [event for event in events if event["messageId"] == self.eventMsg.id][0]
+                Schedule.settleEvent(event, interaction.guild)
 
-            # Fail if role got reserved
-            if event["reservableRoles"][selectedValue] is not None:
-                await interaction.followup.send(embed=discord.Embed(title=f"❌ Role is already reserved!", color=discord.Color.red()), ephemeral=True)
-                return
+                # Fail if role got reserved
+                if event["reservableRoles"][selectedValue] is not None:
+                    await interaction.followup.send(embed=discord.Embed(title=f"❌ Role is already reserved!", color=discord.Color.red()), ephemeral=True)
+                    return
 
-            # Remove user from any reserved roles
-            for roleName in event["reservableRoles"]:
-                if event["reservableRoles"][roleName] == interaction.user.id:
-                    event["reservableRoles"][roleName] = None
-                    break
+                # Remove user from any reserved roles
+                for roleName in event["reservableRoles"]:
+                    if event["reservableRoles"][roleName] == interaction.user.id:
+                        event["reservableRoles"][roleName] = None
+                        break
 
-            # Reserve desired role
-            event["reservableRoles"][selectedValue] = interaction.user.id
-            await interaction.followup.send(embed=discord.Embed(title=f"✅ Role reserved: `{selectedValue}`", color=discord.Color.green()), ephemeral=True)
+                # Reserve desired role
+                event["reservableRoles"][selectedValue] = interaction.user.id
 
-            # Put the user in accepted
-            if interaction.user.id in event["declined"]:
-                event["declined"].remove(interaction.user.id)
-            if interaction.user.id in event["tentative"]:
-                event["tentative"].remove(interaction.user.id)
-            if interaction.user.id in event["standby"]:
-                event["standby"].remove(interaction.user.id)
-            if interaction.user.id not in event["accepted"]:
-                event["accepted"].append(interaction.user.id)
+                # Put the user in accepted
+                if interaction.user.id in event["declined"]:
+                    event["declined"].remove(interaction.user.id)
+                if interaction.user.id in event["tentative"]:
+                    event["tentative"].remove(interaction.user.id)
+                if interaction.user.id in event["standby"]:
+                    event["standby"].remove(interaction.user.id)
+                if interaction.user.id not in event["accepted"]:
+                    event["accepted"].append(interaction.user.id)
 
-            # Write changes
-            await self.eventMsg.edit(embed=Schedule.getEventEmbed(event, interaction.guild))
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+            await interaction.followup.send(embed=discord.Embed(title=f"✅ Role reserved: `{selectedValue}`", color=discord.Color.green()), ephemeral=True)
+            eventMessageEdits.request(interaction.guild, event["eventId"])
 
             # Ping Recruitment Team if candidate reserves
             if event["type"].lower() == "operation" and any([True for role in interaction.user.roles if role.id == CANDIDATE]):
@@ -3812,10 +4333,14 @@ class ScheduleSelect(discord.ui.Select):
                 if not isinstance(channelRecruitmentHr, discord.TextChannel):
                     log.exception("ScheduleSelect callback: channelRecruitmentHr not discord.TextChannel")
                     return
-                if not await Schedule.hasCandidatePinged(interaction.user.id, event["title"], channelRecruitmentHr):
+                if candidateLedger.claimAcceptNotice(interaction.user.id, event["eventId"]):
                     embed = discord.Embed(title="Candidate Accept", description=f"{interaction.user.mention} accepted operation `{event['title']}`\nReserved role `{selectedValue}`", color=discord.Color.blue())
                     embed.set_footer(text=f"Candidate ID: {interaction.user.id}")
-                    await channelRecruitmentHr.send(embed=embed)
+                    try:
+                        await channelRecruitmentHr.send(embed=embed)
+                    except Exception:
+                        candidateLedger.releaseAcceptNotice(interaction.user.id, event["eventId"])
+                        raise
 
 
         elif customId == "schedule_select_edit_field":
@@ -3823,9 +4348,8 @@ class ScheduleSelect(discord.ui.Select):
                 log.exception("ScheduleSelect callback edit_select: self.eventId is None")
                 return
 
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-            event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId, events)
+            events = store.get(EVENTS_FILE)
+            event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId)
             if event is None or eventMsg is None:
                 await Schedule._sendPersistentEventMissing(interaction, self.eventId)
                 return
@@ -3861,8 +4385,7 @@ class ScheduleSelect(discord.ui.Select):
 
                 # Editing Linking
                 case "Linking":
-                    with open(WORKSHOP_INTEREST_FILE) as f:
-                        wsIntOptions = json.load(f).keys()
+                    wsIntOptions = store.get(WORKSHOP_INTEREST_FILE).keys()
 
                     options = [discord.SelectOption(label=wsName) for wsName in wsIntOptions]
                     view = Schedule.generateSelectView(options, True, event["map"], eventMsg, "Link event to a workshop.", "schedule_select_edit_linking", interaction.user.id, eventId=self.eventId)
@@ -3907,11 +4430,10 @@ class ScheduleSelect(discord.ui.Select):
 
                 # Editing Map
                 case "Map":
-                    with open(GENERIC_DATA_FILE) as f:
-                        genericData = json.load(f)
-                        if "modpackMaps" not in genericData:
-                            log.exception("ScheduleButton callback: modpackMaps not in genericData")
-                            return
+                    genericData = store.get(GENERIC_DATA_FILE)
+                    if "modpackMaps" not in genericData:
+                        log.exception("ScheduleButton callback: modpackMaps not in genericData")
+                        return
                     options = [discord.SelectOption(label=mapName) for mapName in genericData["modpackMaps"]]
                     view = Schedule.generateSelectView(options, True, event["map"], eventMsg, "Select a map.", "schedule_select_edit_map", interaction.user.id, eventId=self.eventId)
                     await interaction.response.send_message(view=view, ephemeral=True, delete_after=60.0)
@@ -3941,8 +4463,7 @@ class ScheduleSelect(discord.ui.Select):
                 # Editing Time
                 case "Time":
                     # Set user time zone
-                    with open(MEMBER_TIME_ZONES_FILE) as f:
-                        memberTimeZones = json.load(f)
+                    memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
                     if str(interaction.user.id) not in memberTimeZones:
                         await interaction.response.send_message(embed=discord.Embed(title="❌ Apply timezone", description="You must provide a time zone. Enter one in the time field, or use `/changetimezone` to store your time zone persistently.", color=discord.Color.red()), ephemeral=True, delete_after=30.0)
                         return
@@ -3953,7 +4474,7 @@ class ScheduleSelect(discord.ui.Select):
                     modal.add_item(discord.ui.TextInput(
                         label="Time",
                         placeholder="2069-04-20 04:20 PM",
-                        default=datetimeParse(event["time"]).replace(tzinfo=UTC).astimezone(timeZone).strftime(TIME_FORMAT),
+                        default=Utils.fromEpoch(event["time"]).astimezone(timeZone).strftime(TIME_FORMAT),
                         max_length=32  # Arbitrary
                     ))
                     await interaction.response.send_modal(modal)
@@ -3981,9 +4502,8 @@ class ScheduleSelect(discord.ui.Select):
 
             eventKey = customId[len("schedule_select_edit_"):].split("_REMOVE")[0]  # e.g. "files_add"
 
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-            event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId, events)
+            events = store.get(EVENTS_FILE)
+            event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId)
             if event is None or eventMsg is None:
                 await Schedule._sendPersistentEventMissing(interaction, self.eventId)
                 return
@@ -4002,10 +4522,17 @@ class ScheduleSelect(discord.ui.Select):
                         await interaction.response.send_message(embed=discord.Embed(title="❌ File already added", color=discord.Color.red()), ephemeral=True, delete_after=5.0)
                         return
 
+                    uploadPath = uploadStore.path(filenameFull)
+                    if uploadPath is None:
+                        log.warning(f"ScheduleSelect callback files_add: '{filenameFull}' not in the upload manifest")
+                        await interaction.response.send_message(embed=discord.Embed(title="❌ Interaction failed", description="Could not find file in fileuploads!", color=discord.Color.red()), ephemeral=True, delete_after=5.0)
+                        return
+
                     filenameShort = filenameFull.split("_", 2)[2]
                     event["files"].append(filenameFull)
-                    with open(f"tmp/fileUpload/{filenameFull}", "rb") as f:
+                    with open(uploadPath, "rb") as f:
                         await eventMsg.add_files(discord.File(f, filename=filenameShort))
+                    uploadStore.touch(filenameFull)
 
                 case "files_remove":
                     eventAttachmentDict = {eventAttachment.filename: eventAttachment for eventAttachment in eventMsg.attachments}
@@ -4022,13 +4549,14 @@ class ScheduleSelect(discord.ui.Select):
                         return
 
                     event["files"].remove(filenameFull)
+                    deadlineScheduler.refreshSource("uploads")
                     await eventMsg.remove_attachments(eventAttachmentDict[selectedValue])
 
                 case _:
                     event[eventKey] = None if selectedValue == "None" else selectedValue
 
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+            Schedule.settleEvent(event, interaction.guild)
+            store.set(EVENTS_FILE, events)
 
             await eventMsg.edit(embed=Schedule.getEventEmbed(event, interaction.guild))
             await interaction.response.send_message(embed=discord.Embed(title="✅ Event edited", color=discord.Color.green()), ephemeral=True, delete_after=5.0)
@@ -4080,8 +4608,7 @@ class ScheduleModal(discord.ui.Modal):
                 await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=30.0)
                 return
 
-            with open(NO_SHOW_FILE) as f:
-                noShowFile = json.load(f)
+            noShowFile = store.get(NO_SHOW_FILE)
 
             if targetUserId not in noShowFile:
                 noShowFile[targetUserId] = []
@@ -4093,8 +4620,7 @@ class ScheduleModal(discord.ui.Modal):
                     "reservedRole": resRoles or None
                 }
             )
-            with open(NO_SHOW_FILE, "w") as f:
-                json.dump(noShowFile, f, indent=4)
+            store.set(NO_SHOW_FILE, noShowFile)
 
             embedDescription = f"**Date:** {datetime.fromtimestamp(dateTimestamp, timezone.utc).strftime(TIME_FORMAT)}\n**Operation Name:** `{opName}`"
             if resRoles:
@@ -4106,8 +4632,7 @@ class ScheduleModal(discord.ui.Modal):
 
         if customId == "schedule_modal_change_time_zone":
             timezoneOk = False
-            with open(MEMBER_TIME_ZONES_FILE) as f:
-                memberTimeZones = json.load(f)
+            memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
 
             try:
                 timeZone = pytz.timezone(value)
@@ -4117,8 +4642,7 @@ class ScheduleModal(discord.ui.Modal):
                 pass
 
             if timezoneOk:
-                with open(MEMBER_TIME_ZONES_FILE, "w") as f:
-                    json.dump(memberTimeZones, f, indent=4)
+                store.set(MEMBER_TIME_ZONES_FILE, memberTimeZones)
 
                 embed = discord.Embed(title="✅ Time zone set", description=f"Your time zone is now set to `{timeZone.zone}`.", color=discord.Color.green())
             else:
@@ -4158,8 +4682,7 @@ class ScheduleModal(discord.ui.Modal):
 
                 case "time":
                     # Basic premise
-                    with open(MEMBER_TIME_ZONES_FILE) as f:
-                        memberTimeZones = json.load(f)
+                    memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
                     timeZone = pytz.timezone(memberTimeZones[str(interaction.user.id)])
                     try:
                         startTime = datetimeParse(value, tzinfos=None)
@@ -4176,7 +4699,7 @@ class ScheduleModal(discord.ui.Modal):
                         return
 
                     # Set time
-                    previewEmbedDict["time"] = startTime.strftime(TIME_FORMAT)
+                    previewEmbedDict["time"] = Utils.toEpoch(startTime)
                     previewEmbedDict["endTime"] = None
                     # Set endTime if duration available
                     if previewEmbedDict["duration"] is not None:
@@ -4185,7 +4708,7 @@ class ScheduleModal(discord.ui.Modal):
                             await interaction.response.send_message(interaction.user.mention, embed=EMBED_INVALID, ephemeral=True, delete_after=10.0)
                             return
                         hours, minutes, delta = durationDetails
-                        previewEmbedDict["endTime"] = (startTime + delta).strftime(TIME_FORMAT)
+                        previewEmbedDict["endTime"] = Utils.toEpoch(startTime + delta)
 
                     collision = Schedule.eventCollisionCheck(startTime, (startTime + delta) if previewEmbedDict["endTime"] else startTime+timedelta(minutes=30))
                     if collision:
@@ -4311,9 +4834,8 @@ class ScheduleModal(discord.ui.Modal):
 
         followupMsg = {}
         autoUnreservedRoleNotifications = []
-        with open(EVENTS_FILE) as f:
-            events = json.load(f)
-        event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId, events)
+        events = store.get(EVENTS_FILE)
+        event, eventMsg = await Schedule.getEventMessageByEventId(interaction.guild, self.eventId)
         if event is None or eventMsg is None:
             await Schedule._sendPersistentEventMissing(interaction, self.eventId)
             return
@@ -4392,12 +4914,12 @@ class ScheduleModal(discord.ui.Modal):
 
             # Update event endTime if no template
             if "endTime" in event:
-                startTime = UTC.localize(datetime.strptime(event["time"], TIME_FORMAT))
+                startTime = Utils.fromEpoch(event["time"])
                 endTime = startTime + delta
-                event["endTime"] = endTime.strftime(TIME_FORMAT)
+                event["endTime"] = Utils.toEpoch(endTime)
+                eventIndex.move(event)
 
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+            store.set(EVENTS_FILE, events)
 
             await eventMsg.edit(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
 
@@ -4413,7 +4935,7 @@ class ScheduleModal(discord.ui.Modal):
             if endTimeOld is not None and event.get("endTime") is not None:
                 previewEmbed.add_field(
                     name="End time",
-                    value=f"From: {discord.utils.format_dt(UTC.localize(datetime.strptime(endTimeOld, TIME_FORMAT)), style='F')}\n\u2004\u2004\u2004\u205F\u200ATo: {discord.utils.format_dt(UTC.localize(datetime.strptime(event['endTime'], TIME_FORMAT)), style='F')}",
+                    value=f"From: {discord.utils.format_dt(Utils.fromEpoch(endTimeOld), style='F')}\n\u2004\u2004\u2004\u205F\u200ATo: {discord.utils.format_dt(Utils.fromEpoch(event['endTime']), style='F')}",
                     inline=False
                 )
             previewEmbed.add_field(name="\u200B", value=eventMsg.jump_url, inline=False)
@@ -4421,10 +4943,7 @@ class ScheduleModal(discord.ui.Modal):
             for memberId in event["accepted"] + event["declined"] + event["tentative"] + event["standby"]:
                 member = interaction.guild.get_member(memberId)
                 if member is not None:
-                    try:
-                        await member.send(embed=previewEmbed)
-                    except Exception:
-                        log.warning(f"Failed to DM {member.id} [{member.display_name}] about event duration change")
+                    dmDispatcher.send(member, "schedule_event_duration_changed", embed=previewEmbed)
 
             return
 
@@ -4442,8 +4961,7 @@ class ScheduleModal(discord.ui.Modal):
                 await interaction.response.send_message(interaction.user.mention, embed=EMBED_INVALID, ephemeral=True, delete_after=10.0)
                 return
 
-            with open(MEMBER_TIME_ZONES_FILE) as f:
-                memberTimeZones = json.load(f)
+            memberTimeZones = store.get(MEMBER_TIME_ZONES_FILE)
             timeZone = pytz.timezone(memberTimeZones[str(interaction.user.id)])
             if startTime.tzinfo is None:
                 startTime = timeZone.localize(startTime).astimezone(UTC)
@@ -4451,13 +4969,15 @@ class ScheduleModal(discord.ui.Modal):
                 startTime = startTime.astimezone(UTC)
 
             # Check if new time and old time is the same
-            if startTime.strftime(TIME_FORMAT) == startTimeOld:
+            if Utils.toEpoch(startTime) == startTimeOld:
                 await interaction.response.send_message(interaction.user.mention, embed=discord.Embed(title="❌ No changes made", description="The new time is the same as the old time.", color=discord.Color.red()), ephemeral=True, delete_after=10.0)
                 return
 
             endTime = startTime + delta
-            event["time"] = startTime.strftime(TIME_FORMAT)
-            event["endTime"] = endTime.strftime(TIME_FORMAT)
+            async with store.transaction(EVENTS_FILE):
+                event["time"] = Utils.toEpoch(startTime)
+                event["endTime"] = Utils.toEpoch(endTime)
+                eventIndex.move(event)
 
             # Notify attendees of time change
             # Send before time-hogging processes - fix interaction failed
@@ -4465,7 +4985,7 @@ class ScheduleModal(discord.ui.Modal):
 
             previewEmbed = discord.Embed(
                 title=f":clock3: The starting time has changed for: {event['title']}!",
-                description=f"From: {discord.utils.format_dt(UTC.localize(datetime.strptime(startTimeOld, TIME_FORMAT)), style='F')}\n\u2004\u2004\u2004\u205F\u200ATo: {discord.utils.format_dt(UTC.localize(datetime.strptime(event['time'], TIME_FORMAT)), style='F')}",
+                description=f"From: {discord.utils.format_dt(Utils.fromEpoch(startTimeOld), style='F')}\n\u2004\u2004\u2004\u205F\u200ATo: {discord.utils.format_dt(Utils.fromEpoch(event['time']), style='F')}",
                 color=discord.Color.orange()
             )
             previewEmbed.add_field(name="\u200B", value=eventMsg.jump_url, inline=False)
@@ -4473,46 +4993,10 @@ class ScheduleModal(discord.ui.Modal):
             for memberId in event["accepted"] + event["declined"] + event["tentative"] + event["standby"]:
                 member = interaction.guild.get_member(memberId)
                 if member is not None:
-                    try:
-                        await member.send(embed=previewEmbed)
-                    except Exception:
-                        log.warning(f"Failed to DM {member.id} [{member.display_name}] about event time change")
+                    dmDispatcher.send(member, "schedule_event_time_changed", embed=previewEmbed)
 
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
-
-            # === Reorder events ===
-            # Save message ID order
-            msgIds = []
-            for eve in events:
-                msgIds.append(eve["messageId"])
-
-            # Sort events
-            sortedEvents = sorted(events, key=lambda e: datetime.strptime(e["time"], TIME_FORMAT), reverse=True)
-
-            channelSchedule = await interaction.guild.fetch_channel(SCHEDULE)
-            if not isinstance(channelSchedule, discord.TextChannel):
-                log.exception("ScheduleModal on_submit: channelSchedule not discord.TextChannel")
-                return
-
-            anyEventChange = False
-            for idx, eve in enumerate(sortedEvents):
-                # If msg is in a different position
-                if eve["messageId"] != msgIds[idx]:
-                    anyEventChange = True
-                    eve["messageId"] = msgIds[idx]
-
-                    # Edit msg to match position
-                    msg = await channelSchedule.fetch_message(msgIds[idx])
-                    await msg.edit(embed=Schedule.getEventEmbed(sortedEvents[idx], interaction.guild), view=Schedule.getEventView(sortedEvents[idx]), attachments=Schedule.getEventFiles(sortedEvents[idx]))
-
-            if anyEventChange is False:
-                msg = await channelSchedule.fetch_message(event["messageId"])
-                await msg.edit(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
-
-
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(sortedEvents, f, indent=4)
+            # The event may have moved; the reconciler edits the messages into the new order and stores it
+            await Schedule.updateSchedule(interaction.guild)
 
             return
 
@@ -4520,8 +5004,8 @@ class ScheduleModal(discord.ui.Modal):
         else:
             event[customId[len("schedule_modal_edit_"):]] = value
 
-        with open(EVENTS_FILE, "w") as f:
-            json.dump(events, f, indent=4)
+        Schedule.settleEvent(event, interaction.guild)
+        store.set(EVENTS_FILE, events)
 
         await eventMsg.edit(embed=Schedule.getEventEmbed(event, interaction.guild), view=Schedule.getEventView(event))
         await interaction.response.send_message(interaction.user.mention, embed=discord.Embed(title="✅ Event edited", color=discord.Color.green()), ephemeral=True, delete_after=5.0)
@@ -4542,10 +5026,7 @@ class ScheduleModal(discord.ui.Modal):
             )
             embed.add_field(name="\u200B", value=eventMsg.jump_url, inline=False)
             embed.set_footer(text=f"By: {interaction.user}")
-            try:
-                await member.send(embed=embed)
-            except Exception:
-                log.warning(f"ScheduleModal on_submit: Failed to DM {member.id} [{member.display_name}] about automatic role unreserve")
+            dmDispatcher.send(member, "schedule_role_auto_unreserved", embed=embed)
 
 
     async def on_error(self, interaction: discord.Interaction, error: Exception) -> None:
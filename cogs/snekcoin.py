@@ -1,11 +1,14 @@
-import json, discord, logging
+import time, discord, bisect, logging
 
-from typing import Dict, Tuple, List, Literal
-from random import random, randint, choices, choice
+from typing import Dict, Tuple, List, Literal, Iterable
+from random import random, randint, choice
 
 from discord.ext import commands  # type: ignore
 
 from utils import Utils  # type: ignore
+from executors import runIO  # type: ignore
+from casino import playCoinFlip, playDiceRoll, playSlots  # type: ignore
+from storage import store, walletLedger  # type: ignore
 import secret
 from constants import *
 if secret.DEBUG:
@@ -18,8 +21,81 @@ DEFAULT_WALLET = {
     "money": 0,
     "moneySpent": 0,
     "timesBumped": 0,
+    "bumpDay": 0,  # UTC day number timesBumped counts for
 }
 WALLET_TYPES = set(DEFAULT_WALLET.keys())
+LEADERBOARD_ENTRIES_PER_PAGE = 20
+
+
+class LeaderboardIndex:
+    """Guild members with SnekCoins, ranked by balance, for the leaderboard.
+
+    Kept as a list of (-money, userId) sorted with bisect. Wallet ledger records
+    re-rank only the wallets they change and members leaving or joining are
+    dropped or re-added; any other change to the wallets (e.g. loading them)
+    rebuilds the index on next use.
+    """
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.guild: discord.Guild | None = None
+        self.ranking: List[Tuple[int, int]] = []  # (-money, userId), richest first
+        self.balances: Dict[int, int] = {}  # userId: money, for the ranked members
+
+    def refresh(self, guild: discord.Guild) -> None:
+        """Rebuilds the index if the wallets changed other than through the ledger since the last build."""
+        if self.version == store.version(WALLETS_FILE) and self.guild is guild:
+            return
+        self.guild = guild
+        self.balances = {}
+        for userIdStr, wallet in store.get(WALLETS_FILE).items():
+            if wallet.get("money", 0) != 0 and guild.get_member(int(userIdStr)) is not None:
+                self.balances[int(userIdStr)] = wallet.get("money", 0)
+        self.ranking = sorted((-money, userId) for userId, money in self.balances.items())
+        self.version = store.version(WALLETS_FILE)
+
+    def _remove(self, userId: int) -> None:
+        money = self.balances.pop(userId, None)
+        if money is not None:
+            del self.ranking[bisect.bisect_left(self.ranking, (-money, userId))]
+
+    def update(self, userId: int) -> None:
+        """Re-ranks a member from their current wallet; dropped if they have no SnekCoins or left."""
+        if self.guild is None:
+            return
+        self._remove(userId)
+        money = store.get(WALLETS_FILE).get(str(userId), {}).get("money", 0)
+        if money != 0 and self.guild.get_member(userId) is not None:
+            self.balances[userId] = money
+            bisect.insort(self.ranking, (-money, userId))
+
+    def walletsChanged(self, userIdStrs: List[str]) -> None:
+        """Wallet ledger listener."""
+        # Only the latest change can be applied incrementally; otherwise refresh() rebuilds
+        if self.version is None or self.version + 1 != store.version(WALLETS_FILE):
+            return
+        for userIdStr in userIdStrs:
+            self.update(int(userIdStr))
+        self.version = store.version(WALLETS_FILE)
+
+    def memberLeft(self, userId: int) -> None:
+        self._remove(userId)
+
+    def rank(self, userId: int) -> int | None:
+        """A member's leaderboard rank, 1 for the richest, or None if not ranked."""
+        money = self.balances.get(userId)
+        return bisect.bisect_left(self.ranking, (-money, userId)) + 1 if money is not None else None
+
+    def page(self, page: int) -> List[Tuple[int, int, int]]:
+        """(rank, userId, money) of the members on a leaderboard page, counting from 0."""
+        start = page * LEADERBOARD_ENTRIES_PER_PAGE
+        return [(rank, userId, -negativeMoney) for rank, (negativeMoney, userId) in enumerate(self.ranking[start:start + LEADERBOARD_ENTRIES_PER_PAGE], start=start + 1)]
+
+    def pageCount(self) -> int:
+        return -(-len(self.ranking) // LEADERBOARD_ENTRIES_PER_PAGE)
+
+
+leaderboardIndex = LeaderboardIndex()
+walletLedger.listen(leaderboardIndex.walletsChanged)
 
 
 @discord.app_commands.guilds(GUILD)
@@ -40,6 +116,14 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             log.exception("Snekcoin on_ready: guild is None")
             return
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        leaderboardIndex.update(member.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        leaderboardIndex.memberLeft(member.id)
+
 
     @staticmethod
     async def getWallet(userId: int) -> Dict[str, int] | None:
@@ -52,8 +136,7 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         dict: The user's wallet.
         """
         try:
-            with open(WALLETS_FILE) as f:
-                wallets = json.load(f)
+            wallets = store.get(WALLETS_FILE)
         except FileNotFoundError:
             wallets = {}
         except Exception:
@@ -61,7 +144,7 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             return None
 
         userIdStr = str(userId)
-        userWallet = wallets.get(userIdStr, DEFAULT_WALLET.copy())
+        userWallet = {**DEFAULT_WALLET, **wallets.get(userIdStr, {})}  # Copy; wallets is the live store document
         return userWallet
 
 
@@ -69,7 +152,10 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
     async def updateWallet(
         userId: int,
         walletType: Literal["timesCommended", "sentCommendations", "money", "moneySpent", "timesBumped"],
-        amount: int
+        amount: int,
+        recordType: str,
+        cause: str,
+        sourceId: int | None = None
     ) -> None:
         """Update the wallet type of a user.
 
@@ -77,49 +163,107 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         userId (int): The user ID.
         walletType (str): The type of wallet to update.
         amount (int): The amount to update in the user's wallet.
+        recordType (str): Ledger record type, e.g. "bumpAward".
+        cause (str): The command or interaction behind the change, for the ledger.
+        sourceId (int | None): Member who made the change; None for the bot itself.
 
         Returns:
         None.
         """
-        try:
-            with open(WALLETS_FILE) as f:
-                wallets = json.load(f)
-        except FileNotFoundError:
-            wallets = {}
-        except Exception:
-            log.exception("Snekcoin updateWallet: Failed to load wallets file.")
-            return
-
         if walletType not in WALLET_TYPES:
             log.exception(f"Snekcoin updateWallet: Invalid walletType '{walletType}'")
             return
 
-        userIdStr = str(userId)
-        userWallet = wallets.get(userIdStr, DEFAULT_WALLET.copy())
-        if not isinstance(userWallet, dict):
-            userWallet = DEFAULT_WALLET.copy()
+        changes = {walletType: amount}
+        if walletType == "money" and amount < 0:
+            changes["moneySpent"] = -amount
+        try:
+            await walletLedger.record(recordType, {userId: changes}, cause, sourceId=sourceId, amount=abs(amount))
+        except Exception:
+            log.exception("Snekcoin updateWallet: Failed to record wallet change.")
+
+
+    @staticmethod
+    def bumpDay() -> int:
+        """Today's UTC day number, which bump counters are stamped with."""
+        return int(time.time() // 86400)
+
+    @staticmethod
+    def bumpsToday(wallet: Dict[str, int]) -> int:
+        """Times a wallet's owner bumped today; a counter stamped with an earlier day counts as zero."""
+        return wallet.get("timesBumped", 0) if wallet.get("bumpDay") == Snekcoin.bumpDay() else 0
 
-        if walletType == "money":
-            userWallet["money"] += amount
-            if amount < 0:
-                userWallet["moneySpent"] -= amount
+    @staticmethod
+    async def recordBump(userId: int, award: int) -> bool:
+        """Counts a /bump as one ledger record, with the award if it is one of the user's first MAX_BUMPS today.
 
-        elif walletType in {"timesCommended", "sentCommendations", "timesBumped"}:
-            if userWallet.get(walletType) is None:
-                userWallet[walletType] = 0
-            userWallet[walletType] += amount
+        Parameters:
+        userId (int): The user ID.
+        award (int): SnekCoins to award.
 
-        wallets[userIdStr] = userWallet
+        Returns:
+        bool: Whether the award was given.
+        """
+        awarded = False
+
+        def bumpChanges(wallets: dict) -> Dict[int, Dict[str, int]]:
+            nonlocal awarded
+            wallet = wallets.get(str(userId), {})
+            bumpsToday = Snekcoin.bumpsToday(wallet)
+            awarded = bumpsToday < MAX_BUMPS
+            # Restamp the counter with today; as deltas, so replaying the ledger gives the same result
+            changes = {"timesBumped": bumpsToday + 1 - wallet.get("timesBumped", 0), "bumpDay": Snekcoin.bumpDay() - wallet.get("bumpDay", 0)}
+            if awarded:
+                changes["money"] = award
+            return {userId: changes}
 
         try:
-            with open(WALLETS_FILE, "w") as f:
-                json.dump(wallets, f, indent=4)
+            await walletLedger.record("bump", bumpChanges, "/bump", sourceId=userId, amount=award)
         except Exception:
-            log.exception("Snekcoin updateWallet: Failed to save wallets file.")
+            log.exception("Snekcoin recordBump: Failed to record wallet change.")
+            return False
+        return awarded
 
 
     @staticmethod
-    async def gambleCoinFlip(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool, int]:
+    async def transfer(debits: Dict[int, int], credits: Dict[int, int], recordType: str, cause: str, sourceId: int | None = None, overdraftIds: Iterable[int] = ()) -> bool:
+        """Moves money between wallets as one ledger record: all of it, or none of it if a debit would overdraw a wallet.
+
+        Amounts are non-negative; coins debited count towards the wallet's moneySpent. The
+        debits and credits need not balance, e.g. payday only credits.
+
+        Parameters:
+        debits (Dict[int, int]): Amount taken per user ID.
+        credits (Dict[int, int]): Amount given per user ID.
+        recordType (str): Ledger record type, e.g. "gamble".
+        cause (str): The command or interaction behind the transfer, for the ledger.
+        sourceId (int | None): Member who made the transfer; None for the bot itself.
+        overdraftIds (Iterable[int]): User IDs allowed to go below zero, e.g. the house.
+
+        Returns:
+        bool: True if applied, False if rejected for an overdraft.
+        """
+        netChanges: Dict[str, int] = {}
+        for userId, amount in debits.items():
+            netChanges[str(userId)] = netChanges.get(str(userId), 0) - amount
+        for userId, amount in credits.items():
+            netChanges[str(userId)] = netChanges.get(str(userId), 0) + amount
+        overdraftIdStrs = {str(userId) for userId in overdraftIds}
+
+        def canCover(wallets: dict) -> bool:
+            for userIdStr, netChange in netChanges.items():
+                if netChange < 0 and userIdStr not in overdraftIdStrs and wallets.get(userIdStr, {}).get("money", 0) + netChange < 0:
+                    log.info(f"Snekcoin transfer: Rejected, {userIdStr} can't cover {-netChange}")
+                    return False
+            return True
+
+        changes = {userIdStr: {"money": netChange, "moneySpent": max(-netChange, 0)} for userIdStr, netChange in netChanges.items()}
+        # Checked under the ledger lock, so a rejected transfer leaves no trace
+        return await walletLedger.record(recordType, changes, cause, sourceId=sourceId, amount=max(sum(debits.values()), sum(credits.values())), check=canCover)
+
+
+    @staticmethod
+    async def gambleCoinFlip(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool, int] | None:
         """Gamble a coin flip.
         payout = 1.5 * gambleAmount
 
@@ -130,22 +274,19 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         Returns:
         bool: True if the user wins, False otherwise.
         int: The payout amount.
+        None if the user can't cover the bet.
         """
-        results = random() < 0.62 # ~7% house edge with 1.5x payout
-        payout = round(0.5 * gambleAmount)
+        results, payout = playCoinFlip(gambleAmount)
         if results:
-            await Snekcoin.updateWallet(userId, "money", payout)
-            await Snekcoin.updateWallet(houseId, "money", -payout)
-
-        if not results:
-            await Snekcoin.updateWallet(userId, "money", -gambleAmount)
-            await Snekcoin.updateWallet(houseId, "money", gambleAmount)
+            await Snekcoin.transfer({houseId: payout}, {userId: payout}, "gamble", "/snekcoin gamble coin flip", sourceId=userId, overdraftIds=(houseId,))
+        elif not await Snekcoin.transfer({userId: gambleAmount}, {houseId: gambleAmount}, "gamble", "/snekcoin gamble coin flip", sourceId=userId):
+            return None
 
         return results, payout
 
 
     @staticmethod
-    async def gambleDiceRoll(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool | None, int, int, int]:
+    async def gambleDiceRoll(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool | None, int, int, int] | None:
         """Gamble a dice roll.
         payout = 1.9 * gambleAmount
 
@@ -158,31 +299,23 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         int: The user's roll.
         int: The bot's roll.
         int: The winnings amount.
+        None if the user can't cover the bet.
         """
-        casinoEdge = True if random() < 0.0358 else False # ~7% casino edge with 1.9x payout
-        userRoll = randint(1, 6)
-        botRoll = randint(1, 6)
-        winnings = round(0.9 * gambleAmount)
-        if casinoEdge:
-            botRoll = 6
-
-        results = None if userRoll == botRoll else userRoll > botRoll
+        results, userRoll, botRoll, winnings = playDiceRoll(gambleAmount)
         if results:
-            await Snekcoin.updateWallet(userId, "money", winnings)
-            await Snekcoin.updateWallet(houseId, "money", -winnings)
+            await Snekcoin.transfer({houseId: winnings}, {userId: winnings}, "gamble", "/snekcoin gamble dice roll", sourceId=userId, overdraftIds=(houseId,))
             return results, userRoll, botRoll, winnings
 
         if results is None:
             return results, userRoll, botRoll, winnings
 
-        if not results:
-            await Snekcoin.updateWallet(userId, "money", -gambleAmount)
-            await Snekcoin.updateWallet(houseId, "money", gambleAmount)
+        if not await Snekcoin.transfer({userId: gambleAmount}, {houseId: gambleAmount}, "gamble", "/snekcoin gamble dice roll", sourceId=userId):
+            return None
 
         return results, userRoll, botRoll, winnings
 
     @staticmethod
-    async def gambleSlots(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool, List[str], int]:
+    async def gambleSlots(userId: int, gambleAmount: int, houseId: int) -> Tuple[bool, List[str], int] | None:
         """Gamble a slots game.
 
         Parameters:
@@ -193,34 +326,15 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         bool: True if the user wins, False otherwise.
         List[str]: The reels that were spun.
         int: The winnings amount.
+        None if the user can't cover the bet.
         """
-        symbolData = {
-            "🍒": {"weight": 0.6, "payout": 3.2},
-            "🍋": {"weight": 0.15, "payout": 3.2},
-            "🔔": {"weight": 0.08, "payout": 3.2},
-            "⭐": {"weight": 0.06, "payout": 3.2},
-            "💎": {"weight": 0.1, "payout": 7},
-            "7️⃣": {"weight": 0.01, "payout": 25},
-        }
-
-        symbols = list(symbolData.keys())
-        weights = [symbolData[symbol]["weight"] for symbol in symbols]
-
-        reel1 = choices(symbols, weights=weights, k=1)[0]
-        reel2 = choices(symbols, weights=weights, k=1)[0]
-        reel3 = choices(symbols, weights=weights, k=1)[0]
-        reels = [reel1, reel2, reel3]
-
-        # Determine winnings
-        if reel1 == reel2 == reel3:
-            payoutMultiplier = symbolData[reel1]["payout"]
-            winnings = gambleAmount * payoutMultiplier
-            await Snekcoin.updateWallet(userId, "money", round(winnings))
-            await Snekcoin.updateWallet(houseId, "money", -round(winnings))
+        winner, reels, winnings = playSlots(gambleAmount)
+        if winner:
+            await Snekcoin.transfer({houseId: winnings}, {userId: winnings}, "gamble", "/snekcoin gamble slots", sourceId=userId, overdraftIds=(houseId,))
             return True, reels, winnings
+        elif not await Snekcoin.transfer({userId: gambleAmount}, {houseId: gambleAmount}, "gamble", "/snekcoin gamble slots", sourceId=userId):
+            return None
         else:
-            await Snekcoin.updateWallet(userId, "money", -gambleAmount)
-            await Snekcoin.updateWallet(houseId, "money", gambleAmount)
             return False, reels, 0
 
     @staticmethod
@@ -307,49 +421,8 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             log.exception("Snekcoin leaderboard: interaction.guild not discord.Guild")
             return
 
-        try:
-            with open(WALLETS_FILE) as f:
-                wallets = json.load(f)
-        except Exception:
-            wallets = {}
-
-        # Sort wallets by money in descending order
-        wallets = dict(sorted(wallets.items(), key=lambda item: item[1].get("money", 0), reverse=True))
-
-        # Build leaderboard pages as embeds
-        ENTRIES_PER_PAGE = 20
-        embeds = []
-        view = discord.ui.View(timeout=60)
-        embed = discord.Embed(title="🏆 SnekCoin Leaderboard 🏆", color=discord.Color.gold())
-        embed.description = ""
-        count = 1
-        pageEntries = 0
-        userRank: int | None = None
-
-        for user in wallets:
-            member = interaction.guild.get_member(int(user))
-            if member is None:
-                continue
-            if wallets[user].get("money", 0) == 0:
-                continue
-            if int(user) == interaction.user.id:
-                userRank = count
-            if pageEntries == ENTRIES_PER_PAGE:
-                embeds.append(embed)
-                embed = discord.Embed(title="🏆 SnekCoin Leaderboard 🏆", color=discord.Color.gold())
-                embed.description = ""
-                pageEntries = 0
-            embed.description += f"{count:,}. **{member.mention}**  •  \N{COIN} {wallets[user].get('money', 0):,}\n"
-            pageEntries += 1
-            count += 1
-        if embed.description:
-            embeds.append(embed)
-        userRankText = f"Your leaderboard rank: #{userRank:,}" if userRank is not None else ""
-        for i, leaderboardEmbed in enumerate(embeds, start=1):
-            footerText = f"Page {i:,}/{len(embeds):,}  •  {userRankText}" if len(embeds) > 1 else userRankText
-            leaderboardEmbed.set_footer(text=footerText)
-
-        if not embeds:
+        leaderboardIndex.refresh(interaction.guild)
+        if leaderboardIndex.pageCount() == 0:
             await interaction.response.send_message(
                 embed=discord.Embed(color=discord.Color.red(), title="🏆 SnekCoin Leaderboard 🏆", description="No leaderboard entries yet."),
                 ephemeral=True,
@@ -357,12 +430,39 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             )
             return
 
-        if len(embeds) > 1:
-            view.add_item(SnekcoinButton(label="Previous", style=discord.ButtonStyle.primary, custom_id=f"snekcoin_button_leaderboardPrevious_{interaction.user.id}"))
-            view.add_item(SnekcoinButton(label="Next", style=discord.ButtonStyle.primary, custom_id=f"snekcoin_button_leaderboardNext_{interaction.user.id}"))
-            SnekcoinButton.leaderboardEmbeds = embeds
-            SnekcoinButton.leaderboardCurrentPage = 0
-        await interaction.response.send_message(embed=embeds[0], view=view, ephemeral=True, delete_after=60.0)
+        embed, view = Snekcoin.leaderboardPage(interaction.guild, interaction.user.id, 0)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True, delete_after=60.0)
+
+    @staticmethod
+    def leaderboardPage(guild: discord.Guild, viewerId: int, page: int) -> Tuple[discord.Embed, discord.ui.View]:
+        """Renders one leaderboard page, with buttons that carry the pages either side in their custom_id.
+
+        Parameters:
+        guild (discord.Guild): The Discord guild.
+        viewerId (int): Member viewing the leaderboard, for their rank.
+        page (int): Page to render, counting from 0; wraps around.
+
+        Returns:
+        Tuple[discord.Embed, discord.ui.View]: The page and its buttons.
+        """
+        leaderboardIndex.refresh(guild)
+        pageCount = max(leaderboardIndex.pageCount(), 1)
+        page %= pageCount
+
+        embed = discord.Embed(title="🏆 SnekCoin Leaderboard 🏆", color=discord.Color.gold())
+        embed.description = ""
+        for rank, userId, money in leaderboardIndex.page(page):
+            embed.description += f"{rank:,}. **<@{userId}>**  •  \N{COIN} {money:,}\n"
+
+        viewerRank = leaderboardIndex.rank(viewerId)
+        userRankText = f"Your leaderboard rank: #{viewerRank:,}" if viewerRank is not None else ""
+        embed.set_footer(text=f"Page {page + 1:,}/{pageCount:,}  •  {userRankText}" if pageCount > 1 else userRankText)
+
+        view = discord.ui.View(timeout=60)
+        if pageCount > 1:
+            view.add_item(SnekcoinButton(label="Previous", style=discord.ButtonStyle.primary, custom_id=f"snekcoin_button_leaderboardPage_{viewerId}_{(page - 1) % pageCount}_previous"))
+            view.add_item(SnekcoinButton(label="Next", style=discord.ButtonStyle.primary, custom_id=f"snekcoin_button_leaderboardPage_{viewerId}_{(page + 1) % pageCount}_next"))
+        return embed, view
 
 
     @discord.app_commands.command(name="payday")
@@ -404,8 +504,8 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Invalid selection", description="Actual cannot be a bot!"), ephemeral=True, delete_after=15.0)
             return
 
-        await Snekcoin.updateWallet(interaction.user.id, "money", zeusPay)
-        await Snekcoin.updateWallet(actual.id, "money", actualPay)
+        payments = {interaction.user.id: zeusPay}
+        payments[actual.id] = payments.get(actual.id, 0) + actualPay  # Zeus may also be Actual
         paidTLs = {}
         skippedTls = {}
 
@@ -433,9 +533,12 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
                     skippedTls[tl.display_name] = "TL has already been paid"
                     continue
                 tlPay = randint(50, 100)
-                await Snekcoin.updateWallet(tl.id, "money", tlPay)
+                payments[tl.id] = payments.get(tl.id, 0) + tlPay
                 paidTLs[tl.mention] = tlPay
 
+        # Everyone is paid in one transaction
+        await Snekcoin.transfer({}, payments, "payday", "/snekcoin payday", sourceId=interaction.user.id)
+
         # Build and send payday summary embed
         embed = discord.Embed(title="💰 Payday Processed 💰", color=discord.Color.gold())
         embed.add_field(name="Zeus", value=f"{interaction.user.mention} hosted the Operation and was paid 🪙 {zeusPay:,} SnekCoins.", inline=False)
@@ -515,31 +618,16 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             await ctx.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Invalid amount", description="Amount must be a positive integer."))
             return
 
+        operationText = "added to" if addRemove in responses["add"] else "removed from"
+        # Same fields as updateWallet: removed SnekCoins count as spent
+        changes = {"money": amount} if addRemove in responses["add"] else {"money": -amount, "moneySpent": amount}
         try:
-            with open(WALLETS_FILE) as f:
-                wallets = json.load(f)
-        except FileNotFoundError:
-            wallets = {}
+            await walletLedger.record("staffEdit", {member.id: changes}, "changesnekcoins", sourceId=ctx.author.id, amount=amount)
         except Exception:
-            await ctx.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Failed to load wallets file."))
-            log.exception("Snekcoin changeSnekCoins: Failed to load wallets file.")
+            await ctx.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Failed to record the wallet change."))
+            log.exception("Snekcoin changeSnekCoins: Failed to record wallet change.")
             return
 
-        targetEntry = wallets.get(str(member.id), DEFAULT_WALLET.copy())
-        if addRemove in responses["add"]:
-            targetEntry["money"] = int(targetEntry.get("money", 0)) + amount
-            operationText = "added to"
-        else:
-            targetEntry["money"] = int(targetEntry.get("money", 0)) - amount
-            operationText = "removed from"
-
-        wallets[str(member.id)] = targetEntry
-        try:
-            with open(WALLETS_FILE, "w") as f:
-                json.dump(wallets, f, indent=4)
-        except Exception:
-            log.warning("Snekcoin changeSnekCoins: Failed to save wallets file.")
-
         await ctx.send(embed=discord.Embed(color=discord.Color.green(), title="✅ Wallet updated", description=f"`{amount:,}` SnekCoins have been {operationText} {member.display_name}'s wallet."))
 
         auditLogs = self.bot.get_channel(AUDIT_LOGS)
@@ -577,8 +665,9 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             await ctx.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Invalid amount", description="Amount must be a positive integer."))
             return
 
-        await Snekcoin.updateWallet(fromMember.id, "money", -amount)
-        await Snekcoin.updateWallet(toMember.id, "money", amount)
+        if not await Snekcoin.transfer({fromMember.id: amount}, {toMember.id: amount}, "trade", "tradesnekcoins", sourceId=ctx.author.id):
+            await ctx.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description=f"{fromMember.display_name} does not have `{amount:,}` SnekCoins."))
+            return
 
         await ctx.send(embed=discord.Embed(color=discord.Color.green(), title="✅ Trade complete", description=f"`{amount:,}` SnekCoins have been traded from {fromMember.display_name} to {toMember.display_name}."))
 
@@ -594,6 +683,39 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
         await auditLogs.send(embed=embed)
 
 
+    @commands.command(name="snekcoinhistory")
+    @commands.has_any_role(*CMD_LIMIT_STAFF)
+    async def snekCoinHistory(self, ctx: commands.Context, member: discord.Member, limit: int = 25) -> None:
+        """Lists a member's latest SnekCoin wallet changes from the ledger.
+
+        Parameters:
+        ctx (commands.Context): The command context.
+        member (discord.Member): Target member.
+        limit (int): Most changes to list.
+
+        Returns:
+        None.
+        """
+        log.info(f"{ctx.author.id} [{ctx.author.display_name}] Queries SnekCoin history of {member.id} [{member.display_name}]")
+        records = await runIO(walletLedger.history, member.id, None, max(1, min(limit, 100)))
+        if not records:
+            await ctx.send(embed=discord.Embed(color=discord.Color.orange(), title="No SnekCoin history", description=f"No wallet changes recorded for {member.display_name}."))
+            return
+
+        lines = []
+        for record in records:
+            moneyChange = record["changes"].get(str(member.id), {}).get("money", 0)
+            source = f"<@{record['sourceId']}>" if record.get("sourceId") is not None else "Snek"
+            lines.append(f"{discord.utils.format_dt(Utils.fromEpoch(record['time']), style='f')} `{record['type']}` {moneyChange:+,} 🪙 • {source} via `{record['cause']}`")
+
+        description = ""
+        for line in lines:
+            if len(description) + len(line) + 1 > 4096:
+                break
+            description += line + "\n"
+        await ctx.send(embed=discord.Embed(color=discord.Color.gold(), title=f"🪙 SnekCoin history of {member.display_name} 🪙", description=description))
+
+
     @discord.app_commands.command(name="gift")
     @discord.app_commands.describe(user="User to gift SnekCoins to.", amount="Amount of SnekCoins to gift.", comment="Optional message to include with the gift.")
     async def gift(self, interaction: discord.Interaction, user: discord.Member, amount: int, comment: discord.app_commands.Range[str, 1, 200] | None = None) -> None:
@@ -627,8 +749,10 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
             await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description=f"You do not have enough SnekCoins to gift that amount!\nWallet balance: `{senderWallet['money']:,}` SnekCoins"), ephemeral=True, delete_after=15.0)
             return
 
-        await Snekcoin.updateWallet(interaction.user.id, "money", -amount)
-        await Snekcoin.updateWallet(user.id, "money", amount)
+        # Checked again in the transfer, as the balance may have changed since
+        if not await Snekcoin.transfer({interaction.user.id: amount}, {user.id: amount}, "gift", "/snekcoin gift", sourceId=interaction.user.id):
+            await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description="You do not have enough SnekCoins to gift that amount!"), ephemeral=True, delete_after=15.0)
+            return
 
         embed = discord.Embed(
             color=discord.Color.gold(),
@@ -667,26 +791,6 @@ class Snekcoin(commands.GroupCog, name = "snekcoin"):
 class SnekcoinButton(discord.ui.Button):
     """Handling all snekcoin buttons."""
 
-    @staticmethod
-    async def showLeaderboardPage(interaction: discord.Interaction, pageDelta: int) -> None:
-        """Update the leaderboard page"""
-        if not SnekcoinButton.leaderboardEmbeds:
-            log.warning("SnekcoinButton showLeaderboardPage: No embeds found for leaderboard")
-            if not interaction.response.is_done():
-                await interaction.response.send_message(
-                    embed=discord.Embed(color=discord.Color.red(), title="Leaderboard expired", description="Please run `/snekcoin leaderboard` again."),
-                    ephemeral=True,
-                    delete_after=15.0,
-                )
-            return
-
-        SnekcoinButton.leaderboardCurrentPage = (SnekcoinButton.leaderboardCurrentPage + pageDelta) % len(SnekcoinButton.leaderboardEmbeds)
-
-        try:
-            await interaction.response.edit_message(embed=SnekcoinButton.leaderboardEmbeds[SnekcoinButton.leaderboardCurrentPage])
-        except discord.NotFound:
-            log.warning("SnekcoinButton showLeaderboardPage: Leaderboard message no longer exists.")
-
     async def callback(self, interaction: discord.Interaction):
         if not isinstance(interaction.user, discord.Member):
             log.exception("GambleButton callback: interaction.user not discord.Member")
@@ -714,13 +818,13 @@ class SnekcoinButton(discord.ui.Button):
                 await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not retrieve your wallet data."), ephemeral=True, delete_after=15.0)
                 return
 
-            if userWallet["timesBumped"] >= MAX_BUMPS:
+            if Snekcoin.bumpsToday(userWallet) >= MAX_BUMPS:
                 await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Bump Bonus Unavailable", description=f"You have already received the maximum of {MAX_BUMPS:,} bump bonuses today."), ephemeral=True, delete_after=15.0)
                 return
 
             award = randint(10, 100)
             await interaction.message.delete()
-            await Snekcoin.updateWallet(interaction.user.id, "money", award)
+            await Snekcoin.updateWallet(interaction.user.id, "money", award, "bumpBonus", "Claim Bump Bonus button", sourceId=interaction.user.id)
             embed = discord.Embed(
                 color=discord.Color.green(),
                 title="✅ Bonus Awarded",
@@ -767,7 +871,11 @@ class SnekcoinButton(discord.ui.Button):
                 await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not resolve bot account."), ephemeral=True, delete_after=15.0)
                 return
 
-            winner, reels, winnings = await Snekcoin.gambleSlots(interaction.user.id, 50, interaction.client.user.id)
+            result = await Snekcoin.gambleSlots(interaction.user.id, 50, interaction.client.user.id)
+            if result is None:
+                await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description="You need at least **50** SnekCoins to play Slots!"), ephemeral=True, delete_after=15.0)
+                return
+            winner, reels, winnings = result
             userWallet = await Snekcoin.getWallet(interaction.user.id)
             if userWallet is None:
                 await interaction.response.send_message(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not retrieve your wallet data."), ephemeral=True, delete_after=15.0)
@@ -794,10 +902,14 @@ class SnekcoinButton(discord.ui.Button):
             await interaction.response.send_message(embed=menuEmbed, view=menuView, ephemeral=True)
             await interaction.followup.send(embed=embed, ephemeral=False)
 
-        if customId.startswith("snekcoin_button_leaderboardPrevious"):
-            await SnekcoinButton.showLeaderboardPage(interaction, -1)
-        if customId.startswith("snekcoin_button_leaderboardNext"):
-            await SnekcoinButton.showLeaderboardPage(interaction, 1)
+        if customId.startswith("snekcoin_button_leaderboardPage_"):
+            # The page to show is in the custom_id, so every leaderboard message pages on its own
+            viewerId, page = int(customId.split("_")[3]), int(customId.split("_")[4])
+            embed, view = Snekcoin.leaderboardPage(interaction.guild, viewerId, page)
+            try:
+                await interaction.response.edit_message(embed=embed, view=view)
+            except discord.NotFound:
+                log.warning("SnekcoinButton callback: Leaderboard message no longer exists.")
 
 
 class SnekcoinModal(discord.ui.Modal):
@@ -852,7 +964,11 @@ class SnekcoinModal(discord.ui.Modal):
                 await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not resolve bot account."), ephemeral=True)
                 return
 
-            winner, payout = await Snekcoin.gambleCoinFlip(self.userId, amount, interaction.client.user.id)
+            result = await Snekcoin.gambleCoinFlip(self.userId, amount, interaction.client.user.id)
+            if result is None:
+                await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description="You do not have enough SnekCoins to gamble that amount!"), ephemeral=True)
+                return
+            winner, payout = result
             userWallet = await Snekcoin.getWallet(interaction.user.id)
             if userWallet is None:
                 await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not retrieve your wallet data."), ephemeral=True)
@@ -892,7 +1008,11 @@ class SnekcoinModal(discord.ui.Modal):
                 await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not resolve bot account."), ephemeral=True)
                 return
 
-            winner, userRoll, botRoll, winnings = await Snekcoin.gambleDiceRoll(self.userId, amount, interaction.client.user.id)
+            result = await Snekcoin.gambleDiceRoll(self.userId, amount, interaction.client.user.id)
+            if result is None:
+                await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Insufficient funds", description="You do not have enough SnekCoins to gamble that amount!"), ephemeral=True)
+                return
+            winner, userRoll, botRoll, winnings = result
             userWallet = await Snekcoin.getWallet(interaction.user.id)
             if userWallet is None:
                 await interaction.followup.send(embed=discord.Embed(color=discord.Color.red(), title="❌ Failed", description="Could not retrieve your wallet data."), ephemeral=True)
@@ -7,6 +7,8 @@ from google.oauth2.service_account import Credentials
 from typing import List
 
 import secret
+from executors import runIO  # type: ignore
+from metrics import Metrics  # type: ignore
 from constants import *
 if secret.DEBUG:
     from constants.debug import *
@@ -187,18 +189,20 @@ class Spreadsheet(commands.Cog):
         ]], f"B{rowNum}")
 
     @tasks.loop(hours=6)
+    @Metrics.timedTask
     async def kickTaggedMembers(self) -> None:
         guild = self.bot.get_guild(GUILD_ID)
         if guild is None:
             log.exception("Spreadsheet kickTaggedMembers: guild is none")
             return
 
-        worksheet = Spreadsheet.getWorksheet()
+        # gspread is blocking; Google API calls go through the I/O pool
+        worksheet = await runIO(Spreadsheet.getWorksheet)
         if not worksheet:
             return
 
-        columnUserIds = worksheet.col_values(Spreadsheet.WORKSHEET_COLUMNS["userId"])[Spreadsheet.ROW_STARTING_INDEX - 1:]
-        columnPositions = worksheet.col_values(Spreadsheet.WORKSHEET_COLUMNS["position"])[Spreadsheet.ROW_STARTING_INDEX - 1:]
+        columnUserIds = (await runIO(worksheet.col_values, Spreadsheet.WORKSHEET_COLUMNS["userId"]))[Spreadsheet.ROW_STARTING_INDEX - 1:]
+        columnPositions = (await runIO(worksheet.col_values, Spreadsheet.WORKSHEET_COLUMNS["position"]))[Spreadsheet.ROW_STARTING_INDEX - 1:]
 
         rowsToDelete = []
         for userId, userPosition in zip(columnUserIds, columnPositions):
@@ -223,7 +227,7 @@ class Spreadsheet(commands.Cog):
             rowsToDelete.append(Spreadsheet.ROW_STARTING_INDEX + columnUserIds.index(userId))
 
         for row in sorted(rowsToDelete, reverse=True):
-            worksheet.update([["", "", "", "", "", "", "Unknown", "", "", "", ""]], f"B{row}")
+            await runIO(worksheet.update, [["", "", "", "", "", "", "Unknown", "", "", "", ""]], f"B{row}")
 
 
 async def setup(bot: commands.Bot) -> None:
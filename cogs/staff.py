@@ -1,4 +1,4 @@
-import re, json, os, discord, logging
+import re, os, discord, logging
 from html import unescape
 
 from datetime import datetime, timezone
@@ -7,6 +7,9 @@ from unidecode import unidecode
 from textwrap import wrap
 
 from utils import Utils
+from storage import store, workshopHosts
+from directMessages import dmDispatcher
+from candidateLedger import candidateLedger
 from secret import DEBUG
 from constants import *
 if DEBUG:
@@ -481,20 +484,17 @@ class Staff(commands.Cog):
 
         log.info(f"{ctx.author.id} [{ctx.author.display_name}] Added {targetMember.id} [{targetMember.display_name}] to role reservation blacklist")
 
-        with open(ROLE_RESERVATION_BLACKLIST_FILE) as f:
-            blacklist = json.load(f)
-        if all(member["id"] != targetMember.id for member in blacklist):
-            blacklist.append({"id": targetMember.id, "name": targetMember.display_name, "timestamp": datetime.now().timestamp(), "staffId": ctx.author.id, "staffName": ctx.author.display_name})
-            with open(ROLE_RESERVATION_BLACKLIST_FILE, "w") as f:
-                json.dump(blacklist, f, indent=4)
-            with open(EVENTS_FILE) as f:
-                events = json.load(f)
-            for event in events:
-                for reservableRole in event["reservableRoles"]:
-                    if event["reservableRoles"][reservableRole] == targetMember.id:
-                        event["reservableRoles"][reservableRole] = None
-            with open(EVENTS_FILE, "w") as f:
-                json.dump(events, f, indent=4)
+        async with store.transaction(ROLE_RESERVATION_BLACKLIST_FILE) as blacklist:
+            isNewEntry = all(member["id"] != targetMember.id for member in blacklist)
+            if isNewEntry:
+                blacklist.append({"id": targetMember.id, "name": targetMember.display_name, "timestamp": datetime.now().timestamp(), "staffId": ctx.author.id, "staffName": ctx.author.display_name})
+
+        if isNewEntry:
+            async with store.transaction(EVENTS_FILE) as events:
+                for event in events:
+                    for reservableRole in event["reservableRoles"] or {}:
+                        if event["reservableRoles"][reservableRole] == targetMember.id:
+                            event["reservableRoles"][reservableRole] = None
             await self.bot.get_cog("Schedule").updateSchedule(guild)
 
         embed = discord.Embed(title="✅ Member blacklisted", description=f"{targetMember.mention} is no longer allowed to reserve roles!", color=discord.Color.green())
@@ -522,14 +522,10 @@ class Staff(commands.Cog):
 
         log.info(f"{ctx.author.id} [{ctx.author.display_name}] Removed {targetMember.id} [{targetMember.display_name}] from role reservation blacklist")
 
-        with open(ROLE_RESERVATION_BLACKLIST_FILE) as f:
-            blacklist = json.load(f)
-        removedMembers = [member for member in blacklist if member["id"] == targetMember.id]
-        for member in removedMembers:
-            blacklist.remove(member)
-        if removedMembers:
-            with open(ROLE_RESERVATION_BLACKLIST_FILE, "w") as f:
-                json.dump(blacklist, f, indent=4)
+        async with store.transaction(ROLE_RESERVATION_BLACKLIST_FILE) as blacklist:
+            removedMembers = [member for member in blacklist if member["id"] == targetMember.id]
+            for member in removedMembers:
+                blacklist.remove(member)
 
         embed = discord.Embed(title="✅ Member removed from blacklist", description=f"{targetMember.mention} is now allowed to reserve roles!", color=discord.Color.green())
         embed.set_footer(text=f"ID: {targetMember.id}")
@@ -548,6 +544,86 @@ class Staff(commands.Cog):
         from cogs.botTasks import BotTasks
         await BotTasks.smeBigBrother(guild, True)
 
+    @commands.command(name="backfillcandidateledger")
+    @commands.has_any_role(*CMD_LIMIT_STAFF)
+    async def backfillCandidateLedger(self, ctx: commands.Context) -> None:
+        """Fill the candidate notification ledger from the Recruitment & HR history, once."""
+        if not isinstance(ctx.guild, discord.Guild):
+            log.exception("Staff backfillcandidateledger: ctx.guild not discord.Guild")
+            return
+
+        channelRecruitmentAndHR = ctx.guild.get_channel(RECRUITMENT_AND_HR)
+        if not isinstance(channelRecruitmentAndHR, discord.TextChannel):
+            log.exception("Staff backfillcandidateledger: channelRecruitmentAndHR not discord.TextChannel")
+            return
+
+        log.info(f"{ctx.author.id} [{ctx.author.display_name}] Backfills the candidate notification ledger")
+        await ctx.send(embed=discord.Embed(title="Backfilling candidate ledger", description=f"Reading {channelRecruitmentAndHR.mention}, this may take a while.", color=discord.Color.orange()))
+
+        # Old accept notices only name the operation; match them to scheduled events by title
+        eventIdsByTitle: dict[str, list[str]] = {}
+        for event in store.get(EVENTS_FILE):
+            eventIdsByTitle.setdefault(event["title"], []).append(event["eventId"])
+
+        acceptCount = denialCount = 0
+        async for message in channelRecruitmentAndHR.history(limit=None, oldest_first=True):
+            if message.author.id not in FRIENDLY_SNEKS or not message.embeds:
+                continue
+            embed = message.embeds[0]
+            footer = embed.footer.text or ""
+            if embed.title == "Candidate Accept" and (candidateMatch := re.match(r"Candidate ID: (\d+)", footer)) and (titleMatch := re.search(r"`(.+?)`", embed.description or "")):
+                for eventId in eventIdsByTitle.get(titleMatch.group(1), []):
+                    acceptCount += candidateLedger.claimAcceptNotice(int(candidateMatch.group(1)), eventId)
+            elif embed.title == "❌ Prospect denied" and (prospectMatch := re.match(r"Prospect ID: (\d+)", footer)):
+                if not candidateLedger.isDenied(int(prospectMatch.group(1))):
+                    candidateLedger.recordDenial(int(prospectMatch.group(1)), message.created_at.timestamp())
+                    denialCount += 1
+
+        for record in Recruitment._loadRecruitmentHistory():
+            if record.get("eventType") == "denied" and isinstance(record.get("memberId"), int) and not candidateLedger.isDenied(record["memberId"]):
+                candidateLedger.recordDenial(record["memberId"], Recruitment._getRecruitmentRecordTimestamp(record).timestamp())
+                denialCount += 1
+
+        embed = discord.Embed(title="✅ Candidate ledger backfilled", description=f"Accept notices added: `{acceptCount}`\nDenials added: `{denialCount}`", color=discord.Color.green())
+        embed.set_footer(text=f"Run by: {ctx.author}")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="workshophosts")
+    @commands.has_any_role(*CMD_LIMIT_STAFF)
+    async def workshopHostQuery(self, ctx: commands.Context, since: str = commands.parameter(description="Start date (YYYY-MM-DD, UTC)"), *, workshop: str | None = commands.parameter(default=None, description="Workshop name, all workshops if left out")) -> None:
+        """List who hosted which workshops since a date."""
+        if not isinstance(ctx.guild, discord.Guild):
+            log.exception("Staff workshophosts: ctx.guild not discord.Guild")
+            return
+
+        try:
+            sinceTime = datetime.strptime(since, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            await ctx.send(embed=discord.Embed(title="❌ Invalid date", description=f"Expected `YYYY-MM-DD`, got `{since}`.", color=discord.Color.red()))
+            return
+
+        workshopName = None
+        if workshop is not None:
+            from cogs.workshopInterest import WORKSHOP_INTEREST_LIST
+            workshopName = next((name for name in WORKSHOP_INTEREST_LIST if name.lower() == workshop.lower()), None)
+            if workshopName is None:
+                await ctx.send(embed=discord.Embed(title="❌ Invalid workshop name", description=f"Could not find workshop '{workshop}'.", color=discord.Color.red()))
+                return
+
+        log.info(f"{ctx.author.id} [{ctx.author.display_name}] Queries workshop hosts since {since}" + (f" for '{workshopName}'" if workshopName is not None else ""))
+        hostsPerWorkshop: dict[str, list[str]] = {}
+        for (hostedWorkshopName, authorId), hostTimes in sorted(workshopHosts.hostedSince(int(sinceTime.timestamp()), workshopName).items(), key=lambda item: (item[0][0], -len(item[1]))):
+            host = ctx.guild.get_member(authorId)
+            hostsPerWorkshop.setdefault(hostedWorkshopName, []).append(f"{host.mention if host is not None else f'`{authorId}`'}: {len(hostTimes)}, last {discord.utils.format_dt(Utils.fromEpoch(hostTimes[-1]), style='R')}")
+
+        if len(hostsPerWorkshop) == 0:
+            await ctx.send(embed=discord.Embed(title="No workshops hosted", description=f"Nothing hosted since {discord.utils.format_dt(sinceTime, style='D')}.", color=discord.Color.orange()))
+            return
+
+        embeds = [discord.Embed(title=f"{hostedWorkshopName} hosts since {since}", description="\n".join(lines)[:4096], color=discord.Color.gold()) for hostedWorkshopName, lines in hostsPerWorkshop.items()]
+        for i in range(0, len(embeds), 10):
+            await ctx.send(embeds=embeds[i:i + 10])
+
     @discord.app_commands.command(name="ban")
     @discord.app_commands.describe(
         user="Target user to be banned (by mention, ID, or username).",
@@ -876,11 +952,9 @@ class Staff(commands.Cog):
         modpackIds = [int(id) for id in re.findall(r"(?<=\"https:\/\/steamcommunity\.com\/sharedfiles\/filedetails\/\?id=)\d+", html)]
 
         # Save output
-        with open(GENERIC_DATA_FILE) as f:
-            genericData = json.load(f)
+        genericData = store.get(GENERIC_DATA_FILE)
         genericData["modpackIds"] = modpackIds
-        with open(GENERIC_DATA_FILE, "w") as f:
-            json.dump(genericData, f, indent=4)
+        store.set(GENERIC_DATA_FILE, genericData)
 
         # Optionally send
         if sendtoserverinfo:
@@ -966,8 +1040,7 @@ class Recruitment(commands.GroupCog, name="recruitment"):
     @staticmethod
     def _loadRecruitmentHistory() -> list[dict]:
         try:
-            with open(RECRUITMENT_HISTORY_FILE) as f:
-                history = json.load(f)
+            history = store.get(RECRUITMENT_HISTORY_FILE)
         except FileNotFoundError:
             return []
         except Exception:
@@ -989,8 +1062,7 @@ class Recruitment(commands.GroupCog, name="recruitment"):
             "actorId": actorId,
         })
         try:
-            with open(RECRUITMENT_HISTORY_FILE, "w") as f:
-                json.dump(history, f, indent=4)
+            store.set(RECRUITMENT_HISTORY_FILE, history)
         except Exception:
             log.exception("Recruitment _appendRecruitmentHistory: failed to save recruitment history")
 
@@ -1123,14 +1195,12 @@ class Recruitment(commands.GroupCog, name="recruitment"):
             return
 
         isAuthorStaff = [True for role in interaction.user.roles if role.id == UNIT_STAFF]
-        async for message in channelRecruitmentAndHR.history(limit=500):
-            if message.embeds and message.embeds[0].title == "❌ Prospect denied" and message.embeds[0].footer.text and message.embeds[0].footer.text == f"Prospect ID: {member.id}":
-                if isAuthorStaff:
-                    embed = discord.Embed(title="⚠️ Prospect denied", description=f"Prospect ({member.mention}) has been denied before. Since you're Unit Staff, you may still continue and override the decision!", color=discord.Color.yellow())
-                    embed.set_footer(text=f"Prospect ID: {member.id}")
-                    await interaction.followup.send(embed=embed, ephemeral=True)
-                    break
-
+        if candidateLedger.isDenied(member.id):
+            if isAuthorStaff:
+                embed = discord.Embed(title="⚠️ Prospect denied", description=f"Prospect ({member.mention}) has been denied before. Since you're Unit Staff, you may still continue and override the decision!", color=discord.Color.yellow())
+                embed.set_footer(text=f"Prospect ID: {member.id}")
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
                 # Not staff, cannot interview denied prospect
                 embed = discord.Embed(title="❌ Prospect denied", description=f"Prospect ({member.mention}) has already been denied. Only Unit Staff may interview denied prospects!", color=discord.Color.red())
                 embed.set_footer(text=f"Prospect ID: {member.id}")
@@ -1233,7 +1303,7 @@ class Recruitment(commands.GroupCog, name="recruitment"):
         await member.add_roles(roleCandidate, reason=f"Added by {interaction.user} via recruitment newcomers command.")
         await member.remove_roles(roleVerified, reason=f"Removed by {interaction.user} via recruitment newcomers command.")
 
-        await Snekcoin.updateWallet(interaction.user.id, "money", bonus)
+        await Snekcoin.updateWallet(interaction.user.id, "money", bonus, "bonus", "/newcomers", sourceId=interaction.user.id)
 
         # Log in audit log
         auditEmbed.set_footer(text=f"User ID: {member.id}")
@@ -1320,7 +1390,7 @@ class StaffButton(discord.ui.Button):
                 return
 
             verifyBonus = randint(20, 50)
-            await Snekcoin.updateWallet(interaction.user.id, "money", verifyBonus)
+            await Snekcoin.updateWallet(interaction.user.id, "money", verifyBonus, "bonus", "interview verify button", sourceId=interaction.user.id)
 
             embed = discord.Embed(title="✅ Member verified", description=f"{member.mention} verified!", color=discord.Color.green())
             embed.add_field(name="Snekcoin Reward", value=f"{interaction.user.mention} has been awarded 🪙 `{verifyBonus}` for interviewing a new member!\nKeep up the good work!", inline=False)
@@ -1360,10 +1430,7 @@ class StaffButton(discord.ui.Button):
                 color=discord.Color.green()
             )
             dmEmbed.set_footer(text="If you have any questions, reach out to the Recruitment Team or Unit Staff!")
-            try:
-                await member.send(embed=dmEmbed)
-            except Exception as e:
-                log.warning(f"Failed to send DM to {member.id} [{member.display_name}] - {e}")
+            dmDispatcher.send(member, "staff_verify_welcome", embed=dmEmbed)
 
 
             # Logging
@@ -1391,7 +1458,7 @@ class StaffButton(discord.ui.Button):
                 return
 
             verifyBonus = randint(20, 50)
-            await Snekcoin.updateWallet(interaction.user.id, "money", verifyBonus)
+            await Snekcoin.updateWallet(interaction.user.id, "money", verifyBonus, "bonus", "interview deny button", sourceId=interaction.user.id)
 
             embed = discord.Embed(title="❌ Prospect denied", description=f"{member.mention} denied", color=discord.Color.red())
             embed.add_field(name="Snekcoin Reward", value=f"You have been awarded 🪙 `{verifyBonus}` for interviewing a new member!\nKeep up the good work!", inline=False)
@@ -1419,6 +1486,7 @@ class StaffButton(discord.ui.Button):
             embed.timestamp = datetime.now()
 
             await channelRecruitmentAndHR.send(roleRecruitmentCoordinator.mention, embed=embed)
+            candidateLedger.recordDenial(member.id, datetime.now(timezone.utc).timestamp())
             Recruitment._appendRecruitmentHistory("denied", member.id, interaction.user.id)
             return
 
@@ -1443,11 +1511,9 @@ class StaffModal(discord.ui.Modal):
         log.info(f"{interaction.user.id} [{interaction.user.display_name}] Updating modpack maps listing")
         value: str = self.children[0].value.strip().split("\n")
 
-        with open(GENERIC_DATA_FILE) as f:
-            genericData = json.load(f)
+        genericData = store.get(GENERIC_DATA_FILE)
         genericData["modpackMaps"] = value
-        with open(GENERIC_DATA_FILE, "w") as f:
-            json.dump(genericData, f, indent=4)
+        store.set(GENERIC_DATA_FILE, genericData)
 
         await interaction.response.send_message(f"Maps updated!", ephemeral=True, delete_after=30.0)
 
@@ -1566,7 +1632,7 @@ class ZiTFeedbackModal(discord.ui.Modal):
             embed=embed
         )
         feedbackBonus = randint(30, 80)
-        await Snekcoin.updateWallet(interaction.user.id, "money", feedbackBonus)
+        await Snekcoin.updateWallet(interaction.user.id, "money", feedbackBonus, "bonus", "ZiT feedback", sourceId=interaction.user.id)
         log.info(f"{interaction.user.id} [{interaction.user.display_name}] Submitted ZiT feedback for {zeusMember.id} [{zeusMember.display_name}]")
         await interaction.response.send_message(f"Thank you for submitting ZiT feedback!\nYou have been awarded \N{COIN} `{feedbackBonus}` SnekCoins for submitting the feedback.", ephemeral=True)
 
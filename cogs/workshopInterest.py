@@ -1,8 +1,11 @@
-import os, json, re, discord, logging
+import os, re, discord, logging
 
 from discord.ext import commands  # type: ignore
 
 from cogs.staff import Staff
+from utils import Utils
+from storage import store
+from metrics import Metrics
 from secret import DEBUG
 from constants import *
 if DEBUG:
@@ -100,24 +103,19 @@ class WorkshopInterest(commands.Cog):
                     "members": [],
                     "messageId": 0
                 }
-            with open(WORKSHOP_INTEREST_FILE, "w") as f:
-                json.dump(workshopInterest, f, indent=4)
+            store.set(WORKSHOP_INTEREST_FILE, workshopInterest)
 
         else:
-            with open(WORKSHOP_INTEREST_FILE) as f:
-                wsIntFile = json.load(f)
-
-            # Mismatch in file/dict
-            mismatches = set(WORKSHOP_INTEREST_LIST) - set(wsIntFile)
-            if mismatches:
-                isUpdateChannel = True
-                for mismatch in mismatches:
-                    wsIntFile[mismatch] = {
-                        "members": [],
-                        "messageId": 0
-                    }
-                with open(WORKSHOP_INTEREST_FILE, "w") as f:
-                    json.dump(wsIntFile, f, indent=4)
+            async with store.transaction(WORKSHOP_INTEREST_FILE) as wsIntFile:
+                # Mismatch in file/dict
+                mismatches = set(WORKSHOP_INTEREST_LIST) - set(wsIntFile)
+                if mismatches:
+                    isUpdateChannel = True
+                    for mismatch in mismatches:
+                        wsIntFile[mismatch] = {
+                            "members": [],
+                            "messageId": 0
+                        }
 
 
         guild = self.bot.get_guild(GUILD_ID)
@@ -150,26 +148,32 @@ class WorkshopInterest(commands.Cog):
             log.exception("WSINT updateChannel: wsIntChannel not discord.TextChannel")
             return
 
-        await wsIntChannel.purge(limit=None, check=lambda message: message.author.id in FRIENDLY_SNEKS)
+        # Delete the known messages by id, plus stray bot messages next to them; only without any known ids walk the whole channel
+        knownMessageIds = sorted({workshopData["messageId"] for workshopData in store.get(WORKSHOP_INTEREST_FILE).values() if isinstance(workshopData.get("messageId"), int) and workshopData["messageId"] != 0})
+        if knownMessageIds:
+            strayMessages = await Utils.fetchNearbyBotMessages(wsIntChannel, before=knownMessageIds[0]) + await Utils.fetchNearbyBotMessages(wsIntChannel, after=knownMessageIds[-1])
+            failedMessageIds = await Utils.deleteMessages(wsIntChannel, knownMessageIds + [message.id for message in strayMessages])
+            if failedMessageIds:
+                log.warning(f"WSINT updateChannel: Failed to delete messages {failedMessageIds}")
+        else:
+            await wsIntChannel.purge(limit=None, check=lambda message: message.author.id in FRIENDLY_SNEKS)
 
         guild = self.bot.get_guild(GUILD_ID)
         if guild is None:
             log.exception("WSINT updateChannel: guild is None")
             return
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            wsIntFile = json.load(f)
-
+        messageIds = {}
         for workshopName in WORKSHOP_INTEREST_LIST.keys():
             # Fetch embed
             embed = self.getWorkshopEmbed(guild, workshopName)
             msg = await wsIntChannel.send(embed=embed, view=WorkshopInterest.getWorkshopView())
+            messageIds[workshopName] = msg.id
 
-            # Set embed messageId - used for removing people once workshop is done
-            wsIntFile[workshopName]["messageId"] = msg.id
-
-        with open(WORKSHOP_INTEREST_FILE, "w", encoding="utf-8") as f:
-            json.dump(wsIntFile, f, indent=4)
+        # Set embed messageId - used for removing people once workshop is done
+        async with store.transaction(WORKSHOP_INTEREST_FILE) as wsIntFile:
+            for workshopName, messageId in messageIds.items():
+                wsIntFile[workshopName]["messageId"] = messageId
 
     @staticmethod
     def getWorkshopView() -> discord.ui.View:
@@ -201,34 +205,44 @@ class WorkshopInterest(commands.Cog):
 
     @staticmethod
     async def workshopInterestRequiresRefresh(guild: discord.Guild) -> bool:
-        """Checks if the posted workshop-interest channel differs from local storage."""
+        """Checks if the posted workshop-interest channel differs from local storage.
+
+        Fetches the stored message ids rather than the channel history, plus a window around them for stray bot messages.
+        """
         wsIntChannel = guild.get_channel(WORKSHOP_INTEREST)
         if not isinstance(wsIntChannel, discord.TextChannel):
             log.exception("WSINT workshopInterestRequiresRefresh: wsIntChannel not discord.TextChannel")
             return False
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            wsIntFile = json.load(f)
+        wsIntFile = store.get(WORKSHOP_INTEREST_FILE)
 
         expectedWorkshopNames = list(WORKSHOP_INTEREST_LIST.keys())
-        botMessages = [message async for message in wsIntChannel.history(limit=None, oldest_first=True) if message.author.id in FRIENDLY_SNEKS]
-
-        if len(botMessages) != len(expectedWorkshopNames):
-            log.info(f"WSINT workshopInterestRequiresRefresh: expected {len(expectedWorkshopNames)} workshop messages, found {len(botMessages)}")
-            return True
-
-        expectedCustomIds = WorkshopInterest.getViewCustomIds(WorkshopInterest.getWorkshopView())
-        for workshopName, message in zip(expectedWorkshopNames, botMessages):
+        messageIds = []
+        for workshopName in expectedWorkshopNames:
             workshopData = wsIntFile.get(workshopName)
             if workshopData is None:
                 log.info(f"WSINT workshopInterestRequiresRefresh: missing workshop '{workshopName}' in file")
                 log.debug(f"Expected Workshop Name: {workshopName}")
                 return True
 
-            if workshopData.get("messageId") != message.id:
-                log.info(f"WSINT workshopInterestRequiresRefresh: message id mismatch for workshop '{workshopName}'")
-                log.debug(f"Expected Message ID: {workshopData.get('messageId')}")
-                log.debug(f"Actual Message ID: {message.id}")
+            messageId = workshopData.get("messageId")
+            if not isinstance(messageId, int) or messageId == 0:
+                log.info(f"WSINT workshopInterestRequiresRefresh: no message id for workshop '{workshopName}'")
+                return True
+            messageIds.append(messageId)
+
+        # Workshops are posted in list order, so their message ids must increase
+        if any(messageId >= nextMessageId for messageId, nextMessageId in zip(messageIds, messageIds[1:])):
+            log.info("WSINT workshopInterestRequiresRefresh: workshop messages are out of order")
+            return True
+
+        messages = await Utils.fetchMessages(wsIntChannel, messageIds)
+        expectedCustomIds = WorkshopInterest.getViewCustomIds(WorkshopInterest.getWorkshopView())
+        for workshopName, messageId in zip(expectedWorkshopNames, messageIds):
+            message = messages[messageId]
+            if message is None:
+                log.info(f"WSINT workshopInterestRequiresRefresh: message not found for workshop '{workshopName}'")
+                log.debug(f"Expected Message ID: {messageId}")
                 return True
 
             actualCustomIds = WorkshopInterest.getMessageComponentCustomIds(message)
@@ -238,6 +252,13 @@ class WorkshopInterest(commands.Cog):
                 log.debug(f"Actual Custom IDs: {actualCustomIds}")
                 return True
 
+        knownIds = set(messageIds)
+        botMessagesBetween = await Utils.fetchNearbyBotMessages(wsIntChannel, after=messageIds[0], before=messageIds[-1], limit=len(messageIds) + MESSAGE_VERIFY_WINDOW)
+        strayMessages = await Utils.fetchNearbyBotMessages(wsIntChannel, before=messageIds[0]) + [message for message in botMessagesBetween if message.id not in knownIds] + await Utils.fetchNearbyBotMessages(wsIntChannel, after=messageIds[-1])
+        if len(strayMessages) > 0:
+            log.info(f"WSINT workshopInterestRequiresRefresh: found {len(strayMessages)} stray bot messages among the workshop messages")
+            return True
+
         return False
 
 
@@ -258,9 +279,8 @@ class WorkshopInterest(commands.Cog):
             color=discord.Color.dark_blue()
         )
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            workshopInterest = json.load(f)
-            removedMember = False
+        workshopInterest = store.get(WORKSHOP_INTEREST_FILE)
+        removedMember = False
 
         # Get the interested member's name. If they aren't found, remove them
         interestedMembers = ""
@@ -275,8 +295,7 @@ class WorkshopInterest(commands.Cog):
 
         if removedMember:
             workshopInterest[workshopName]["members"] = membersCleaned
-            with open(WORKSHOP_INTEREST_FILE, "w", encoding="utf-8") as f:
-                json.dump(workshopInterest, f, indent=4)
+            store.set(WORKSHOP_INTEREST_FILE, workshopInterest)
 
         if interestedMembers == "":
             interestedMembers = "-"
@@ -319,9 +338,7 @@ class WorkshopInterest(commands.Cog):
             log.exception("WSINT cleanSpecificWorkshopInterestList: channelWSINT not discord.TextChannel")
             return
 
-
-        with open(WORKSHOP_INTEREST_FILE) as f:
-                workshopInterest = json.load(f)
+        workshopInterest = store.get(WORKSHOP_INTEREST_FILE)
 
         # Find workshop
         for workshop in WORKSHOP_INTEREST_LIST.keys():
@@ -336,14 +353,12 @@ class WorkshopInterest(commands.Cog):
 
                     for signupMember in workshopInterest[workshop]["members"]:
                         if signupMember == targetMember.id:
-                            workshopInterest[workshop]["members"].remove(targetMember.id)
-
-                            with open(WORKSHOP_INTEREST_FILE, "w") as f:
-                                json.dump(workshopInterest, f, indent=4)
+                            async with store.transaction(WORKSHOP_INTEREST_FILE) as workshopInterest:
+                                if targetMember.id in workshopInterest[workshop]["members"]:
+                                    workshopInterest[workshop]["members"].remove(targetMember.id)
 
-                            msg = await channelWSINT.fetch_message(workshopInterest[workshop]["messageId"])
                             try:
-                                await msg.edit(embed=self.getWorkshopEmbed(ctx.guild, workshop))
+                                await channelWSINT.get_partial_message(workshopInterest[workshop]["messageId"]).edit(embed=self.getWorkshopEmbed(ctx.guild, workshop))
                             except Exception:
                                 log.exception(f"{ctx.author.id} [{ctx.author.display_name}]")
 
@@ -355,13 +370,11 @@ class WorkshopInterest(commands.Cog):
 
                 # Clean whole workshop
                 else:
-                    workshopInterest[workshop]["members"] = []
-                    with open(WORKSHOP_INTEREST_FILE, "w") as f:
-                        json.dump(workshopInterest, f, indent=4)
+                    async with store.transaction(WORKSHOP_INTEREST_FILE) as workshopInterest:
+                        workshopInterest[workshop]["members"] = []
 
-                    msg = await channelWSINT.fetch_message(workshopInterest[workshop]["messageId"])
                     try:
-                        await msg.edit(embed=self.getWorkshopEmbed(ctx.guild, workshop))
+                        await channelWSINT.get_partial_message(workshopInterest[workshop]["messageId"]).edit(embed=self.getWorkshopEmbed(ctx.guild, workshop))
                     except Exception:
                         log.exception(f"{ctx.author.id} [{ctx.author.display_name}]")
                     await ctx.send(embed=discord.Embed(title="✅ Cleared workshop list!", description=f"Cleared workshop list '{workshop}'.", color=discord.Color.green()))
@@ -380,12 +393,10 @@ class WorkshopInterestButton(discord.ui.DynamicItem[discord.ui.Button], template
     async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /):
         return cls(item.custom_id)
 
+    @Metrics.timedInteraction
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
 
-        with open(WORKSHOP_INTEREST_FILE) as f:
-            workshopInterest = json.load(f)
-
         if interaction.message is None:
             log.exception("WSINT updateInterestList: interaction.message is None")
             return
@@ -400,24 +411,26 @@ class WorkshopInterestButton(discord.ui.DynamicItem[discord.ui.Button], template
             if wsTitle[i:] in WORKSHOP_INTEREST_LIST:
                 wsTitle = wsTitle[i:]
                 break
-        wsMembers = workshopInterest[wsTitle]["members"]
 
-        if interaction.data["custom_id"] == "workshopInterest_button_interest_add":
-            if interaction.user.id not in wsMembers:
-                wsMembers.append(interaction.user.id)  # Add member to WS
-            else:
-                await interaction.followup.send("You are already interested!", ephemeral=True)
-                return
+        alreadyMsg = None
+        async with store.transaction(WORKSHOP_INTEREST_FILE) as workshopInterest:
+            wsMembers = workshopInterest[wsTitle]["members"]
 
-        elif interaction.data["custom_id"] == "workshopInterest_button_interest_remove":
-            if interaction.user.id in wsMembers:
-                wsMembers.remove(interaction.user.id)  # Remove member from WS
-            else:
-                await interaction.followup.send("You are already not interested!", ephemeral=True)
-                return
+            if interaction.data["custom_id"] == "workshopInterest_button_interest_add":
+                if interaction.user.id not in wsMembers:
+                    wsMembers.append(interaction.user.id)  # Add member to WS
+                else:
+                    alreadyMsg = "You are already interested!"
 
-        with open(WORKSHOP_INTEREST_FILE, "w") as f:
-            json.dump(workshopInterest, f, indent=4)
+            elif interaction.data["custom_id"] == "workshopInterest_button_interest_remove":
+                if interaction.user.id in wsMembers:
+                    wsMembers.remove(interaction.user.id)  # Remove member from WS
+                else:
+                    alreadyMsg = "You are already not interested!"
+
+        if alreadyMsg is not None:
+            await interaction.followup.send(alreadyMsg, ephemeral=True)
+            return
 
         if interaction.guild is None:
             log.exception("WSINT updateInterestList: interaction.guild is None")
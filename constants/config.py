@@ -17,3 +17,41 @@ TIME_TEN_MIN = 600
 
 ## No-show archive threshold
 NOSHOW_ARCHIVE_THRESHOLD_IN_DAYS = 90
+
+## Data store
+STORE_FLUSH_INTERVAL = 5  # Seconds between background writes of changed data files
+WALLET_LEDGER_SNAPSHOT_INTERVAL = 1000  # Wallet ledger records between balance snapshots
+
+## Executors
+IO_EXECUTOR_WORKERS = 8  # Threads for blocking file, database and network calls
+CPU_EXECUTOR_WORKERS = 1  # Processes for compression and other CPU-heavy jobs
+
+## Event loop lag monitor
+LAG_SAMPLE_INTERVAL = 0.5  # Seconds between event loop heartbeats
+LAG_THRESHOLD = 0.25  # Seconds of lag before a stall is logged, with what was blocking the loop
+LAG_WINDOW = 300  # Seconds of lag samples summarised by /looplag
+LAG_STALL_HISTORY = 20  # Recent stalls listed by /looplag
+
+## Message verification
+MESSAGE_FETCH_CONCURRENCY = 5  # Concurrent fetches when verifying posted messages by id
+MESSAGE_VERIFY_WINDOW = 50  # Messages checked next to (and extra between) the known ones for stray bot messages
+BULK_DELETE_MAX_MESSAGES = 100  # Discord's limit per bulk delete request
+BULK_DELETE_MAX_AGE_DAYS = 13  # Discord refuses bulk deletes of messages older than 14 days; a day of margin
+
+## Deadline scheduler
+SCHEDULER_MIN_RERUN_INTERVAL = 60  # Seconds before the same job may run again
+SCHEDULER_MAX_RETRY_INTERVAL = 3600  # Seconds a job still due after running backs off to at most, doubling from SCHEDULER_MIN_RERUN_INTERVAL
+SCHEDULER_MAX_SLEEP = 3600  # Seconds the scheduler sleeps at most before rechecking the clock
+
+## Direct messages
+DM_DISPATCH_WORKERS = 3  # DMs sent at the same time
+DM_MAX_ATTEMPTS = 4  # Tries per DM when rate limited or Discord errors
+DM_RETRY_BASE_DELAY = 2  # Seconds before the first retry without a Retry-After, doubling per try
+
+## Schedule message edits
+SCHEDULE_EDIT_COALESCE_WINDOW = 1.5  # Seconds between edits of one event's message; RSVPs in between share the next edit
+
+## File uploads
+FILE_UPLOAD_USER_QUOTA = 250_000_000  # Bytes of uploads per member before their least recently used are evicted
+FILE_UPLOAD_TOTAL_QUOTA = 5_000_000_000  # Bytes of uploaded content on disk before the least recently used are evicted
+FILE_UPLOAD_MAX_AGE_WEEKS = 20  # Unused uploads are removed this long after uploading
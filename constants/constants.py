@@ -8,10 +8,12 @@ GUILD = discord.Object(id=GUILD_ID)
 
 DATA_DIR = "data"
 BACKUP_DIR = "backups"
+SQLITE_DATABASE_FILE = "data/friendlySnek.sqlite3"  # Used when secret.STORAGE_BACKEND = "sqlite"
 
 # Events
 EVENTS_FILE = "data/events.json"
-EVENTS_HISTORY_FILE = "data/eventsHistory.json"
+EVENTS_HISTORY_DIR = "data/eventsHistory"  # One JSON-lines segment per year
+EVENTS_HISTORY_FILE = "data/eventsHistory.json"  # Legacy single-file history, imported into EVENTS_HISTORY_DIR on startup
 
 # Templates
 EVENT_TEMPLATES_FILE = "data/eventTemplates.json"
@@ -23,8 +25,12 @@ WORKSHOP_INTEREST_FILE = "data/workshopInterest.json"
 REMINDERS_FILE = "data/reminders.json"
 REPEATED_MSG_DATE_LOG_FILE = "data/repeatedMsgDateLog.json"
 GENERIC_DATA_FILE = "data/genericData.json"
-WALLETS_FILE = "data/wallets.json"
+WALLETS_FILE = "data/wallets.json"  # Legacy wallets document, imported as the first snapshot of WALLET_LEDGER_DIR on startup
+WALLET_LEDGER_DIR = "data/walletLedger"  # One JSON-lines segment of wallet changes per year, plus snapshot.json
 CANDIDATE_TRACKING_FILE = "data/candidateTracking.json"
+CANDIDATE_NOTIFICATIONS_FILE = "data/candidateNotifications.json"
+FILE_UPLOADS_FILE = "data/fileUploads.json"  # Manifest of the uploads in FILE_UPLOAD_DIR
+FILE_UPLOAD_DIR = "tmp/fileUpload"  # Uploaded file contents, named by SHA-256
 
 # Staff
 ROLE_RESERVATION_BLACKLIST_FILE = "data/roleReservationBlacklist.json"
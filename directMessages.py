@@ -0,0 +1,132 @@
+import time, asyncio, discord, logging
+
+from typing import Any
+
+from metrics import Metrics
+
+from constants import *
+
+log = logging.getLogger("FriendlySnek")
+
+
+class DMDispatcher:
+    """Sends direct messages from a queue, DM_DISPATCH_WORKERS at a time.
+
+    Callers enqueue and return at once, so a long standby or attendee list no longer
+    holds up the interaction or task that notifies it. A message queued again for the
+    same user under the same key before it went out replaces the queued one. Rate
+    limited and server-side failures are retried with backoff; every outcome is counted
+    in the metrics under kind "dm" and the caller's name.
+    """
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        self.pending: dict[tuple[int, str], dict[str, Any]] = {}  # (userId, key): job
+        self.dmChannels: dict[int, discord.DMChannel] = {}
+        self.workers: list[asyncio.Task] = []
+
+    def send(self, user: discord.User | discord.Member, name: str, *, key: str | None = None, content: str | None = None, embed: discord.Embed | None = None) -> None:
+        """Queues a DM to a user.
+
+        Parameters:
+        user (discord.User | discord.Member): The recipient.
+        name (str): What the DM is, for logs and metrics, e.g. "schedule_standby_vacant".
+        key (str | None): Dedup key per user, e.g. the event id; by default only identical messages are merged.
+        content (str | None): Message text.
+        embed (discord.Embed | None): Message embed.
+
+        Returns:
+        None.
+        """
+        jobKey = (user.id, key or f"{name}:{content}:{embed.to_dict() if embed is not None else None}")
+        if jobKey in self.pending:
+            Metrics.increment("dm_deduplicated_total", "dm", name)
+        else:
+            self.queue.put_nowait(jobKey)
+        self.pending[jobKey] = {"user": user, "name": name, "content": content, "embed": embed, "queuedAt": time.perf_counter()}
+
+    async def getDMChannel(self, user: discord.User | discord.Member) -> discord.DMChannel:
+        """Gets the DM channel with a user, creating it only the first time.
+
+        Parameters:
+        user (discord.User | discord.Member): The user.
+
+        Returns:
+        discord.DMChannel: The DM channel.
+        """
+        if user.dm_channel is not None:
+            return user.dm_channel
+        if user.id not in self.dmChannels:
+            self.dmChannels[user.id] = await user.create_dm()
+        return self.dmChannels[user.id]
+
+    async def _deliver(self, job: dict[str, Any]) -> None:
+        user, name = job["user"], job["name"]
+        Metrics.observe("dm_queue_seconds", "dm", name, time.perf_counter() - job["queuedAt"])
+        for attempt in range(1, DM_MAX_ATTEMPTS + 1):
+            try:
+                dmChannel = await self.getDMChannel(user)
+                await dmChannel.send(content=job["content"], embed=job["embed"])
+                Metrics.increment("dm_sent_total", "dm", name)
+                return
+            except discord.Forbidden:
+                # DMs closed or no shared server; retrying won't help
+                Metrics.increment("dm_forbidden_total", "dm", name)
+                log.debug(f"DMDispatcher _deliver: {user.id} [{user.display_name}] does not accept DMs ({name})")
+                return
+            except discord.HTTPException as e:
+                if (e.status != 429 and e.status < 500) or attempt == DM_MAX_ATTEMPTS:
+                    Metrics.increment("dm_failed_total", "dm", name)
+                    log.warning(f"DMDispatcher _deliver: Failed to DM {user.id} [{user.display_name}] ({name}): {e}")
+                    return
+                retryAfter = e.response.headers.get("Retry-After") if e.response is not None else None
+                Metrics.increment("dm_retries_total", "dm", name)
+                await asyncio.sleep(float(retryAfter) if retryAfter else DM_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            except Exception as e:
+                Metrics.increment("dm_failed_total", "dm", name)
+                log.warning(f"DMDispatcher _deliver: Failed to DM {user.id} [{user.display_name}] ({name}): {e}")
+                return
+
+    async def _worker(self) -> None:
+        while True:
+            jobKey = await self.queue.get()
+            try:
+                job = self.pending.pop(jobKey, None)
+                if job is not None:
+                    await self._deliver(job)
+            finally:
+                self.queue.task_done()
+
+    def start(self) -> None:
+        """Starts the workers, if not already running.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        if not self.workers:
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(DM_DISPATCH_WORKERS)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Sends what is still queued, for up to timeout seconds, then stops the workers.
+
+        Parameters:
+        timeout (float): Seconds to wait for the queue to drain.
+
+        Returns:
+        None.
+        """
+        if not self.workers:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"DMDispatcher stop: dropping {len(self.pending)} queued DMs")
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+
+dmDispatcher = DMDispatcher()
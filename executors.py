@@ -0,0 +1,92 @@
+import os, asyncio, tarfile, multiprocessing
+
+from typing import Any, Callable
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from constants import *
+
+# Blocking I/O: files, SQLite, Google Sheets, SFTP, HTTP libraries without asyncio support
+ioExecutor = ThreadPoolExecutor(max_workers=IO_EXECUTOR_WORKERS, thread_name_prefix="FriendlySnekIO")
+_cpuExecutor: ProcessPoolExecutor | None = None
+
+
+def start() -> None:
+    """Starts the process pool for CPU-heavy jobs.
+
+    Call once at start-up, before any other thread exists: workers are forked
+    from the bot process (spawned workers would re-run main.py), and forking
+    is only safe while the process is single-threaded. Where fork is not
+    available (Windows) CPU jobs run in the I/O thread pool instead.
+
+    Parameters:
+    None.
+
+    Returns:
+    None.
+    """
+    global _cpuExecutor
+    if _cpuExecutor is not None or "fork" not in multiprocessing.get_all_start_methods():
+        return
+    _cpuExecutor = ProcessPoolExecutor(max_workers=CPU_EXECUTOR_WORKERS, mp_context=multiprocessing.get_context("fork"))
+    _cpuExecutor.submit(int).result()  # Fork all workers now
+
+
+async def runIO(func: Callable, /, *args: Any, **kwargs: Any) -> Any:
+    """Runs a blocking I/O call in the shared thread pool.
+
+    Parameters:
+    func (Callable): The blocking function.
+    *args, **kwargs: Passed to func.
+
+    Returns:
+    Any: What func returned.
+    """
+    return await asyncio.get_running_loop().run_in_executor(ioExecutor, partial(func, *args, **kwargs))
+
+
+async def runCPU(func: Callable, /, *args: Any) -> Any:
+    """Runs a CPU-heavy job in the shared process pool.
+
+    func and args must be picklable, i.e. func is a module-level function.
+
+    Parameters:
+    func (Callable): The job.
+    *args: Passed to func.
+
+    Returns:
+    Any: What func returned.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_cpuExecutor or ioExecutor, func, *args)
+
+
+def shutdown() -> None:
+    """Stops both pools, waiting for running jobs.
+
+    Parameters:
+    None.
+
+    Returns:
+    None.
+    """
+    global _cpuExecutor
+    if _cpuExecutor is not None:
+        _cpuExecutor.shutdown(wait=True, cancel_futures=True)
+    _cpuExecutor = None
+    ioExecutor.shutdown(wait=True)
+
+
+# ===== <CPU jobs> =====
+
+def createArchive(sourceDir: str, archivePath: str) -> None:
+    """Compresses a directory into a new tar.xz archive.
+
+    Parameters:
+    sourceDir (str): Directory to archive.
+    archivePath (str): Archive to create; must not exist.
+
+    Returns:
+    None.
+    """
+    with tarfile.open(archivePath, mode="x:xz") as archive:
+        archive.add(sourceDir, arcname=os.path.basename(sourceDir), recursive=True)
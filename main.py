@@ -20,6 +20,12 @@ if secret.DEBUG:
     from constants.debug import *
 
 from cogs.snekcoin import Snekcoin, SnekcoinButton
+from storage import store, eventsHistory, walletLedger, migrateSchema, DATA_FILES
+import executors
+from metrics import Metrics, TimedCommandTree
+from directMessages import dmDispatcher
+from scheduler import deadlineScheduler
+from uploads import uploadStore
 
 # Set up directories
 def setupDirectory(dirName: str) -> None:
@@ -27,7 +33,7 @@ def setupDirectory(dirName: str) -> None:
         # log.info(f"Creating directory '{dirName}'")
         os.mkdir(dirName)
 
-usedDirectories = ("data", "tmp", "tmp/missionUpload", "tmp/fileUpload")
+usedDirectories = ("data", EVENTS_HISTORY_DIR, WALLET_LEDGER_DIR, "tmp", "tmp/missionUpload", FILE_UPLOAD_DIR)
 for directory in usedDirectories:
     setupDirectory(directory)
 
@@ -39,24 +45,14 @@ def setupJSONDataFile(filename: str, dump: list | dict) -> None:
         with open(filename, "w") as f:
             json.dump(dump, f, indent=4)
 
-DATA_FILES = {
-    EVENTS_FILE: [],
-    EVENTS_HISTORY_FILE: [],
-    EVENT_TEMPLATES_FILE: [],
-    WORKSHOP_TEMPLATES_FILE: [],
-    ROLE_RESERVATION_BLACKLIST_FILE: [],
-    MEMBER_TIME_ZONES_FILE: {},
-    REMINDERS_FILE: {},
-    REPEATED_MSG_DATE_LOG_FILE: {},
-    GENERIC_DATA_FILE: {},
-    WORKSHOP_INTEREST_FILE: {},
-    NO_SHOW_FILE: {},
-    RECRUITMENT_HISTORY_FILE: [],
-    CANDIDATE_TRACKING_FILE: {},
-    WALLETS_FILE: {},
-}
 for filePath, dump in DATA_FILES.items():
     setupJSONDataFile(filePath, dump)
+    store.load(filePath)
+eventsHistory.importLegacy(store.backend)
+walletLedger.load(store.backend)
+migrateSchema()
+uploadStore.importLegacy()
+executors.start()  # Fork CPU workers while still single-threaded
 
 
 
@@ -74,16 +70,34 @@ class FriendlySnek(commands.Bot):
                 type=discord.ActivityType.watching,
                 name="you"
             ),
-            status=discord.Status.online
+            status=discord.Status.online,
+            tree_cls=TimedCommandTree
         )
         self.cogsReady = {cog: False for cog in COGS}
+        self.metricsRunner = None
+        self.before_invoke(Metrics.beforePrefixCommand)
+        self.after_invoke(Metrics.afterPrefixCommand)
 
     async def setup_hook(self) -> None:
+        asyncio.get_running_loop().set_default_executor(executors.ioExecutor)
+        store.start()
+        dmDispatcher.start()
+        deadlineScheduler.start()
+        if (metricsPort := getattr(secret, "METRICS_PORT", None)):
+            self.metricsRunner = await Metrics.startServer(metricsPort)
         for cog in COGS:
             await client.load_extension(f"cogs.{cog}")
         self.tree.copy_global_to(guild=GUILD)  # This copies the global commands over to your guild.
         await self.tree.sync(guild=GUILD)
 
+    async def close(self) -> None:
+        await deadlineScheduler.stop()
+        await dmDispatcher.stop()  # Before the connection closes, so queued DMs still go out
+        await super().close()
+        if self.metricsRunner is not None:
+            await self.metricsRunner.cleanup()
+        await store.flush()
+
 client = FriendlySnek(intents=INTENTS)
 
 @client.event
@@ -110,22 +124,8 @@ async def on_message(message: discord.Message) -> None:
         if embed and embed.description and "Bump done" in embed.description and message.interaction_metadata:
             log.debug(f"[{message.interaction_metadata.user.display_name}] ran /bump; deleting message by [{message.author.display_name}] in #{message.channel}")
 
-            userWallet = await Snekcoin.getWallet(message.interaction_metadata.user.id)
-            if userWallet is None:
-                log.exception("on_message: userWallet is None")
-                return
-            if userWallet.get("timesBumped") is None:
-                await Snekcoin.updateWallet(message.interaction_metadata.user.id, "timesBumped", 0)
-                userWallet = await Snekcoin.getWallet(message.interaction_metadata.user.id)
-                if userWallet is None:
-                    log.exception("on_message: userWallet is None after initializing timesBumped")
-                    return
-
-            awardable = userWallet.get("timesBumped", 0) < MAX_BUMPS
-            await Snekcoin.updateWallet(message.interaction_metadata.user.id, "timesBumped", 1)
-            if awardable:
-                award = randint(10, 100)
-                await Snekcoin.updateWallet(message.interaction_metadata.user.id, "money", award)
+            award = randint(10, 100)
+            if await Snekcoin.recordBump(message.interaction_metadata.user.id, award):
                 await message.channel.send(content = f"The trout population thanks you {message.interaction_metadata.user.mention} for doing `/bump` {TROUT} 🤝 🐍\nYou have been awarded 🪙`{award}` snekcoins!")
                 await message.delete()
                 return
@@ -226,7 +226,7 @@ async def on_message(message: discord.Message) -> None:
         try:
             # 0.1% chance for funny thing
             if random.random() < 0.001:
-                await Snekcoin.updateWallet(message.author.id, "money", 1)
+                await Snekcoin.updateWallet(message.author.id, "money", 1, "chatAward", "on_message")
                 # respond
                 await message.reply(
                     content="You have been awarded 🪙`1` snekcoin!",
@@ -412,6 +412,12 @@ async def on_member_unban(guild: discord.Guild, user: discord.User) -> None:
     await channelAuditLogs.send(embed=embed)
 
 
+@client.event
+async def on_app_command_completion(interaction: discord.Interaction, command: discord.app_commands.Command | discord.app_commands.ContextMenu) -> None:
+    """On app command completion event."""
+    Metrics.finishInteraction(interaction)
+
+
 @client.event
 async def on_error(event: str, *args, **kwargs) -> None:
     """On error event."""
@@ -458,4 +464,6 @@ if __name__ == "__main__":
     except Exception as e:
         log.exception(e)
     finally:
+        store.flushSync()
+        executors.shutdown()
         log.info("Bot stopped")
@@ -0,0 +1,245 @@
+import time, discord, logging, functools
+
+from aiohttp import web
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from discord.ext import commands  # type: ignore
+
+from constants import *
+
+log = logging.getLogger("FriendlySnek")
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, Prometheus style."""
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+    def __init__(self) -> None:
+        self.bucketCounts = [0] * len(Histogram.BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(Histogram.BUCKETS):
+            if seconds <= bound:
+                self.bucketCounts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound holding the q-quantile, or the max if it lies past the last bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, bucketCount in zip(Histogram.BUCKETS, self.bucketCounts):
+            if bucketCount >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class TimedInteractionResponse(discord.InteractionResponse):
+    """InteractionResponse that records when the first response reached Discord."""
+    __slots__ = ("kind", "name", "startedAt", "responded")
+
+    def __init__(self, parent: discord.Interaction, kind: str, name: str) -> None:
+        super().__init__(parent)
+        self.kind = kind
+        self.name = name
+        self.startedAt = time.perf_counter()
+        self.responded = False
+
+    def recordFirstResponse(self) -> None:
+        if self.responded:
+            return
+        self.responded = True
+        # Measured from the interaction's creation at Discord, which is what the 3 second deadline counts from
+        Metrics.observe("first_response_seconds", self.kind, self.name, (datetime.now(timezone.utc) - self._parent.created_at).total_seconds())
+
+    async def defer(self, *args, **kwargs) -> Any:
+        result = await super().defer(*args, **kwargs)
+        self.recordFirstResponse()
+        return result
+
+    async def send_message(self, *args, **kwargs) -> Any:
+        result = await super().send_message(*args, **kwargs)
+        self.recordFirstResponse()
+        return result
+
+    async def edit_message(self, *args, **kwargs) -> Any:
+        result = await super().edit_message(*args, **kwargs)
+        self.recordFirstResponse()
+        return result
+
+    async def send_modal(self, *args, **kwargs) -> Any:
+        result = await super().send_modal(*args, **kwargs)
+        self.recordFirstResponse()
+        return result
+
+
+class Metrics:
+    """Latency histograms and error counters for commands, interactions and task loops.
+
+    Metrics are keyed by (metric, kind, name), where kind is one of app_command,
+    prefix_command, component, task or dm and name identifies the handler.
+    """
+    histograms: dict[tuple[str, str, str], Histogram] = {}
+    counters: dict[tuple[str, str, str], int] = {}
+    prefixCommandStarts: dict[int, float] = {}
+
+    @staticmethod
+    def observe(metric: str, kind: str, name: str, seconds: float) -> None:
+        Metrics.histograms.setdefault((metric, kind, name), Histogram()).observe(seconds)
+
+    @staticmethod
+    def increment(metric: str, kind: str, name: str) -> None:
+        Metrics.counters[(metric, kind, name)] = Metrics.counters.get((metric, kind, name), 0) + 1
+
+    @staticmethod
+    def startInteraction(interaction: discord.Interaction, kind: str, name: str) -> None:
+        """Starts timing an interaction handler; call before it can respond.
+
+        Parameters:
+        interaction (discord.Interaction): The interaction being handled.
+        kind (str): Handler kind.
+        name (str): Handler name.
+
+        Returns:
+        None.
+        """
+        if isinstance(interaction.response, TimedInteractionResponse) or interaction.response.is_done():
+            return
+        # Swap the lazily created response object for a timed one (discord.py caches it in _cs_response)
+        interaction._cs_response = TimedInteractionResponse(interaction, kind, name)  # type: ignore
+
+    @staticmethod
+    def finishInteraction(interaction: discord.Interaction, failed: bool = False) -> None:
+        """Records total handler time of an interaction started with startInteraction.
+
+        Parameters:
+        interaction (discord.Interaction): The handled interaction.
+        failed (bool): Whether the handler raised.
+
+        Returns:
+        None.
+        """
+        response = interaction.response
+        if not isinstance(response, TimedInteractionResponse) or response.startedAt is None:
+            return
+        Metrics.observe("handler_seconds", response.kind, response.name, time.perf_counter() - response.startedAt)
+        if failed:
+            Metrics.increment("handler_errors_total", response.kind, response.name)
+        if not response.responded:
+            Metrics.increment("unanswered_total", response.kind, response.name)
+        response.startedAt = None
+
+    @staticmethod
+    def timedInteraction(callback: Callable) -> Callable:
+        """Decorator for DynamicItem callbacks; names the metric after the item's class."""
+        @functools.wraps(callback)
+        async def wrapper(self, interaction: discord.Interaction, *args, **kwargs) -> Any:
+            Metrics.startInteraction(interaction, "component", type(self).__name__)
+            try:
+                result = await callback(self, interaction, *args, **kwargs)
+            except Exception:
+                Metrics.finishInteraction(interaction, failed=True)
+                raise
+            Metrics.finishInteraction(interaction)
+            return result
+        return wrapper
+
+    @staticmethod
+    def timedTask(coro: Callable) -> Callable:
+        """Decorator for task loop bodies; goes below @tasks.loop."""
+        @functools.wraps(coro)
+        async def wrapper(*args, **kwargs) -> Any:
+            startedAt = time.perf_counter()
+            try:
+                return await coro(*args, **kwargs)
+            except Exception:
+                Metrics.increment("handler_errors_total", "task", coro.__qualname__)
+                raise
+            finally:
+                Metrics.observe("handler_seconds", "task", coro.__qualname__, time.perf_counter() - startedAt)
+        return wrapper
+
+    @staticmethod
+    async def beforePrefixCommand(ctx: commands.Context) -> None:
+        Metrics.prefixCommandStarts[id(ctx)] = time.perf_counter()
+
+    @staticmethod
+    async def afterPrefixCommand(ctx: commands.Context) -> None:
+        startedAt = Metrics.prefixCommandStarts.pop(id(ctx), None)
+        if startedAt is None or ctx.command is None:
+            return
+        Metrics.observe("handler_seconds", "prefix_command", ctx.command.qualified_name, time.perf_counter() - startedAt)
+        if ctx.command_failed:
+            Metrics.increment("handler_errors_total", "prefix_command", ctx.command.qualified_name)
+
+    @staticmethod
+    def renderPrometheus() -> str:
+        """Renders all metrics in the Prometheus text exposition format.
+
+        Parameters:
+        None.
+
+        Returns:
+        str: The exposition text.
+        """
+        escape = lambda value: value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        lines = []
+        typesWritten = set()
+        for (metric, kind, name), histogram in sorted(Metrics.histograms.items()):
+            fullName = f"friendlysnek_{metric}"
+            if fullName not in typesWritten:
+                typesWritten.add(fullName)
+                lines.append(f"# TYPE {fullName} histogram")
+            labels = f"kind=\"{kind}\",name=\"{escape(name)}\""
+            for bound, bucketCount in zip(Histogram.BUCKETS, histogram.bucketCounts):
+                lines.append(f"{fullName}_bucket{{{labels},le=\"{bound}\"}} {bucketCount}")
+            lines.append(f"{fullName}_bucket{{{labels},le=\"+Inf\"}} {histogram.count}")
+            lines.append(f"{fullName}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{fullName}_count{{{labels}}} {histogram.count}")
+        for (metric, kind, name), value in sorted(Metrics.counters.items()):
+            fullName = f"friendlysnek_{metric}"
+            if fullName not in typesWritten:
+                typesWritten.add(fullName)
+                lines.append(f"# TYPE {fullName} counter")
+            lines.append(f"{fullName}{{kind=\"{kind}\",name=\"{escape(name)}\"}} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    async def startServer(port: int) -> web.AppRunner:
+        """Serves /metrics on 127.0.0.1 for a local Prometheus scraper.
+
+        Parameters:
+        port (int): Port to listen on.
+
+        Returns:
+        web.AppRunner: The runner, for cleanup on shutdown.
+        """
+        async def handleMetrics(request: web.Request) -> web.Response:
+            return web.Response(text=Metrics.renderPrometheus(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handleMetrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        log.info(f"Metrics startServer: serving on http://127.0.0.1:{port}/metrics")
+        return runner
+
+
+class TimedCommandTree(discord.app_commands.CommandTree):
+    """Command tree that times every app command (completion is recorded in main.py's on_app_command_completion)."""
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        if interaction.type is not discord.InteractionType.autocomplete:
+            command = interaction.command
+            Metrics.startInteraction(interaction, "app_command", command.qualified_name if command is not None else "unknown")
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: discord.app_commands.AppCommandError, /) -> None:
+        Metrics.finishInteraction(interaction, failed=True)
+        await super().on_error(interaction, error)
@@ -0,0 +1,211 @@
+import time, heapq, asyncio, logging
+
+from typing import Awaitable, Callable, Iterable
+
+from storage import store
+from metrics import Metrics
+
+from constants import *
+
+log = logging.getLogger("FriendlySnek")
+
+Job = Callable[[], Awaitable[None]]
+JobSource = Callable[[], Iterable[tuple[str, float, Job]]]
+
+
+class DeadlineScheduler:
+    """Runs jobs at their deadlines, sleeping until the earliest one instead of polling.
+
+    Most jobs come from sources: functions that list (name, deadline, job) from the
+    persisted data, e.g. "autodelete" at the earliest event end plus the threshold.
+    A source is listed again whenever one of the data files it reads changes, which
+    wakes the scheduler early; after a restart the deadlines already passed are run
+    straight away. Jobs run one at a time, each at most once per
+    SCHEDULER_MIN_RERUN_INTERVAL. A job still due after it ran (it failed, or made no
+    progress) backs off exponentially up to SCHEDULER_MAX_RETRY_INTERVAL, until a run
+    moves its deadline past that run.
+    """
+    def __init__(self) -> None:
+        self.heap: list[tuple[float, int, str]] = []  # (deadline, sequence, key)
+        self.jobs: dict[str, tuple[float, int, Job]] = {}  # key: (deadline, sequence, job); heap entries of replaced jobs are skipped
+        self.sequence = 0
+        self.sources: dict[str, tuple[tuple[str, ...], JobSource]] = {}
+        self.sourceKeys: dict[str, set[str]] = {}
+        self.dirtySources: set[str] = set()
+        self.watchedFiles: set[str] = set()
+        self.lastRun: dict[str, float] = {}
+        self.retries: dict[str, tuple[float, int]] = {}  # key: (last run, consecutive runs that left the job due)
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def schedule(self, key: str, deadline: float, job: Job) -> None:
+        """Runs job at deadline, replacing any job already scheduled under key.
+
+        Parameters:
+        key (str): Job key, also its metrics name.
+        deadline (float): Epoch seconds; a past deadline runs as soon as possible.
+        job (Job): Coroutine function to run.
+
+        Returns:
+        None.
+        """
+        lastRun = self.lastRun.get(key)
+        if lastRun is not None:
+            delay = SCHEDULER_MIN_RERUN_INTERVAL
+            if deadline <= lastRun:
+                # Due again although it ran since; count each run once, as sources list a job again on every data change
+                countedRun, retries = self.retries.get(key, (None, 0))
+                if countedRun != lastRun:
+                    retries += 1
+                    self.retries[key] = (lastRun, retries)
+                    log.warning(f"DeadlineScheduler schedule: job '{key}' still due after {retries} run(s), backing off")
+                delay = min(SCHEDULER_MIN_RERUN_INTERVAL * 2 ** (retries - 1), SCHEDULER_MAX_RETRY_INTERVAL)
+            else:
+                self.retries.pop(key, None)
+            deadline = max(deadline, lastRun + delay)
+        self.sequence += 1
+        self.jobs[key] = (deadline, self.sequence, job)
+        heapq.heappush(self.heap, (deadline, self.sequence, key))
+        if len(self.heap) > 2 * len(self.jobs) + 16:
+            # Mostly entries of replaced jobs; rebuild from the live ones
+            self.heap = [(jobDeadline, sequence, jobKey) for jobKey, (jobDeadline, sequence, _) in self.jobs.items()]
+            heapq.heapify(self.heap)
+        self.wakeup.set()
+
+    def cancel(self, key: str) -> None:
+        """Drops the job scheduled under key, if any."""
+        self.jobs.pop(key, None)
+
+    def addSource(self, name: str, filenames: Iterable[str], source: JobSource) -> None:
+        """Registers (or replaces) a source of jobs, listed again whenever one of filenames changes.
+
+        Parameters:
+        name (str): Source name; its jobs are keyed "name:jobName".
+        filenames (Iterable[str]): Data files the source reads.
+        source (JobSource): Lists (jobName, deadline, job) for the jobs currently due at some point.
+
+        Returns:
+        None.
+        """
+        self.sources[name] = (tuple(filenames), source)
+        for filename in self.sources[name][0]:
+            if filename not in self.watchedFiles:
+                self.watchedFiles.add(filename)
+                store.watch(filename, self._dataChanged)
+        self.dirtySources.add(name)
+        self.wakeup.set()
+
+    def removeSource(self, name: str) -> None:
+        """Unregisters a source and cancels its jobs, e.g. when the cog that added it is unloaded.
+
+        Parameters:
+        name (str): Source name.
+
+        Returns:
+        None.
+        """
+        self.sources.pop(name, None)
+        self.dirtySources.discard(name)
+        for key in self.sourceKeys.pop(name, set()):
+            self.cancel(key)
+
+    def refreshSource(self, name: str) -> None:
+        """Lists a source again, for a change to data it doesn't watch.
+
+        Parameters:
+        name (str): Source name.
+
+        Returns:
+        None.
+        """
+        if name in self.sources:
+            self.dirtySources.add(name)
+            self.wakeup.set()
+
+    def _dataChanged(self, filename: str) -> None:
+        for name, (filenames, _) in self.sources.items():
+            if filename in filenames:
+                self.dirtySources.add(name)
+                self.wakeup.set()
+
+    def _refreshSources(self) -> None:
+        while self.dirtySources:
+            name = self.dirtySources.pop()
+            if name not in self.sources:
+                continue
+            for key in self.sourceKeys.pop(name, set()):
+                self.cancel(key)
+            try:
+                jobs = list(self.sources[name][1]())
+            except Exception:
+                log.exception(f"DeadlineScheduler _refreshSources: source '{name}' failed")
+                continue
+            self.sourceKeys[name] = set()
+            for jobName, deadline, job in jobs:
+                key = f"{name}:{jobName}"
+                self.sourceKeys[name].add(key)
+                self.schedule(key, deadline, job)
+
+    async def _runJob(self, key: str, job: Job) -> None:
+        self.lastRun[key] = time.time()
+        startedAt = time.perf_counter()
+        try:
+            await job()
+        except Exception:
+            Metrics.increment("handler_errors_total", "task", key)
+            log.exception(f"DeadlineScheduler _runJob: job '{key}' failed")
+        finally:
+            Metrics.observe("handler_seconds", "task", key, time.perf_counter() - startedAt)
+            # Jobs from a source are listed again, in case the job left its data unchanged
+            for name, keys in self.sourceKeys.items():
+                if key in keys:
+                    self.dirtySources.add(name)
+
+    async def run(self) -> None:
+        """Runs due jobs until cancelled."""
+        while True:
+            self.wakeup.clear()
+            self._refreshSources()
+
+            # Skip entries of cancelled or rescheduled jobs
+            while self.heap and self.jobs.get(self.heap[0][2], (None, None))[1] != self.heap[0][1]:
+                heapq.heappop(self.heap)
+
+            if self.heap and self.heap[0][0] <= time.time():
+                _, _, key = heapq.heappop(self.heap)
+                _, _, job = self.jobs.pop(key)
+                await self._runJob(key, job)
+                continue
+
+            # Sleep until the next deadline, a change, or at most SCHEDULER_MAX_SLEEP (guards against clock jumps)
+            timeout = min(self.heap[0][0] - time.time(), SCHEDULER_MAX_SLEEP) if self.heap else SCHEDULER_MAX_SLEEP
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Starts the scheduler task, if not already running.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stops the scheduler task; a running job is cancelled."""
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+
+deadlineScheduler = DeadlineScheduler()
@@ -0,0 +1,876 @@
+import os, json, time, bisect, sqlite3, asyncio, logging, argparse, threading
+
+from typing import Any, AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import secret
+from constants import *
+from executors import runIO
+
+log = logging.getLogger("FriendlySnek")
+
+# Every data file the bot keeps, with its empty document
+DATA_FILES = {
+    EVENTS_FILE: [],
+    EVENT_TEMPLATES_FILE: [],
+    WORKSHOP_TEMPLATES_FILE: [],
+    ROLE_RESERVATION_BLACKLIST_FILE: [],
+    MEMBER_TIME_ZONES_FILE: {},
+    REMINDERS_FILE: {},
+    REPEATED_MSG_DATE_LOG_FILE: {},
+    GENERIC_DATA_FILE: {},
+    WORKSHOP_INTEREST_FILE: {},
+    NO_SHOW_FILE: {},
+    RECRUITMENT_HISTORY_FILE: [],
+    CANDIDATE_TRACKING_FILE: {},
+    CANDIDATE_NOTIFICATIONS_FILE: {},
+    FILE_UPLOADS_FILE: {},
+    TEMPLATES_DELETED_FILE: [],
+}
+
+
+class JSONBackend:
+    """Keeps each document in its own JSON file."""
+    def read(self, filename: str) -> Any:
+        with open(filename) as f:
+            return json.load(f)
+
+    def serialize(self, filename: str, document: Any) -> str:
+        return json.dumps(document, indent=4)
+
+    def write(self, filename: str, payload: str) -> None:
+        """Writes payload through a temp file and rename, so readers never see a partial file."""
+        tmpFilename = f"{filename}.tmp"
+        with open(tmpFilename, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpFilename, filename)
+
+
+def _timeToEpoch(value: Any) -> int | None:
+    """An event time as epoch seconds; also accepts the TIME_FORMAT strings used before schema version 1."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(datetime.strptime(value, TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            return None
+    return None
+
+
+def _eventEpoch(event: dict) -> int | None:
+    """Start time of an event as epoch seconds, or None if it has none."""
+    return _timeToEpoch(event.get("time"))
+
+
+def _epochEventTimes(entry: dict) -> bool:
+    """Converts an entry's TIME_FORMAT time and endTime strings to epoch seconds in place; unparseable ones are logged and left.
+
+    Parameters:
+    entry (dict): Event, template or history entry.
+
+    Returns:
+    bool: Whether anything was converted.
+    """
+    changed = False
+    for key in ("time", "endTime"):
+        if isinstance(entry.get(key), str):
+            epoch = _timeToEpoch(entry[key])
+            if epoch is None:
+                # Keep the original for staff to fix; the schedule and the event tasks skip events whose times aren't epochs
+                log.warning(f"Storage migration: could not parse {key} '{entry[key]}' of '{entry.get('title', entry.get('templateName'))}', kept as is")
+                continue
+            entry[key] = epoch
+            changed = True
+    return changed
+
+
+class SQLiteBackend:
+    """Keeps documents in an SQLite database (WAL mode).
+
+    Events, no-shows and reminders are stored one row per record with
+    indexes for lookups; a flush only touches the rows that changed. Every other
+    document is stored whole in the documents table.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (filename TEXT PRIMARY KEY, data TEXT);
+
+        CREATE TABLE IF NOT EXISTS events (rowKey TEXT PRIMARY KEY, position INTEGER NOT NULL, eventId TEXT, time INTEGER, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS eventsByEventId ON events (eventId);
+        CREATE INDEX IF NOT EXISTS eventsByTime ON events (time);
+
+        CREATE TABLE IF NOT EXISTS noShows (rowKey TEXT PRIMARY KEY, memberId TEXT NOT NULL, position INTEGER NOT NULL, date INTEGER, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS noShowsByMember ON noShows (memberId, date);
+        CREATE INDEX IF NOT EXISTS noShowsByDate ON noShows (date);
+
+        CREATE TABLE IF NOT EXISTS reminders (rowKey TEXT PRIMARY KEY, dueTime REAL NOT NULL, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS remindersByDueTime ON reminders (dueTime);
+    """
+    TABLES = {
+        EVENTS_FILE: ("events", ("position", "eventId", "time")),
+        NO_SHOW_FILE: ("noShows", ("memberId", "position", "date")),
+        REMINDERS_FILE: ("reminders", ("dueTime",)),
+    }
+
+    def __init__(self, databaseFile: str) -> None:
+        self.connection = sqlite3.connect(databaseFile, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SQLiteBackend.SCHEMA)
+        self.lock = threading.Lock()  # Writes run in worker threads
+        self.writtenRows: dict[str, dict[str, tuple]] = {}
+
+    @staticmethod
+    def toRows(filename: str, document: Any) -> dict[str, tuple]:
+        """Splits a table-backed document into {rowKey: (columns..., data)}."""
+        rows = {}
+        if filename == EVENTS_FILE:
+            for position, event in enumerate(document):
+                rowKey = str(event.get("eventId") or f"position{position}")
+                rows[rowKey] = (position, event.get("eventId"), _eventEpoch(event), json.dumps(event))
+        elif filename == NO_SHOW_FILE:
+            for memberId, entries in document.items():
+                for position, entry in enumerate(entries):
+                    rows[f"{memberId}:{position}"] = (memberId, position, entry.get("date"), json.dumps(entry))
+        elif filename == REMINDERS_FILE:
+            for dueTime, reminder in document.items():
+                rows[dueTime] = (float(dueTime), json.dumps(reminder))
+        return rows
+
+    def read(self, filename: str) -> Any:
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM documents WHERE filename = ?", (filename,)).fetchone()
+            if row is None:
+                # Not in the database yet; import the JSON file on first use
+                document = JSONBackend().read(filename)
+                self._writeLocked(filename, self.serialize(filename, document))
+                return document
+
+            if filename not in SQLiteBackend.TABLES:
+                return json.loads(row[0])
+
+            table, _ = SQLiteBackend.TABLES[filename]
+            if filename == EVENTS_FILE:
+                records = self.connection.execute("SELECT rowKey, data FROM events ORDER BY position").fetchall()
+                document = [json.loads(data) for _, data in records]
+            elif filename == NO_SHOW_FILE:
+                records = self.connection.execute("SELECT rowKey, memberId, data FROM noShows ORDER BY memberId, position").fetchall()
+                document = {}
+                for _, memberId, data in records:
+                    document.setdefault(memberId, []).append(json.loads(data))
+            else:
+                records = self.connection.execute(f"SELECT rowKey, data FROM {table}").fetchall()
+                document = {rowKey: json.loads(data) for rowKey, data in records}
+
+            self.writtenRows[filename] = SQLiteBackend.toRows(filename, document)
+            return document
+
+    def serialize(self, filename: str, document: Any) -> Any:
+        if filename in SQLiteBackend.TABLES:
+            return SQLiteBackend.toRows(filename, document)
+        return json.dumps(document)
+
+    def write(self, filename: str, payload: Any) -> None:
+        with self.lock:
+            self._writeLocked(filename, payload)
+
+    def _writeLocked(self, filename: str, payload: Any) -> None:
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN")
+        try:
+            if filename not in SQLiteBackend.TABLES:
+                cursor.execute("INSERT OR REPLACE INTO documents (filename, data) VALUES (?, ?)", (filename, payload))
+            else:
+                table, columns = SQLiteBackend.TABLES[filename]
+                previousRows = self.writtenRows.get(filename, {})
+                changedRows = [(rowKey, *row) for rowKey, row in payload.items() if previousRows.get(rowKey) != row]
+                removedRowKeys = [(rowKey,) for rowKey in previousRows if rowKey not in payload]
+                placeholders = ", ".join("?" * (len(columns) + 2))
+                cursor.executemany(f"INSERT OR REPLACE INTO {table} (rowKey, {', '.join(columns)}, data) VALUES ({placeholders})", changedRows)
+                cursor.executemany(f"DELETE FROM {table} WHERE rowKey = ?", removedRowKeys)
+                cursor.execute("INSERT OR REPLACE INTO documents (filename, data) VALUES (?, NULL)", (filename,))
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        if filename in SQLiteBackend.TABLES:
+            self.writtenRows[filename] = payload
+
+    def contains(self, filename: str) -> bool:
+        """Whether a document has been stored in the database yet."""
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM documents WHERE filename = ?", (filename,)).fetchone() is not None
+
+    def readLegacyWallets(self) -> dict | None:
+        """Reads the wallets table of a database from before the wallet ledger, or None if it has none."""
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM documents WHERE filename = ?", (WALLETS_FILE,)).fetchone() is None:
+                return None
+            return {rowKey: json.loads(data) for rowKey, data in self.connection.execute("SELECT rowKey, data FROM wallets")}
+
+    def dropLegacyWallets(self) -> None:
+        """Drops the wallets table once the wallet ledger has imported it."""
+        with self.lock:
+            self.connection.execute("DROP TABLE IF EXISTS wallets")
+            self.connection.execute("DELETE FROM documents WHERE filename = ?", (WALLETS_FILE,))
+
+    def truncate(self, filename: str) -> None:
+        """Drops everything stored for a document, e.g. before re-importing it."""
+        with self.lock:
+            if filename in SQLiteBackend.TABLES:
+                self.connection.execute(f"DELETE FROM {SQLiteBackend.TABLES[filename][0]}")
+            self.connection.execute("DELETE FROM documents WHERE filename = ?", (filename,))
+            self.writtenRows.pop(filename, None)
+
+
+class DataStore:
+    """In-memory copy of the data files, written back to the backend in the background.
+
+    Documents are loaded once and handed out by reference. Reads go through `get`
+    and never wait; read-modify-write goes through `transaction`, which serialises
+    writers per document.
+    """
+    def __init__(self, backend: JSONBackend | SQLiteBackend) -> None:
+        self.backend = backend
+        self.documents: dict[str, Any] = {}
+        self.dirty: set[str] = set()
+        self.versions: dict[str, int] = {}
+        self.watchers: dict[str, list[Callable[[str], None]]] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.flushLock = asyncio.Lock()
+        self.flushTask: asyncio.Task | None = None
+
+    def load(self, filename: str) -> None:
+        """Reads a data file from the backend into memory.
+
+        Parameters:
+        filename (str): Path of the data file.
+
+        Returns:
+        None.
+        """
+        self.documents[filename] = self.backend.read(filename)
+        self.dirty.discard(filename)
+        self.bumpVersion(filename)
+
+    def get(self, filename: str) -> Any:
+        """Returns the in-memory document for a data file, loading it on first access.
+
+        Parameters:
+        filename (str): Path of the data file.
+
+        Returns:
+        Any: The parsed document.
+        """
+        if filename not in self.documents:
+            self.load(filename)
+        return self.documents[filename]
+
+    def set(self, filename: str, data: Any) -> None:
+        """Replaces the document for a data file and schedules it for writing.
+
+        Parameters:
+        filename (str): Path of the data file.
+        data (Any): The new document.
+
+        Returns:
+        None.
+        """
+        self.documents[filename] = data
+        self.dirty.add(filename)
+        self.bumpVersion(filename)
+
+    def cache(self, filename: str, data: Any) -> None:
+        """Replaces the in-memory document without scheduling a write, for documents persisted elsewhere (the wallets, by the wallet ledger).
+
+        Parameters:
+        filename (str): Path of the data file.
+        data (Any): The new document.
+
+        Returns:
+        None.
+        """
+        self.documents[filename] = data
+        self.dirty.discard(filename)
+        self.bumpVersion(filename)
+
+    def bumpVersion(self, filename: str) -> None:
+        self.versions[filename] = self.versions.get(filename, 0) + 1
+        for callback in self.watchers.get(filename, []):
+            callback(filename)
+
+    def watch(self, filename: str, callback: Callable[[str], None]) -> None:
+        """Calls back whenever a document's version changes; the callback must not block.
+
+        Parameters:
+        filename (str): Path of the data file.
+        callback (Callable[[str], None]): Called with the filename.
+
+        Returns:
+        None.
+        """
+        self.watchers.setdefault(filename, []).append(callback)
+
+    def version(self, filename: str) -> int:
+        """Returns a counter that changes whenever a document is loaded, replaced or left by a transaction.
+
+        Lets caches derived from a document (e.g. the events index) tell when to rebuild.
+
+        Parameters:
+        filename (str): Path of the data file.
+
+        Returns:
+        int: The document's version.
+        """
+        return self.versions.get(filename, 0)
+
+    @asynccontextmanager
+    async def transaction(self, filename: str) -> AsyncIterator[Any]:
+        """Yields a data file's document for modification while holding its write lock.
+
+        The document is marked dirty on exit, even if the block raised, as any
+        in-place changes are already visible to readers. Not re-entrant: do not
+        open a second transaction on the same file inside the block.
+
+        Parameters:
+        filename (str): Path of the data file.
+
+        Returns:
+        AsyncIterator[Any]: The live document.
+        """
+        lock = self.locks.setdefault(filename, asyncio.Lock())
+        async with lock:
+            document = self.get(filename)
+            try:
+                yield document
+            finally:
+                # Block may have swapped the document with set(); keep that one
+                if self.documents.get(filename) is document:
+                    self.dirty.add(filename)
+                    self.bumpVersion(filename)
+
+    async def flush(self) -> None:
+        """Writes all dirty documents to the backend.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        async with self.flushLock:
+            for filename in list(self.dirty):
+                self.dirty.discard(filename)
+                # Serialize on the loop so the document can't change mid-dump
+                payload = self.backend.serialize(filename, self.documents[filename])
+                try:
+                    await runIO(self.backend.write, filename, payload)
+                except Exception:
+                    log.exception(f"DataStore flush: failed to write '{filename}'")
+                    self.dirty.add(filename)
+
+    def flushSync(self) -> None:
+        """Writes all dirty documents without an event loop, e.g. on shutdown.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        for filename in list(self.dirty):
+            self.dirty.discard(filename)
+            try:
+                self.backend.write(filename, self.backend.serialize(filename, self.documents[filename]))
+            except Exception:
+                log.exception(f"DataStore flushSync: failed to write '{filename}'")
+
+    async def flushLoop(self) -> None:
+        """Periodically flushes dirty documents until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(STORE_FLUSH_INTERVAL)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    def start(self) -> None:
+        """Starts the background flush task, if not already running.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        if self.flushTask is None or self.flushTask.done():
+            self.flushTask = asyncio.create_task(self.flushLoop())
+
+
+class EventHistory:
+    """Append-only journal of finished events, one JSON-lines segment per year.
+
+    Appending writes a single line instead of rewriting the whole history, and
+    readers stream entries segment by segment, skipping years outside the
+    requested range. Segments are keyed by the event's start time.
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.appendLock = asyncio.Lock()
+
+    def segmentPath(self, year: int) -> str:
+        return os.path.join(self.directory, f"{year}.jsonl")
+
+    def years(self) -> list[int]:
+        """Years that have a segment, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(name[:-6]) for name in os.listdir(self.directory) if name.endswith(".jsonl") and name[:-6].isdigit())
+
+    @staticmethod
+    def _eventYear(event: dict) -> int:
+        epoch = _eventEpoch(event)
+        return datetime.fromtimestamp(epoch, timezone.utc).year if epoch is not None else datetime.now(timezone.utc).year
+
+    @staticmethod
+    def _readSegment(path: str) -> Iterator[dict]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                # A line without newline is an append still in progress (or torn by a crash)
+                if not line.endswith("\n"):
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    log.warning(f"EventHistory read: skipping unreadable line in '{path}'")
+
+    def read(self, since: datetime | None = None, newestFirst: bool = False) -> Iterator[dict]:
+        """Streams history entries.
+
+        Parameters:
+        since (datetime | None): Skip segments for years before this.
+        newestFirst (bool): Yield newest segments and entries first. Holds one segment in memory at a time.
+
+        Returns:
+        Iterator[dict]: History entries, in append order within a segment.
+        """
+        years = [year for year in self.years() if since is None or year >= since.year]
+        if newestFirst:
+            years.reverse()
+        for year in years:
+            entries = EventHistory._readSegment(self.segmentPath(year))
+            yield from (reversed(list(entries)) if newestFirst else entries)
+
+    def _appendLine(self, path: str, line: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "a+b") as f:
+            # Start on a fresh line if the last append was torn by a crash
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def append(self, event: dict) -> None:
+        """Appends an event to its year's segment.
+
+        Parameters:
+        event (dict): The history entry.
+
+        Returns:
+        None.
+        """
+        line = json.dumps(event) + "\n"
+        async with self.appendLock:
+            await runIO(self._appendLine, self.segmentPath(EventHistory._eventYear(event)), line)
+
+    def _compactSegment(self, path: str) -> None:
+        entries = sorted(EventHistory._readSegment(path), key=lambda event: _eventEpoch(event) or 0)
+        JSONBackend().write(path, "".join(json.dumps(event) + "\n" for event in entries))
+
+    async def compact(self, year: int) -> None:
+        """Rewrites a segment in event time order, dropping unreadable lines.
+
+        Parameters:
+        year (int): Segment to compact.
+
+        Returns:
+        None.
+        """
+        path = self.segmentPath(year)
+        if not os.path.exists(path):
+            return
+        async with self.appendLock:
+            await runIO(self._compactSegment, path)
+
+    def rewrite(self, transform: Callable[[dict], bool]) -> None:
+        """Applies transform to every entry in place and rewrites the segments it changed.
+
+        Only for startup migrations: appends are not locked out.
+
+        Parameters:
+        transform (Callable[[dict], bool]): Changes an entry in place, returning whether it did.
+
+        Returns:
+        None.
+        """
+        for year in self.years():
+            path = self.segmentPath(year)
+            entries = list(EventHistory._readSegment(path))
+            if any([transform(entry) for entry in entries]):
+                JSONBackend().write(path, "".join(json.dumps(entry) + "\n" for entry in entries))
+
+    def importLegacy(self, backend: JSONBackend | SQLiteBackend) -> None:
+        """Splits the old single-document history into yearly segments, once.
+
+        Parameters:
+        backend (JSONBackend | SQLiteBackend): Backend that may still hold the old history.
+
+        Returns:
+        None.
+        """
+        inDatabase = isinstance(backend, SQLiteBackend) and backend.contains(EVENTS_HISTORY_FILE)
+        if not inDatabase and not os.path.exists(EVENTS_HISTORY_FILE):
+            return
+
+        legacyHistory = backend.read(EVENTS_HISTORY_FILE)
+        segments: dict[int, list[str]] = {}
+        for event in legacyHistory:
+            _epochEventTimes(event)
+            segments.setdefault(EventHistory._eventYear(event), []).append(json.dumps(event) + "\n")
+        os.makedirs(self.directory, exist_ok=True)
+        for year, lines in segments.items():
+            # Keep anything already journaled for that year after the imported entries
+            path = self.segmentPath(year)
+            existing = [json.dumps(event) + "\n" for event in EventHistory._readSegment(path)] if os.path.exists(path) else []
+            JSONBackend().write(path, "".join(lines + existing))
+
+        if isinstance(backend, SQLiteBackend):
+            backend.truncate(EVENTS_HISTORY_FILE)
+        if os.path.exists(EVENTS_HISTORY_FILE):
+            os.replace(EVENTS_HISTORY_FILE, f"{EVENTS_HISTORY_FILE}.imported")
+        log.info(f"EventHistory importLegacy: imported {len(legacyHistory)} events into '{self.directory}'")
+
+
+class WorkshopHostIndex:
+    """Workshop hosting times from the event history, for the SME reports.
+
+    Built from the history on first use, then kept up to date as finished events are
+    saved, so the reports are lookups instead of history scans. Host times are kept
+    sorted per (workshop, host) for "since" queries.
+    """
+    def __init__(self, history: EventHistory) -> None:
+        self.history = history
+        self.hostTimes: dict[tuple[str, int], list[int]] = {}  # (workshopInterest, authorId): host times, ascending
+        self.lastHosts: dict[str, tuple[int, str]] = {}  # workshopInterest: (time, title) of the latest host
+        self.built = False
+
+    def _build(self) -> None:
+        if self.built:
+            return
+        for event in self.history.read():
+            self._add(event)
+        self.built = True
+        log.debug(f"WorkshopHostIndex build: indexed {sum(len(times) for times in self.hostTimes.values())} hosted workshops")
+
+    def _add(self, event: dict) -> None:
+        workshopName = event.get("workshopInterest")
+        epoch = _eventEpoch(event)
+        if workshopName is None or epoch is None or event.get("authorId") is None:
+            return
+        bisect.insort(self.hostTimes.setdefault((workshopName, event["authorId"]), []), epoch)
+        if workshopName not in self.lastHosts or epoch >= self.lastHosts[workshopName][0]:
+            self.lastHosts[workshopName] = (epoch, event.get("title", ""))
+
+    def clear(self) -> None:
+        """Drops the index; it is built from the history again on next use."""
+        self.hostTimes.clear()
+        self.lastHosts.clear()
+        self.built = False
+
+    def add(self, event: dict) -> None:
+        """Records a history entry; call after appending it to the history.
+
+        Parameters:
+        event (dict): The history entry.
+
+        Returns:
+        None.
+        """
+        # Before the first build the entry is read from the history instead
+        if self.built:
+            self._add(event)
+
+    def hosted(self, workshopName: str, authorId: int, since: int | None = None) -> list[int]:
+        """Times a member hosted a workshop.
+
+        Parameters:
+        workshopName (str): The workshop interest name.
+        authorId (int): The host.
+        since (int | None): Only times after this epoch.
+
+        Returns:
+        list[int]: Host times as epoch seconds, oldest first.
+        """
+        self._build()
+        times = self.hostTimes.get((workshopName, authorId), [])
+        return times[bisect.bisect_right(times, since):] if since is not None else list(times)
+
+    def lastHosted(self, workshopName: str) -> tuple[int, str] | None:
+        """Time (epoch seconds) and title of the latest time a workshop was hosted by anyone, or None if never."""
+        self._build()
+        return self.lastHosts.get(workshopName)
+
+    def hostedSince(self, since: int, workshopName: str | None = None) -> dict[tuple[str, int], list[int]]:
+        """Who hosted what after a time.
+
+        Parameters:
+        since (int): Epoch seconds.
+        workshopName (str | None): Only this workshop.
+
+        Returns:
+        dict[tuple[str, int], list[int]]: Host times per (workshop, host), oldest first; hosts without any are left out.
+        """
+        self._build()
+        result = {}
+        for (indexedWorkshopName, authorId), times in self.hostTimes.items():
+            if workshopName is not None and indexedWorkshopName != workshopName:
+                continue
+            if self.lastHosts[indexedWorkshopName][0] <= since:
+                continue
+            if recent := times[bisect.bisect_right(times, since):]:
+                result[(indexedWorkshopName, authorId)] = recent
+        return result
+
+
+class WalletLedger:
+    """Append-only journal of SnekCoin wallet changes; balances are a snapshot plus the records after it.
+
+    Every change (gamble, payday, gift, commendation, bump award, staff edit...) is
+    appended as one record: {"sequence", "time", "type", "sourceId", "cause",
+    "amount", "changes": {userId: {field: delta}}}. The journal uses the event
+    history's yearly JSON-lines segments, so a change costs one line instead of a
+    rewrite of every wallet. The materialised wallets are the WALLETS_FILE document
+    in the store, which is not written back itself: every
+    WALLET_LEDGER_SNAPSHOT_INTERVAL records they are written to snapshot.json, and
+    on startup the snapshot plus the records after it are replayed. A record is on
+    disk before it is applied, so replay after a crash gives the same balances.
+    """
+    def __init__(self, directory: str) -> None:
+        self.journal = EventHistory(directory)
+        self.snapshotPath = os.path.join(directory, "snapshot.json")
+        self.sequence = 0  # Sequence of the last record applied
+        self.snapshotSequence = 0
+        self.lock = asyncio.Lock()
+        self.listeners: list[Callable[[list[str]], None]] = []
+
+    def listen(self, callback: Callable[[list[str]], None]) -> None:
+        """Calls back after each record is applied, with the user IDs it changed; the callback must not block.
+
+        Parameters:
+        callback (Callable[[list[str]], None]): Called with the changed wallets' user IDs.
+
+        Returns:
+        None.
+        """
+        self.listeners.append(callback)
+
+    @staticmethod
+    def _apply(wallets: dict, changes: dict[str, dict[str, int]]) -> None:
+        for userIdStr, fields in changes.items():
+            wallet = wallets.setdefault(userIdStr, {})
+            for field, delta in fields.items():
+                wallet[field] = wallet.get(field, 0) + delta
+
+    def _serializeSnapshot(self, wallets: dict) -> str:
+        """Serializes a snapshot of the wallets at the current sequence; write the result with JSONBackend."""
+        return json.dumps({"sequence": self.sequence, "time": int(time.time()), "wallets": wallets})
+
+    def load(self, backend: JSONBackend | SQLiteBackend) -> None:
+        """Materialises the wallets into the store from the latest snapshot and the records after it.
+
+        On first run the old wallets document becomes the first snapshot.
+
+        Parameters:
+        backend (JSONBackend | SQLiteBackend): Backend that may still hold the old wallets document.
+
+        Returns:
+        None.
+        """
+        if os.path.exists(self.snapshotPath):
+            with open(self.snapshotPath) as f:
+                snapshot = json.load(f)
+        else:
+            legacyWallets = backend.readLegacyWallets() if isinstance(backend, SQLiteBackend) else None
+            inDatabase = legacyWallets is not None
+            if legacyWallets is None:
+                legacyWallets = JSONBackend().read(WALLETS_FILE) if os.path.exists(WALLETS_FILE) else {}
+            os.makedirs(self.journal.directory, exist_ok=True)
+            JSONBackend().write(self.snapshotPath, self._serializeSnapshot(legacyWallets))
+            snapshot = {"sequence": 0, "time": 0, "wallets": legacyWallets}
+            if inDatabase:
+                backend.dropLegacyWallets()
+            if os.path.exists(WALLETS_FILE):
+                os.replace(WALLETS_FILE, f"{WALLETS_FILE}.imported")
+            log.info(f"WalletLedger load: imported {len(legacyWallets)} wallets into '{self.snapshotPath}'")
+
+        wallets = snapshot["wallets"]
+        self.sequence = self.snapshotSequence = snapshot["sequence"]
+        replayed = 0
+        for record in self.journal.read(since=datetime.fromtimestamp(snapshot["time"], timezone.utc)):
+            if record["sequence"] <= self.sequence:
+                continue
+            WalletLedger._apply(wallets, record["changes"])
+            self.sequence = record["sequence"]
+            replayed += 1
+        store.cache(WALLETS_FILE, wallets)
+        log.debug(f"WalletLedger load: {len(wallets)} wallets at sequence {self.sequence}, {replayed} records replayed")
+
+    async def record(self, recordType: str, changes: dict[int, dict[str, int]] | Callable[[dict], dict[int, dict[str, int]]], cause: str, sourceId: int | None = None, amount: int | None = None, check: Callable[[dict], bool] | None = None) -> bool:
+        """Appends a wallet change to the journal, then applies it to the wallets.
+
+        Parameters:
+        recordType (str): What happened, e.g. "gamble", "payday", "staffEdit".
+        changes (dict[int, dict[str, int]] | Callable[[dict], dict[int, dict[str, int]]]): Per user ID, the amount added to each wallet field (negative to take); or a function of the wallets returning that, called under the ledger lock for changes that depend on the current values.
+        cause (str): The command or interaction that made the change.
+        sourceId (int | None): Member who made the change; None for the bot itself.
+        amount (int | None): The SnekCoins the change is about, e.g. the bet, for reading the history.
+        check (Callable[[dict], bool] | None): Called with the wallets before appending; the change is dropped if it returns False.
+
+        Returns:
+        bool: False if check rejected the change.
+        """
+        async with self.lock:
+            wallets = store.get(WALLETS_FILE)
+            if check is not None and not check(wallets):
+                return False
+            if callable(changes):
+                changes = changes(wallets)
+            changes = {userId: {field: delta for field, delta in fields.items() if delta != 0} for userId, fields in changes.items()}
+            changes = {userId: fields for userId, fields in changes.items() if fields}
+            if not changes:
+                return True
+            record = {
+                "sequence": self.sequence + 1,
+                "time": int(time.time()),
+                "type": recordType,
+                "sourceId": sourceId,
+                "cause": cause,
+                "amount": amount,
+                "changes": {str(userId): fields for userId, fields in changes.items()}
+            }
+            await self.journal.append(record)
+            self.sequence = record["sequence"]
+            WalletLedger._apply(wallets, record["changes"])
+            store.bumpVersion(WALLETS_FILE)
+            for callback in self.listeners:
+                callback(list(record["changes"]))
+
+            if self.sequence - self.snapshotSequence >= WALLET_LEDGER_SNAPSHOT_INTERVAL:
+                # Serialize on the loop so the wallets can't change mid-dump
+                payload = self._serializeSnapshot(wallets)
+                await runIO(JSONBackend().write, self.snapshotPath, payload)
+                self.snapshotSequence = self.sequence
+        return True
+
+    def history(self, userId: int, since: datetime | None = None, limit: int = 25) -> list[dict]:
+        """A member's records, newest first: changes to their wallet and changes they made.
+
+        Parameters:
+        userId (int): The member.
+        since (datetime | None): Only records from this time on.
+        limit (int): Most records to return.
+
+        Returns:
+        list[dict]: The records.
+        """
+        userIdStr = str(userId)
+        records = []
+        for record in self.journal.read(since=since, newestFirst=True):
+            if since is not None and record["time"] < since.timestamp():
+                break
+            if userIdStr in record["changes"] or record.get("sourceId") == userId:
+                records.append(record)
+                if len(records) >= limit:
+                    break
+        return records
+
+
+store = DataStore(SQLiteBackend(SQLITE_DATABASE_FILE) if getattr(secret, "STORAGE_BACKEND", "json") == "sqlite" else JSONBackend())
+eventsHistory = EventHistory(EVENTS_HISTORY_DIR)
+workshopHosts = WorkshopHostIndex(eventsHistory)
+walletLedger = WalletLedger(WALLET_LEDGER_DIR)
+
+
+def _migrateEventTimesToEpoch() -> None:
+    for filename in (EVENTS_FILE, EVENT_TEMPLATES_FILE, WORKSHOP_TEMPLATES_FILE, TEMPLATES_DELETED_FILE):
+        document = store.get(filename)
+        if any([_epochEventTimes(entry) for entry in document]):
+            store.set(filename, document)
+    eventsHistory.rewrite(_epochEventTimes)
+
+
+# Entry i upgrades stored data from schema version i to i + 1. Each must be safe to
+# re-run, as a crash can land between a migration and recording its version.
+SCHEMA_MIGRATIONS: list[Callable[[], None]] = [
+    _migrateEventTimesToEpoch,  # 1: event, template and history times as epoch seconds instead of TIME_FORMAT strings
+]
+
+
+def migrateSchema() -> None:
+    """Runs the migrations the data hasn't had yet and writes the result; the version is kept in genericData.
+
+    Parameters:
+    None.
+
+    Returns:
+    None.
+    """
+    genericData = store.get(GENERIC_DATA_FILE)
+    schemaVersion = genericData.get("schemaVersion", 0)
+    if schemaVersion >= len(SCHEMA_MIGRATIONS):
+        return
+
+    for version in range(schemaVersion, len(SCHEMA_MIGRATIONS)):
+        log.info(f"Storage migrateSchema: migrating data to schema version {version + 1}")
+        SCHEMA_MIGRATIONS[version]()
+        genericData["schemaVersion"] = version + 1
+        store.set(GENERIC_DATA_FILE, genericData)
+    store.flushSync()
+
+
+if __name__ == "__main__":
+    # One-shot conversion between the JSON files and the SQLite database
+    parser = argparse.ArgumentParser(description="Move FriendlySnek data between JSON files and SQLite.")
+    parser.add_argument("direction", choices=("migrate", "export"), help="migrate: JSON files -> SQLite, export: SQLite -> JSON files")
+    args = parser.parse_args()
+
+    jsonBackend = JSONBackend()
+    sqliteBackend = SQLiteBackend(SQLITE_DATABASE_FILE)
+    source, target = (jsonBackend, sqliteBackend) if args.direction == "migrate" else (sqliteBackend, jsonBackend)
+    for filename in DATA_FILES:
+        if not os.path.exists(filename) and (source is jsonBackend or not sqliteBackend.contains(filename)):
+            print(f"Skipping missing '{filename}'")
+            continue
+        document = source.read(filename)
+        if target is sqliteBackend:
+            sqliteBackend.truncate(filename)
+        target.write(filename, target.serialize(filename, document))
+        print(f"{'Migrated' if args.direction == 'migrate' else 'Exported'} '{filename}'")
+
+    # Wallets are not a document: the wallet ledger keeps its snapshot and journal as files for either backend
+    print(f"Wallets stay in '{WALLET_LEDGER_DIR}', which both backends use")
+    if args.direction == "export" and not os.path.exists(WALLETS_FILE) and (legacyWallets := sqliteBackend.readLegacyWallets()) is not None:
+        # Not imported into the ledger yet; the bot imports the JSON file instead
+        jsonBackend.write(WALLETS_FILE, jsonBackend.serialize(WALLETS_FILE, legacyWallets))
+        print(f"Exported '{WALLETS_FILE}' (not yet imported into the wallet ledger)")
+    elif os.path.exists(WALLETS_FILE):
+        print(f"Left '{WALLETS_FILE}' for the wallet ledger to import on startup")
@@ -0,0 +1,230 @@
+import os, re, time, asyncio, hashlib, logging
+
+from datetime import datetime, timezone
+from typing import Callable
+
+from storage import store
+from executors import runIO
+
+from constants import *
+
+log = logging.getLogger("FriendlySnek")
+
+# Name scheme from before the manifest: 'DATETIME_AUTHORID_NAME'
+LEGACY_UPLOAD_NAME = re.compile(r"(\d{14})_(\d+)_(.+)")
+
+
+class UploadStore:
+    """Files uploaded with /fileupload for attaching to events.
+
+    Content is stored once per SHA-256 in FILE_UPLOAD_DIR; FILE_UPLOADS_FILE maps each
+    upload name ('DATETIME_AUTHORID_NAME', what events keep in "files") to its owner,
+    filename, hash, size and times. Lookups by user and by upload time come from
+    indexes rebuilt when the manifest changes. Each user's uploads are held to
+    FILE_UPLOAD_USER_QUOTA bytes and all content to FILE_UPLOAD_TOTAL_QUOTA, by
+    evicting the least recently used uploads no event or template uses.
+    """
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.byUser: dict[int, list[str]] = {}  # userId: upload names, oldest first
+        self.byTime: list[tuple[int, str]] = []  # (uploadedAt, upload name), oldest first
+        self.bySha256: dict[str, set[str]] = {}  # sha256: upload names sharing the content
+        self.userBytes: dict[int, int] = {}  # userId: bytes of their uploads, shared content counted for each
+        self.totalBytes = 0  # Bytes on disk, shared content counted once
+        self.lock = asyncio.Lock()
+
+    def refresh(self) -> None:
+        """Rebuilds the indexes if the manifest changed since the last build."""
+        if self.version == store.version(FILE_UPLOADS_FILE):
+            return
+        manifest = store.get(FILE_UPLOADS_FILE)
+        self.version = store.version(FILE_UPLOADS_FILE)
+
+        self.byUser = {}
+        self.byTime = sorted((upload["uploadedAt"], uploadName) for uploadName, upload in manifest.items())
+        self.bySha256 = {}
+        self.userBytes = {}
+        self.totalBytes = 0
+        for uploadedAt, uploadName in self.byTime:
+            upload = manifest[uploadName]
+            self.byUser.setdefault(upload["userId"], []).append(uploadName)
+            self.userBytes[upload["userId"]] = self.userBytes.get(upload["userId"], 0) + upload["size"]
+            if upload["sha256"] not in self.bySha256:
+                self.bySha256[upload["sha256"]] = set()
+                self.totalBytes += upload["size"]
+            self.bySha256[upload["sha256"]].add(uploadName)
+
+    @staticmethod
+    def blobPath(sha256: str) -> str:
+        return os.path.join(FILE_UPLOAD_DIR, sha256)
+
+    def path(self, uploadName: str) -> str | None:
+        """Path of an upload's content, or None if there is no such upload."""
+        upload = store.get(FILE_UPLOADS_FILE).get(uploadName)
+        return UploadStore.blobPath(upload["sha256"]) if upload is not None else None
+
+    def userUploads(self, userId: int) -> list[str]:
+        """A user's upload names, oldest first."""
+        self.refresh()
+        return list(self.byUser.get(userId, []))
+
+    def find(self, userId: int, filename: str) -> str | None:
+        """Upload name of a user's upload by its filename, or None."""
+        manifest = store.get(FILE_UPLOADS_FILE)
+        return next((uploadName for uploadName in self.userUploads(userId) if manifest[uploadName]["filename"] == filename), None)
+
+    def touch(self, uploadName: str) -> None:
+        """Marks an upload as used now, e.g. attached to an event, for least-recently-used eviction."""
+        manifest = store.get(FILE_UPLOADS_FILE)
+        if uploadName in manifest:
+            manifest[uploadName]["lastUsedAt"] = int(time.time())
+            store.set(FILE_UPLOADS_FILE, manifest)
+
+    @staticmethod
+    def _inUse() -> set[str]:
+        inUse = set()
+        for filename in (EVENTS_FILE, EVENT_TEMPLATES_FILE, WORKSHOP_TEMPLATES_FILE):
+            for entry in store.get(filename):
+                inUse.update(entry.get("files") or [])
+        return inUse
+
+    @staticmethod
+    def _writeBlob(data: bytes, sha256: str) -> None:
+        path = UploadStore.blobPath(sha256)
+        if os.path.exists(path):
+            return
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+    def _evictWhile(self, isOver: Callable[[], bool], candidates: Callable[[], list[str]], inUse: set[str]) -> list[str]:
+        """Removes unused candidates, least recently used first, while isOver()."""
+        manifest = store.get(FILE_UPLOADS_FILE)
+        evicted = []
+        while isOver() and (unused := [uploadName for uploadName in candidates() if uploadName not in inUse]):
+            uploadName = min(unused, key=lambda uploadName: manifest[uploadName]["lastUsedAt"])
+            self.remove(uploadName)
+            evicted.append(uploadName)
+        return evicted
+
+    async def add(self, userId: int, filename: str, data: bytes) -> tuple[str | None, list[str]]:
+        """Stores an upload, evicting unused uploads first if it doesn't fit the quotas.
+
+        Parameters:
+        userId (int): The uploader.
+        filename (str): The file's name.
+        data (bytes): The file's content.
+
+        Returns:
+        tuple[str | None, list[str]]: The new upload name, None if it can't fit even after evicting; and the upload names evicted for it.
+        """
+        size = len(data)
+        sha256 = await runIO(lambda: hashlib.sha256(data).hexdigest())
+        async with self.lock:
+            self.refresh()
+            manifest = store.get(FILE_UPLOADS_FILE)
+            inUse = UploadStore._inUse()
+            isNewContent = sha256 not in self.bySha256  # Identical content already stored takes no more disk space
+
+            # Check before evicting that uploads in use leave room
+            userBytesInUse = sum(manifest[uploadName]["size"] for uploadName in self.byUser.get(userId, []) if uploadName in inUse)
+            totalBytesInUse = sum(manifest[next(iter(uploadNames))]["size"] for uploadNames in self.bySha256.values() if uploadNames & inUse)
+            if userBytesInUse + size > FILE_UPLOAD_USER_QUOTA or (isNewContent and totalBytesInUse + size > FILE_UPLOAD_TOTAL_QUOTA):
+                return None, []
+
+            evicted = self._evictWhile(lambda: self.userBytes.get(userId, 0) + size > FILE_UPLOAD_USER_QUOTA, lambda: self.byUser.get(userId, []), inUse)
+            if isNewContent:
+                evicted += self._evictWhile(lambda: self.totalBytes + size > FILE_UPLOAD_TOTAL_QUOTA, lambda: [uploadName for _, uploadName in self.byTime], inUse)
+            # Eviction may have removed the only other copy of the content
+            await runIO(UploadStore._writeBlob, data, sha256)
+
+            utcNow = datetime.now(timezone.utc)
+            uploadName = f"{utcNow.strftime('%Y%m%d%H%M%S')}_{userId}_{filename}"
+            manifest[uploadName] = {"userId": userId, "filename": filename, "sha256": sha256, "size": size, "uploadedAt": int(utcNow.timestamp()), "lastUsedAt": int(utcNow.timestamp())}
+            store.set(FILE_UPLOADS_FILE, manifest)
+            return uploadName, evicted
+
+    def remove(self, uploadName: str) -> None:
+        """Removes an upload, and its content once no other upload shares it.
+
+        Parameters:
+        uploadName (str): The upload name.
+
+        Returns:
+        None.
+        """
+        self.refresh()
+        manifest = store.get(FILE_UPLOADS_FILE)
+        upload = manifest.pop(uploadName, None)
+        if upload is None:
+            return
+        if self.bySha256.get(upload["sha256"], set()) <= {uploadName}:
+            try:
+                os.remove(UploadStore.blobPath(upload["sha256"]))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.warning(f"UploadStore remove: Failed to remove content of '{uploadName}' | {e}")
+        store.set(FILE_UPLOADS_FILE, manifest)
+        self.refresh()
+
+    def nextExpiry(self) -> float | None:
+        """When the oldest upload not in use expires, as epoch seconds, or None if there is none."""
+        self.refresh()
+        inUse = UploadStore._inUse()
+        uploadedAt = next((uploadedAt for uploadedAt, uploadName in self.byTime if uploadName not in inUse), None)
+        return uploadedAt + FILE_UPLOAD_MAX_AGE_WEEKS * 7 * 24 * 3600 if uploadedAt is not None else None
+
+    async def expire(self) -> None:
+        """Removes uploads older than FILE_UPLOAD_MAX_AGE_WEEKS that no event or template uses.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        async with self.lock:
+            self.refresh()
+            cutoff = time.time() - FILE_UPLOAD_MAX_AGE_WEEKS * 7 * 24 * 3600
+            inUse = UploadStore._inUse()
+            expired = [uploadName for uploadedAt, uploadName in self.byTime if uploadedAt < cutoff and uploadName not in inUse]
+            for uploadName in expired:
+                self.remove(uploadName)
+        if expired:
+            log.info(f"UploadStore expire: Removed {len(expired)} uploads")
+
+    def importLegacy(self) -> None:
+        """Moves files uploaded before the manifest existed into the store, once.
+
+        Parameters:
+        None.
+
+        Returns:
+        None.
+        """
+        manifest = store.get(FILE_UPLOADS_FILE)
+        legacyPaths = []
+        for osFile in os.listdir(FILE_UPLOAD_DIR):
+            match = LEGACY_UPLOAD_NAME.fullmatch(osFile)
+            legacyPath = os.path.join(FILE_UPLOAD_DIR, osFile)
+            if match is None or not os.path.isfile(legacyPath):
+                continue
+            with open(legacyPath, "rb") as f:
+                data = f.read()
+            sha256 = hashlib.sha256(data).hexdigest()
+            UploadStore._writeBlob(data, sha256)
+            uploadedAt = int(datetime.strptime(match.group(1), "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc).timestamp())
+            manifest[osFile] = {"userId": int(match.group(2)), "filename": match.group(3), "sha256": sha256, "size": len(data), "uploadedAt": uploadedAt, "lastUsedAt": uploadedAt}
+            legacyPaths.append(legacyPath)
+        if not legacyPaths:
+            return
+
+        # Only remove the old files once the manifest listing them is on disk
+        store.set(FILE_UPLOADS_FILE, manifest)
+        store.flushSync()
+        for legacyPath in legacyPaths:
+            os.remove(legacyPath)
+        log.info(f"UploadStore importLegacy: imported {len(legacyPaths)} uploads into '{FILE_UPLOAD_DIR}'")
+
+uploadStore = UploadStore()
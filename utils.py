@@ -1,4 +1,8 @@
-import discord, logging
+import asyncio, discord, logging
+
+from datetime import datetime, timedelta, timezone
+
+from constants import *
 
 log = logging.getLogger("FriendlySnek")
 
@@ -34,3 +38,104 @@ class Utils:
             await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=30.0)
             return
         log.exception(error)
+
+
+    @staticmethod
+    def toEpoch(moment: datetime) -> int:
+        """Converts an aware datetime to a stored event time: epoch seconds, to the minute."""
+        return int(moment.replace(second=0, microsecond=0).timestamp())
+
+    @staticmethod
+    def fromEpoch(epoch: int) -> datetime:
+        """Converts a stored event time (epoch seconds) to an aware UTC datetime, for display and arithmetic."""
+        return datetime.fromtimestamp(epoch, timezone.utc)
+
+    @staticmethod
+    async def fetchMessages(channel: discord.TextChannel, messageIds: list[int]) -> dict[int, discord.Message | None]:
+        """Fetches messages by id, a few at a time.
+
+        Parameters:
+        channel (discord.TextChannel): Channel holding the messages.
+        messageIds (list[int]): Ids of the messages.
+
+        Returns:
+        dict[int, discord.Message | None]: Message per id, None if it no longer exists.
+        """
+        semaphore = asyncio.Semaphore(MESSAGE_FETCH_CONCURRENCY)
+
+        async def fetch(messageId: int) -> discord.Message | None:
+            async with semaphore:
+                try:
+                    return await channel.fetch_message(messageId)
+                except discord.NotFound:
+                    return None
+
+        messages = await asyncio.gather(*(fetch(messageId) for messageId in messageIds))
+        return dict(zip(messageIds, messages))
+
+    @staticmethod
+    async def fetchNearbyBotMessages(channel: discord.TextChannel, *, before: int | None = None, after: int | None = None, limit: int = MESSAGE_VERIFY_WINDOW) -> list[discord.Message]:
+        """Fetches the bot's messages among the MESSAGE_VERIFY_WINDOW messages before or after a message.
+
+        With both before and after, the messages between the two are searched instead.
+
+        Parameters:
+        channel (discord.TextChannel): The channel.
+        before (int | None): Look before this message id.
+        after (int | None): Look after this message id.
+        limit (int): How many messages to look through.
+
+        Returns:
+        list[discord.Message]: The bot's messages, oldest first.
+        """
+        messages = [
+            message async for message in channel.history(
+                limit=limit,
+                before=discord.Object(id=before) if before is not None else None,
+                after=discord.Object(id=after) if after is not None else None
+            ) if message.author.id in FRIENDLY_SNEKS
+        ]
+        # Without after, history walks back from before (newest first)
+        return messages if after is not None else messages[::-1]
+
+    @staticmethod
+    async def deleteMessages(channel: discord.TextChannel, messageIds: list[int]) -> list[int]:
+        """Deletes messages by id without fetching them, in bulk where Discord allows it.
+
+        Messages younger than the bulk delete age limit go BULK_DELETE_MAX_MESSAGES per request,
+        older ones one by one. Messages that are already gone count as deleted.
+
+        Parameters:
+        channel (discord.TextChannel): Channel holding the messages.
+        messageIds (list[int]): Ids of the messages.
+
+        Returns:
+        list[int]: Ids that could not be deleted.
+        """
+        bulkCutoff = discord.utils.time_snowflake(datetime.now(timezone.utc) - timedelta(days=BULK_DELETE_MAX_AGE_DAYS))
+        messageIds = list(dict.fromkeys(messageIds))
+        recentIds = [messageId for messageId in messageIds if messageId > bulkCutoff]
+        singleIds = [messageId for messageId in messageIds if messageId <= bulkCutoff]
+
+        for i in range(0, len(recentIds), BULK_DELETE_MAX_MESSAGES):
+            chunk = recentIds[i:i + BULK_DELETE_MAX_MESSAGES]
+            if len(chunk) == 1:
+                singleIds.extend(chunk)
+                continue
+            try:
+                await channel.delete_messages([discord.Object(id=messageId) for messageId in chunk])
+            except discord.HTTPException as e:
+                # One rejected id fails the whole request; retry individually
+                log.warning(f"Utils deleteMessages: Bulk delete in '{channel.name}' failed, deleting one by one: {e}")
+                singleIds.extend(chunk)
+
+        failedIds = []
+        for messageId in singleIds:
+            try:
+                await channel.get_partial_message(messageId).delete()
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                log.warning(f"Utils deleteMessages: Failed to delete message '{messageId}' in '{channel.name}': {e}")
+                failedIds.append(messageId)
+        return failedIds